@@ -0,0 +1,3 @@
+"""Benchmarks for capture, OCR, identification, vision and reporting hot paths."""
+
+from .suite import BENCHMARKS, run_benchmarks, compare_to_baseline
\ No newline at end of file
@@ -0,0 +1,41 @@
+import os
+from typing import Dict, Optional
+
+from PIL import Image
+
+from game_automator.sim.game import SimulatedGame, make_buildings
+
+# Fixture frames, by name, expected in a recorded frames directory
+FRAME_NAMES = ["shop", "city", "panel"]
+
+
+def load_frames(frames_dir: Optional[str] = None) -> Dict[str, Image.Image]:
+    """
+    Load benchmark fixture frames.
+    Recorded frames (shop.png, city.png, panel.png) are read from frames_dir;
+    any that are missing are rendered by the simulator.
+    """
+    game = SimulatedGame(make_buildings())
+    frames = {}
+    for name in FRAME_NAMES:
+        path = os.path.join(frames_dir, f"{name}.png") if frames_dir else None
+        if path and os.path.exists(path):
+            frames[name] = Image.open(path).convert("RGB")
+        else:
+            frames[name] = game.render_screen(name)
+    return frames
+
+
+def scaled(image: Image.Image, scale: float) -> Image.Image:
+    """Resize a frame to simulate a different window resolution."""
+    if scale == 1.0:
+        return image
+    size = (int(image.width * scale), int(image.height * scale))
+    return image.resize(size, Image.BILINEAR)
+
+
+def to_bgra(image: Image.Image) -> bytes:
+    """Raw BGRA bytes, as an mss grab returns them."""
+    red, green, blue = image.convert("RGB").split()
+    alpha = Image.new("L", image.size, 255)
+    return Image.merge("RGBA", (blue, green, red, alpha)).tobytes()
\ No newline at end of file
@@ -0,0 +1,282 @@
+import os
+import platform
+import statistics
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from PIL import Image
+
+from game_automator.bench.fixtures import load_frames, scaled, to_bgra
+
+# Resolution scales (relative to the fixture frames) for per-resolution benchmarks
+SCALES = [0.5, 1.0, 2.0]
+
+# Registered benchmarks: name -> function(frames) returning {case: callable},
+# or ({case: callable}, teardown) when the setup holds resources to release
+BENCHMARKS: Dict[str, Callable[[Dict[str, Image.Image]], object]] = {}
+
+
+def benchmark(name: str):
+    """
+    Register a benchmark. The function returns the cases to time, optionally
+    paired with a teardown callable run after they are timed.
+    """
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+@benchmark("capture.convert")
+def bench_capture_convert(frames):
+    from game_automator.core.capture import bgra_to_image
+    
+    cases = {}
+    for scale in SCALES:
+        image = scaled(frames["panel"], scale)
+        raw = to_bgra(image)
+        cases[f"{image.width}x{image.height}"] = lambda raw=raw, size=image.size: bgra_to_image(size, raw)
+    return cases
+
+
+@benchmark("ocr.extract_text")
+def bench_extract_text(frames):
+    from game_automator.core.ocr import extract_text, get_reader
+    
+    get_reader()  # Exclude model loading from the timings
+    cases = {}
+    for scale in SCALES:
+        image = scaled(frames["panel"], scale)
+        cases[f"{image.width}x{image.height}"] = lambda image=image: extract_text(image)
+    return cases
+
+
+@benchmark("engine.identify_screen")
+def bench_identify_screen(frames):
+    from game_automator.core.ocr import get_reader
+    from game_automator.engine.frame import Frame
+    from game_automator.engine.models import Screen, Landmark
+    from game_automator.engine.state import identify_screen
+    
+    get_reader()
+    window = {"x": 0, "y": 0, "width": frames["panel"].width, "height": frames["panel"].height}
+    cases = {}
+    for count in (1, 5, 20):
+        # Only the last screen matches, so every definition is evaluated
+        screens = {f"decoy-{i}": Screen([Landmark(f"Decoy {i}")]) for i in range(count - 1)}
+        screens["panel"] = Screen([Landmark("Investment")])
+        cases[f"{count}-screens"] = lambda screens=screens: identify_screen(window, screens, Frame(frames["panel"]))
+    return cases
+
+
+@benchmark("workflow.detect_building_name_fast")
+def bench_detect_building_name(frames):
+    from game_automator.core.ocr import get_reader
+    from game_automator.workflows.city_investment_scan import CityInvestmentScanWorkflow
+    
+    get_reader()
+    workflow = CityInvestmentScanWorkflow()
+    return {
+        "panel": lambda: workflow.detect_building_name_fast(frames["panel"]),
+        "city": lambda: workflow.detect_building_name_fast(frames["city"]),
+    }
+
+
+@benchmark("vision.encode")
+def bench_vision_encode(frames):
+    from game_automator.core.vision import image_to_base64
+    
+    return {"panel": lambda: image_to_base64(frames["panel"])}
+
+
+@benchmark("vision.extract_all")
+def bench_vision_extract(frames):
+    from game_automator.core.vision import extract_all_buildings
+    from game_automator.sim.game import SimulatedGame, make_buildings
+    from game_automator.sim.vision_stub import VisionStub
+    
+    game = SimulatedGame(make_buildings())
+    images = [game.render_screen("panel", i) for i in range(len(game.buildings))]
+    stub = VisionStub(game).start()
+    
+    def run():
+        saved = {key: os.environ.get(key) for key in ("ANTHROPIC_BASE_URL", "ANTHROPIC_API_KEY")}
+        os.environ["ANTHROPIC_BASE_URL"] = stub.url
+        os.environ["ANTHROPIC_API_KEY"] = "benchmark"
+        try:
+            return extract_all_buildings(images)
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+    
+    return {f"{len(images)}-images": run}, stub.stop
+
+
+@benchmark("discord.format_table")
+def bench_format_table(frames):
+    from game_automator.core.discord import format_table
+    from game_automator.sim.game import make_buildings
+    
+    rows = [
+        {
+            "building_name": b.name,
+            "level": b.level,
+            "current_investment": b.current,
+            "max_investment": b.maximum,
+        }
+        for b in make_buildings(26)
+    ]
+    columns = ["building_name", "level", "current_investment", "max_investment"]
+    headers = ["Building", "Lv", "Current", "Max"]
+    return {"26-rows": lambda: format_table("City Investment Report", rows, columns, headers)}
+
+
+def _report_rows(count: int) -> List[Dict]:
+    from game_automator.sim.game import make_buildings
+    
+    buildings = make_buildings(26)
+    return [
+        {
+            "building_name": f"{buildings[i % 26].name} {i // 26 + 1}",
+            "level": buildings[i % 26].level,
+            "current_investment": buildings[i % 26].current,
+            "max_investment": buildings[i % 26].maximum,
+        }
+        for i in range(count)
+    ]
+
+
+@benchmark("discord.pack_table")
+def bench_pack_table(frames):
+    from game_automator.core.discord import pack_table
+    
+    columns = ["building_name", "level", "current_investment", "max_investment"]
+    cases = {}
+    for count in (26, 260):
+        rows = _report_rows(count)
+        cases[f"{count}-rows"] = lambda rows=rows: pack_table("City Investment Report", rows, columns)
+    return cases
+
+
+@benchmark("discord.post_table")
+def bench_post_table(frames):
+    from game_automator.core.discord import DiscordWebhook, RateLimiter, pack_table
+    from game_automator.sim.discord_stub import DiscordStub
+    
+    # Generous bucket so the benchmark measures packing and HTTP, not waiting
+    stub = DiscordStub(limit=1000, window=1.0).start()
+    columns = ["building_name", "level", "current_investment", "max_investment"]
+    rows = _report_rows(260)
+    
+    def run():
+        webhook = DiscordWebhook(stub.url, rate_limiter=RateLimiter())
+        return webhook.send_all(pack_table("City Investment Report", rows, columns))
+    
+    return {"260-rows": run}, stub.stop
+
+
+def _time_case(func: Callable[[], object], repeat: int, warmup: int = 1) -> Dict:
+    for _ in range(warmup):
+        func()
+    
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    
+    timings.sort()
+    return {
+        "runs": repeat,
+        "mean": statistics.mean(timings),
+        "median": statistics.median(timings),
+        "min": timings[0],
+        "max": timings[-1],
+        "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+
+def run_benchmarks(
+    selected: Optional[Sequence[str]] = None,
+    repeat: int = 5,
+    frames_dir: Optional[str] = None
+) -> Dict:
+    """
+    Run benchmarks (all, or those whose name contains any selected substring).
+    Returns machine-readable results; benchmarks that cannot run here
+    (e.g. OCR models unavailable) are reported with an error.
+    """
+    frames = load_frames(frames_dir)
+    results = []
+    
+    for name, setup in BENCHMARKS.items():
+        if selected and not any(s in name for s in selected):
+            continue
+        
+        try:
+            cases = setup(frames)
+        except Exception as e:
+            print(f"[BENCH] {name}: skipped ({e})")
+            results.append({"name": name, "error": str(e)})
+            continue
+        
+        teardown = None
+        if isinstance(cases, tuple):
+            cases, teardown = cases
+        
+        try:
+            for case, func in cases.items():
+                try:
+                    stats = _time_case(func, repeat)
+                except Exception as e:
+                    print(f"[BENCH] {name}[{case}]: failed ({e})")
+                    results.append({"name": name, "case": case, "error": str(e)})
+                    continue
+                print(f"[BENCH] {name}[{case}]: median {stats['median'] * 1000:.2f} ms")
+                results.append({"name": name, "case": case, **stats})
+        finally:
+            if teardown is not None:
+                teardown()
+    
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare_to_baseline(current: Dict, baseline: Dict, tolerance: float = 0.25) -> List[Dict]:
+    """
+    Compare median timings against a saved baseline.
+    Returns one entry per case found in both, flagged as a regression when
+    slower than the baseline by more than the tolerance (a fraction).
+    """
+    previous = {
+        (r["name"], r.get("case")): r
+        for r in baseline.get("results", [])
+        if "median" in r
+    }
+    
+    comparisons = []
+    for result in current.get("results", []):
+        key = (result["name"], result.get("case"))
+        if "median" not in result or key not in previous:
+            continue
+        before = previous[key]["median"]
+        after = result["median"]
+        change = (after - before) / before if before else 0.0
+        comparisons.append({
+            "name": result["name"],
+            "case": result.get("case"),
+            "baseline": before,
+            "current": after,
+            "change": change,
+            "regression": change > tolerance,
+        })
+    
+    return comparisons
\ No newline at end of file
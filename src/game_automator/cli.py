@@ -1,6 +1,31 @@
+import json
+
 import click
+import yaml
+
+
+def parse_options(pairs) -> dict:
+    """Parse KEY=VALUE workflow options; values are read as YAML scalars (true, 3, 0.5, text)."""
+    options = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep or not key:
+            raise click.BadParameter(f"expected KEY=VALUE, got '{pair}'", param_hint="-o/--option")
+        options[key.strip().replace("-", "_")] = yaml.safe_load(value)
+    return options
+
+
+def default_metrics_path(workflow_name: str) -> str:
+    from datetime import datetime
+    return f"output/metrics-{workflow_name}-{datetime.now().strftime('%Y-%m-%d-%H%M%S')}.json"
+
 
-from game_automator.workflows import discover_workflows
+def write_metrics(path: str, quiet: bool = False) -> None:
+    """Dump the process's metrics as JSON."""
+    from game_automator.core.metrics import REGISTRY
+    REGISTRY.write_json(path)
+    if not quiet:
+        click.echo(f"\nMetrics written to {path}")
 
 
 @click.group()
@@ -12,32 +37,83 @@ def main():
 @main.command()
 def list():
     """List available workflows."""
-    workflows = discover_workflows()
+    from game_automator.workflows import available_workflows
+    
+    workflows = available_workflows()
     
     if not workflows:
         click.echo("No workflows found.")
         return
     
     click.echo("Available workflows:\n")
-    for name, workflow_class in sorted(workflows.items()):
-        click.echo(f"  {name:20} {workflow_class.description}")
+    for name, spec in sorted(workflows.items()):
+        source = "" if spec.source == "built-in" else f"  [{spec.source}]"
+        click.echo(f"  {name:20} {spec.description}{source}")
 
 
 @main.command()
 @click.argument("workflow_name")
-def run(workflow_name: str):
-    """Run a workflow by name."""
-    workflows = discover_workflows()
+@click.option("-o", "--option", "option_pairs", multiple=True, metavar="KEY=VALUE",
+              help="Workflow option, e.g. -o incremental=true. Repeatable.")
+@click.option("--resume", is_flag=True, help="Continue from the last checkpoint of a failed run.")
+@click.option("--profile", "profile_path", default=None,
+              help="Write a Chrome trace / JSON timeline to this file and print a time summary.")
+@click.option("--no-daemon", is_flag=True, help="Run in this process even if a daemon is running.")
+@click.option("--all-windows", is_flag=True, help="Run once per open game window, concurrently (in this process).")
+@click.option("--ocr-workers", default=1, show_default=True, help="Concurrent OCR calls with --all-windows.")
+@click.option("--metrics", "metrics_path", default=None,
+              help="Write the run's metrics as JSON to this file (default: output/metrics-<workflow>-<time>.json).")
+def run(workflow_name: str, option_pairs, resume: bool, profile_path: str, no_daemon: bool, all_windows: bool,
+        ocr_workers: int, metrics_path: str):
+    """
+    Run a workflow by name.
+    Runs in the daemon if one is running (see 'daemon'), otherwise in-process.
+    """
+    options = parse_options(option_pairs)
+    
+    # Profiling and multi-window runs need the run in this process
+    if not (no_daemon or profile_path or all_windows):
+        from game_automator.daemon import DaemonUnavailable, run_via_daemon
+        try:
+            success = run_via_daemon(workflow_name, options, resume)
+        except DaemonUnavailable:
+            pass
+        else:
+            click.echo("\nDone!" if success else "\nWorkflow did not complete successfully.")
+            return
+    
+    from game_automator.workflows import get_workflow
     
-    if workflow_name not in workflows:
+    workflow_class = get_workflow(workflow_name)
+    
+    if workflow_class is None:
         click.echo(f"Unknown workflow: {workflow_name}")
         click.echo(f"Run 'game-automator list' to see available workflows.")
         return
     
-    workflow_class = workflows[workflow_name]
-    workflow = workflow_class()
+    if profile_path:
+        from game_automator.core import trace
+        tracer = trace.enable()
+    
+    try:
+        if all_windows:
+            from game_automator.orchestrator import Orchestrator
+            results = Orchestrator(workflow_class, options, ocr_workers=ocr_workers).run(resume=resume)
+            success = bool(results) and all(results.values())
+        else:
+            success = workflow_class(**options).execute(resume=resume)
+    finally:
+        if profile_path:
+            trace.disable()
+            tracer.write(profile_path)
+            click.echo("\n" + tracer.format_summary())
+            click.echo(f"\nTrace written to {profile_path}")
+        write_metrics(metrics_path or default_metrics_path(workflow_name))
     
-    success = workflow.execute()
+    from game_automator.core.outbox import wait_for_delivery
+    queued = wait_for_delivery()
+    if queued:
+        click.echo(f"\n{queued} Discord report(s) still queued; send them with 'game-automator outbox flush'.")
     
     if success:
         click.echo("\nDone!")
@@ -46,10 +122,361 @@ def run(workflow_name: str):
 
 
 @main.command()
-def hotkey():
+@click.argument("workflow_name", default="city-investment-scan")
+@click.option("--buildings", default=26, show_default=True, help="Number of simulated buildings.")
+@click.option("--windows", default=1, show_default=True, help="Simulated game windows, run concurrently.")
+@click.option("--latency", default=0.1, show_default=True, help="Simulated input latency (s).")
+@click.option("--animation", default=0.2, show_default=True, help="Simulated transition animation (s).")
+@click.option("--vision-latency", default=0.5, show_default=True, help="Vision stub response delay (s).")
+@click.option("--screens", "screens_dir", default=None, help="Directory of recorded shop/city/panel PNGs.")
+@click.option("--max-duration", default=None, type=float, help="Fail if the run takes longer (s).")
+@click.option("-o", "--option", "option_pairs", multiple=True, metavar="KEY=VALUE", help="Workflow option.")
+@click.option("--json", "as_json", is_flag=True, help="Print results as JSON.")
+@click.option("--profile", "profile_path", default=None, help="Write a Chrome trace / JSON timeline to this file.")
+@click.option("--metrics", "metrics_path", default=None, help="Write the run's metrics as JSON to this file.")
+def simulate(workflow_name, buildings, windows, latency, animation, vision_latency, screens_dir, max_duration, option_pairs,
+             as_json, profile_path, metrics_path):
+    """Run a workflow headless against the simulated game."""
+    from game_automator.core import trace
+    from game_automator.sim.runner import run_simulation
+    
+    tracer = trace.enable() if profile_path else None
+    try:
+        result = run_simulation(
+            workflow_name,
+            buildings=buildings,
+            latency=latency,
+            animation=animation,
+            vision_latency=vision_latency,
+            screens_dir=screens_dir,
+            options=parse_options(option_pairs),
+            windows=windows,
+        )
+    finally:
+        if tracer:
+            trace.disable()
+            tracer.write(profile_path)
+        if metrics_path:
+            write_metrics(metrics_path, quiet=as_json)
+    
+    if tracer and not as_json:
+        click.echo("\n" + tracer.format_summary())
+    
+    if as_json:
+        click.echo(json.dumps(result, indent=2))
+    else:
+        click.echo("\nSimulation results:\n")
+        for key, value in result.items():
+            click.echo(f"  {key:22} {value}")
+    
+    failed = not result["success"] or result["buildings_correct"] < result["buildings_expected"]
+    if max_duration is not None and result["duration"] > max_duration:
+        click.echo(f"\nRun took {result['duration']}s, over the {max_duration}s limit.")
+        failed = True
+    if failed:
+        raise SystemExit(1)
+
+
+@main.command()
+@click.option("-k", "selected", multiple=True, help="Only run benchmarks whose name contains this.")
+@click.option("--repeat", default=5, show_default=True, help="Timed runs per case.")
+@click.option("--frames", "frames_dir", default=None, help="Directory of recorded shop/city/panel PNGs.")
+@click.option("--output", default=None, help="Write results as JSON to this file.")
+@click.option("--baseline", default=None, help="Compare against results saved with --output.")
+@click.option("--tolerance", default=0.25, show_default=True, help="Allowed slowdown vs baseline (fraction).")
+def bench(selected, repeat, frames_dir, output, baseline, tolerance):
+    """Benchmark capture, OCR, identification, vision and reporting."""
+    from game_automator.bench import run_benchmarks, compare_to_baseline
+    
+    results = run_benchmarks(selected, repeat, frames_dir)
+    
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        click.echo(f"\nResults written to {output}")
+    
+    if not baseline:
+        return
+    
+    with open(baseline) as f:
+        comparisons = compare_to_baseline(results, json.load(f), tolerance)
+    
+    click.echo("\nBaseline comparison:\n")
+    for c in comparisons:
+        flag = "REGRESSION" if c["regression"] else ""
+        label = f"{c['name']}[{c['case']}]"
+        click.echo(
+            f"  {label:50} {c['baseline'] * 1000:9.2f} ms -> {c['current'] * 1000:9.2f} ms "
+            f"({c['change']:+.0%}) {flag}"
+        )
+    
+    if any(c["regression"] for c in comparisons):
+        raise SystemExit(1)
+
+
+@main.group()
+def history():
+    """Query and maintain the scan history store."""
+    pass
+
+
+@history.command("import")
+@click.argument("directory", default="output")
+@click.option("--db", default=None, help="History database path.")
+def history_import(directory: str, db: str):
+    """Import existing CSV output files into the history store."""
+    from game_automator.core.history import HistoryStore, DEFAULT_HISTORY_PATH, import_csv_dir
+    from game_automator.workflows import discover_workflows
+    
+    entity_columns = {
+        name: workflow_class.entity_column
+        for name, workflow_class in discover_workflows().items()
+        if workflow_class.entity_column
+    }
+    
+    with HistoryStore(db or DEFAULT_HISTORY_PATH) as store:
+        imported = import_csv_dir(store, directory, entity_columns)
+    
+    new_files = {name: rows for name, rows in imported.items() if rows}
+    click.echo(f"Imported {sum(new_files.values())} rows from {len(new_files)} files "
+               f"({len(imported) - len(new_files)} already imported or empty).")
+
+
+@history.command("show")
+@click.argument("workflow_name")
+@click.option("--entity", default=None, help="Only show this entity (e.g. a building name).")
+@click.option("--days", default=7.0, show_default=True, help="How far back to look.")
+@click.option("--db", default=None, help="History database path.")
+def history_show(workflow_name: str, entity: str, days: float, db: str):
+    """Show recorded rows for a workflow."""
+    import time
+    from game_automator.core.history import HistoryStore, DEFAULT_HISTORY_PATH
+    
+    with HistoryStore(db or DEFAULT_HISTORY_PATH) as store:
+        records = store.records(workflow_name, entity, since=time.time() - days * 86400)
+    
+    for record in records:
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record.pop("timestamp")))
+        record.pop("run_id")
+        record.pop("entity")
+        click.echo(f"{stamp}  " + "  ".join(f"{k}={v}" for k, v in record.items()))
+    
+    click.echo(f"\n{len(records)} rows")
+
+
+@main.command()
+@click.argument("workflow_name", default="city-investment-scan")
+@click.option("--days", default=7.0, show_default=True, help="History window to analyse (0 = all).")
+@click.option("--value", "value_field", default="current_investment", show_default=True, help="Progress column.")
+@click.option("--max", "max_field", default="max_investment", show_default=True, help="Target column.")
+@click.option("--sort", "sort_by", type=click.Choice(["movers", "eta", "rate", "name"]), default="eta",
+              show_default=True)
+@click.option("--discord", "to_discord", is_flag=True, help="Post the table to DISCORD_WEBHOOK_URL.")
+@click.option("--db", default=None, help="History database path.")
+def stats(workflow_name, days, value_field, max_field, sort_by, to_discord, db):
+    """Show investment trends: rate, projected time to max and biggest movers."""
+    import os
+    from game_automator.core.analytics import (
+        load_series, compute_stats, stats_rows, since_days, SORT_KEYS,
+    )
+    from game_automator.core.history import HistoryStore, DEFAULT_HISTORY_PATH
+    
+    with HistoryStore(db or DEFAULT_HISTORY_PATH) as store:
+        series = load_series(store, workflow_name, value_field, max_field, since_days(days))
+    
+    results = sorted(compute_stats(series), key=SORT_KEYS[sort_by])
+    if not results:
+        click.echo(f"No history for '{workflow_name}'. Run it or 'game-automator history import' first.")
+        return
+    
+    rows = stats_rows(results)
+    columns = ["entity", "current", "max", "rate", "eta", "change"]
+    headers = ["Building", "Current", "Max", "Rate", "To max", "Change"]
+    
+    if to_discord:
+        from game_automator.core.discord import post_table_to_discord
+        
+        webhook_url = os.environ.get("DISCORD_WEBHOOK_URL")
+        if not webhook_url:
+            click.echo("DISCORD_WEBHOOK_URL not set.")
+            raise SystemExit(1)
+        title = f"📈 {workflow_name} trends ({len(series)} samples)"
+        if not post_table_to_discord(webhook_url, title, rows, columns, headers):
+            click.echo("Failed to post to Discord.")
+            raise SystemExit(1)
+        click.echo("Posted to Discord.")
+        return
+    
+    from game_automator.core.discord import format_rows
+    click.echo(f"{workflow_name} trends ({len(series)} samples)\n")
+    for line in format_rows(rows, columns, headers):
+        click.echo(f"  {line}")
+
+
+@main.command()
+@click.option("--socket", "socket_path", default=None,
+              help="Socket path (default: ~/.game-automator/daemon.sock or $GAME_AUTOMATOR_SOCKET).")
+@click.option("--no-warm", is_flag=True, help="Load OCR models on first use instead of at startup.")
+@click.option("--status", is_flag=True, help="Report whether a daemon is running.")
+@click.option("--stop", is_flag=True, help="Stop the running daemon.")
+@click.option("--metrics-port", type=int, default=None,
+              help="Port of the localhost Prometheus endpoint (default 9477 or $GAME_AUTOMATOR_METRICS_PORT, 0 = off).")
+def daemon(socket_path: str, no_warm: bool, status: bool, stop: bool, metrics_port: int):
+    """
+    Run a long-lived daemon that keeps OCR models and clients loaded.
+    'run' and 'hotkey' hand workflows to it, so they start immediately.
+    """
+    from game_automator import daemon as workflow_daemon
+    
+    if status or stop:
+        try:
+            reply = workflow_daemon.request(socket_path, {"command": "shutdown" if stop else "ping"})
+        except workflow_daemon.DaemonUnavailable:
+            click.echo("No daemon running.")
+            raise SystemExit(1)
+        if stop:
+            click.echo("Daemon stopped.")
+        else:
+            running = ", ".join(reply.get("running", [])) or "idle"
+            click.echo(f"Daemon running (pid {reply['pid']}, up {reply['uptime']:.0f}s, {running}).")
+        return
+    
+    workflow_daemon.main(socket_path, warm=not no_warm, metrics_port=metrics_port)
+
+
+@main.group()
+def outbox():
+    """Discord reports waiting to be delivered."""
+    pass
+
+
+@outbox.command("list")
+def outbox_list():
+    """Show queued reports."""
+    import time
+    from game_automator.core.outbox import get_outbox
+    
+    items = get_outbox().pending(include_claimed=True)
+    for item in items:
+        created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(item["created_at"]))
+        click.echo(f"{created}  {item['key']:24} {item['sent']}/{len(item['messages'])} sent, "
+                   f"{item['attempts']} failed attempts")
+    click.echo(f"\n{len(items)} queued")
+
+
+@outbox.command("flush")
+def outbox_flush():
+    """Try to deliver every queued report now."""
+    from game_automator.core.outbox import get_outbox
+    
+    remaining = get_outbox().flush(force=True)
+    if remaining:
+        click.echo(f"{remaining} report(s) could not be delivered and remain queued.")
+        raise SystemExit(1)
+    click.echo("Outbox empty.")
+
+
+@main.command()
+@click.argument("workflow_name")
+@click.option("--every", "every_minutes", type=float, required=True, help="Minutes between runs.")
+@click.option("--jitter", default=0.1, show_default=True,
+              help="Random variation of the interval, as a fraction of it.")
+@click.option("-o", "--option", "option_pairs", multiple=True, metavar="KEY=VALUE",
+              help="Workflow option, e.g. -o incremental=true. Repeatable.")
+def schedule(workflow_name: str, every_minutes: float, jitter: float, option_pairs):
+    """
+    Run a workflow now and then periodically, until interrupted.
+    Uses the daemon if one is running. Scheduled runs don't ask before
+    posting to Discord: pass -o discord=true to post.
+    """
+    import threading
+    from game_automator.daemon import client_target
+    from game_automator.scheduler import Scheduler
+    
+    options = parse_options(option_pairs)
+    options.setdefault("discord", False)
+    
+    scheduler = Scheduler()
+    target = client_target(workflow_name, options, prompt=lambda question: "")
+    scheduler.every(every_minutes * 60, workflow_name, workflow_name, target, jitter=jitter)
+    
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        click.echo("\nStopping...")
+        scheduler.stop()
+        scheduler.wait(timeout=30)
+
+
+@main.command()
+@click.option("--region", "region_spec", required=True, metavar="X,Y,W,H",
+              help="Region of the game window, in pixels or as fractions of the window (all values <= 1).")
+@click.option("--name", default="value", show_default=True, help="Name of the watched value.")
+@click.option("--interval", default=1.0, show_default=True, help="Seconds between samples.")
+@click.option("--pattern", default=None, help="Regex extracting the value from the text (first group if any).")
+@click.option("--title", default="Shop Titans", show_default=True, help="Game window title.")
+@click.option("--no-store", is_flag=True, help="Don't write changes to CSV and the history store.")
+@click.option("--discord", "to_discord", is_flag=True, help="Post changes to DISCORD_WEBHOOK_URL.")
+@click.option("--duration", default=None, type=float, help="Stop after this many seconds.")
+def watch(region_spec, name, interval, pattern, title, no_store, to_discord, duration):
+    """
+    Watch a screen region and report each time its value changes.
+    OCR only runs when the region's pixels change, so a static screen
+    costs almost no CPU.
+    """
+    import os
+    from game_automator.core.window import find_window
+    from game_automator.watch import RegionWatcher, StorageSink, DiscordSink, parse_region
+    
+    # Checked before anything is created, so a bad invocation leaves no files behind
+    webhook_url = os.environ.get("DISCORD_WEBHOOK_URL")
+    if to_discord and not webhook_url:
+        click.echo("DISCORD_WEBHOOK_URL not set.")
+        raise SystemExit(1)
+    
+    window = find_window(title)
+    if window is None:
+        click.echo(f"No window found matching '{title}'.")
+        raise SystemExit(1)
+    try:
+        region = parse_region(region_spec, window)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--region")
+    
+    watcher = RegionWatcher(window, region, name, interval, pattern)
+    watcher.handlers.append(lambda event: print(
+        f"[WATCH] {event['name']}: {event['previous']} -> {event['value']}"
+    ))
+    sink = None
+    if not no_store:
+        sink = StorageSink(name)
+        watcher.handlers.append(sink)
+    if to_discord:
+        watcher.handlers.append(DiscordSink(name, webhook_url))
+    
+    click.echo(f"Watching {region.as_tuple()} of '{window['title']}' every {interval}s (Ctrl+C to stop)...")
+    try:
+        watcher.run(duration=duration)
+    except KeyboardInterrupt:
+        click.echo("\nStopping...")
+    finally:
+        if sink:
+            sink.close()
+    click.echo(f"{watcher.samples} samples, {watcher.reads} OCR reads.")
+    
+    from game_automator.core.outbox import wait_for_delivery
+    queued = wait_for_delivery()
+    if queued:
+        click.echo(f"\n{queued} Discord report(s) still queued; send them with 'game-automator outbox flush'.")
+
+
+@main.command()
+@click.option("--metrics-port", type=int, default=None,
+              help="Port of the localhost Prometheus endpoint (default 9477 or $GAME_AUTOMATOR_METRICS_PORT, 0 = off).")
+def hotkey(metrics_port: int):
     """Start hotkey listener mode."""
     from game_automator.hotkey import main as hotkey_main
-    hotkey_main()
+    hotkey_main(metrics_port)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,31 @@
-from .window import find_window, list_windows
-from .capture import capture_window, capture_region
-from .ocr import extract_text, extract_text_with_positions, find_text
-from .input import click_in_window, click_region_center, humanized_click_in_window
-from .storage import CSVStorage
\ No newline at end of file
+import importlib
+
+# Exports are imported on first access (PEP 562), so using one core module
+# (e.g. history) doesn't load EasyOCR, torch and the capture backend.
+_EXPORTS = {
+    "find_window": "window",
+    "list_windows": "window",
+    "capture_window": "capture",
+    "capture_region": "capture",
+    "extract_text": "ocr",
+    "extract_text_with_positions": "ocr",
+    "find_text": "ocr",
+    "click_in_window": "input",
+    "click_region_center": "input",
+    "humanized_click_in_window": "input",
+    "CSVStorage": "storage",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
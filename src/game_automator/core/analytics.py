@@ -0,0 +1,177 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from game_automator.core.history import HistoryStore
+
+
+@dataclass
+class Series:
+    """Columnar view of a workflow's history, sorted by entity then time."""
+    names: np.ndarray  # Entity names, one per group
+    entity: np.ndarray  # Group index of each row
+    run_id: np.ndarray
+    timestamp: np.ndarray  # Epoch seconds
+    value: np.ndarray
+    maximum: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+
+def load_series(
+    store: HistoryStore,
+    workflow: str,
+    value_field: str,
+    max_field: str,
+    since: Optional[float] = None
+) -> Series:
+    """Load history for a workflow into NumPy arrays in one pass."""
+    rows = store.columns(workflow, [value_field, max_field], since)
+    if not rows:
+        empty = np.array([], dtype=float)
+        return Series(np.array([], dtype=object), np.array([], dtype=int), np.array([], dtype=int),
+                      empty, empty, empty)
+
+    run_ids, entities, timestamps, values, maxima = zip(*rows)
+    names, entity = np.unique(np.array(entities, dtype=object).astype(str), return_inverse=True)
+    value = np.array([_to_float(v) for v in values])
+    maximum = np.array([_to_float(v) for v in maxima])
+    timestamp = np.array(timestamps, dtype=float)
+
+    # Drop unparseable rows, then make sure rows are grouped by entity in time order
+    valid = ~np.isnan(value) & ~np.isnan(maximum)
+    order = np.lexsort((timestamp[valid], entity[valid]))
+    return Series(
+        names,
+        entity[valid][order],
+        np.array(run_ids)[valid][order],
+        timestamp[valid][order],
+        value[valid][order],
+        maximum[valid][order],
+    )
+
+
+def _to_float(value) -> float:
+    try:
+        return float(str(value).replace(",", ""))
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def compute_stats(series: Series) -> List[Dict]:
+    """
+    Per-entity trend metrics, computed across all entities at once:
+    latest value/max, investment rate per hour (least squares over the
+    current level, i.e. since the value last dropped or the max changed),
+    projected hours to max, and change since the previous run.
+    """
+    if len(series) == 0:
+        return []
+
+    n_groups = len(series.names)
+    idx = series.entity
+    t = series.timestamp
+    v = series.value
+    m = series.maximum
+
+    first_of_group = np.ones(len(t), dtype=bool)
+    first_of_group[1:] = idx[1:] != idx[:-1]
+    last_of_group = np.ones(len(t), dtype=bool)
+    last_of_group[:-1] = idx[1:] != idx[:-1]
+    last = np.flatnonzero(last_of_group)
+    groups = idx[last]
+
+    # Segment rows so a level up (value drop or new max) starts a new trend
+    new_segment = first_of_group.copy()
+    new_segment[1:] |= (v[1:] < v[:-1]) | (m[1:] != m[:-1])
+    segment = np.cumsum(new_segment)
+    current_segment = np.zeros(n_groups, dtype=segment.dtype)
+    current_segment[groups] = segment[last]
+    in_current = segment == current_segment[idx]
+
+    # Least-squares slope per group over the current segment, in units per hour
+    hours = (t - t.min()) / 3600.0
+    w = in_current.astype(float)
+    n = np.bincount(idx, weights=w, minlength=n_groups)
+    s_t = np.bincount(idx, weights=w * hours, minlength=n_groups)
+    s_v = np.bincount(idx, weights=w * v, minlength=n_groups)
+    s_tt = np.bincount(idx, weights=w * hours * hours, minlength=n_groups)
+    s_tv = np.bincount(idx, weights=w * hours * v, minlength=n_groups)
+    denominator = n * s_tt - s_t * s_t
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(denominator > 1e-12, (n * s_tv - s_t * s_v) / denominator, np.nan)
+
+    latest_value = np.full(n_groups, np.nan)
+    latest_max = np.full(n_groups, np.nan)
+    latest_time = np.full(n_groups, np.nan)
+    latest_value[groups] = v[last]
+    latest_max[groups] = m[last]
+    latest_time[groups] = t[last]
+
+    # Change since the previous run (previous row of the same entity)
+    has_previous = ~first_of_group[last]
+    change = np.full(n_groups, np.nan)
+    change[groups[has_previous]] = v[last[has_previous]] - v[last[has_previous] - 1]
+
+    remaining = latest_max - latest_value
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eta_hours = np.where(rate > 0, remaining / rate, np.nan)
+    eta_hours = np.where(remaining <= 0, 0.0, eta_hours)
+
+    counts = np.bincount(idx, minlength=n_groups)
+    stats = []
+    for i, name in enumerate(series.names):
+        stats.append({
+            "entity": str(name),
+            "current": latest_value[i],
+            "max": latest_max[i],
+            "rate_per_hour": rate[i],
+            "eta_hours": eta_hours[i],
+            "change": change[i],
+            "samples": int(counts[i]),
+            "last_seen": latest_time[i],
+        })
+    return stats
+
+
+SORT_KEYS = {
+    "movers": lambda s: -abs(np.nan_to_num(s["change"])),
+    "eta": lambda s: np.inf if np.isnan(s["eta_hours"]) else s["eta_hours"],
+    "rate": lambda s: -np.nan_to_num(s["rate_per_hour"]),
+    "name": lambda s: s["entity"],
+}
+
+
+def format_hours(hours: float) -> str:
+    """Format a duration in hours as e.g. '2d 5h', or '-' if unknown."""
+    if hours is None or np.isnan(hours):
+        return "-"
+    if hours <= 0:
+        return "done"
+    if hours < 1:
+        return f"{int(hours * 60)}m"
+    if hours < 48:
+        return f"{hours:.1f}h"
+    return f"{int(hours // 24)}d {int(hours % 24)}h"
+
+
+def stats_rows(stats: List[Dict]) -> List[Dict]:
+    """Render stats as display strings for tables."""
+    rows = []
+    for s in stats:
+        rows.append({
+            "entity": s["entity"],
+            "current": "-" if np.isnan(s["current"]) else f"{s['current']:.0f}",
+            "max": "-" if np.isnan(s["max"]) else f"{s['max']:.0f}",
+            "rate": "-" if np.isnan(s["rate_per_hour"]) else f"{s['rate_per_hour']:.1f}/h",
+            "eta": format_hours(s["eta_hours"]),
+            "change": "-" if np.isnan(s["change"]) else f"{s['change']:+.0f}",
+        })
+    return rows
+
+
+def since_days(days: Optional[float]) -> Optional[float]:
+    return time.time() - days * 86400 if days else None
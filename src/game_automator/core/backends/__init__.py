@@ -0,0 +1,74 @@
+"""Platform backends for window lookup, screen capture and input."""
+
+import os
+import sys
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from PIL import Image
+
+
+class Backend(ABC):
+    """Interface behind core.window, core.capture and core.input."""
+    
+    name: str = "base"
+    
+    @abstractmethod
+    def list_windows(self) -> List[dict]:
+        """List all visible windows with titles."""
+    
+    @abstractmethod
+    def grab(self, left: int, top: int, width: int, height: int) -> Image.Image:
+        """Capture a screen rectangle in absolute coordinates as an RGB image."""
+    
+    @abstractmethod
+    def move_to(self, x: int, y: int, pause: bool = True) -> None:
+        """Move the mouse to absolute screen coordinates."""
+    
+    @abstractmethod
+    def mouse_down(self, pause: bool = True) -> None:
+        """Press the left mouse button."""
+    
+    @abstractmethod
+    def mouse_up(self, pause: bool = True) -> None:
+        """Release the left mouse button."""
+    
+    @abstractmethod
+    def press(self, key: str, pause: bool = True) -> None:
+        """Press and release a keyboard key."""
+    
+    def focus(self, window: dict) -> None:
+        """Bring a window to the front so it receives key presses."""
+
+
+_backend: Optional[Backend] = None
+
+
+def _default_backend() -> Backend:
+    name = os.environ.get("GAME_AUTOMATOR_BACKEND")
+    if name is None:
+        name = "macos" if sys.platform == "darwin" else sys.platform
+    
+    if name == "macos":
+        from .macos import MacOSBackend
+        return MacOSBackend()
+    
+    if name in ("x11", "linux"):
+        from .x11 import X11Backend
+        return X11Backend()
+    
+    raise RuntimeError(f"No backend available for '{name}'")
+
+
+def get_backend() -> Backend:
+    """Get the active backend, creating the platform default if needed."""
+    global _backend
+    if _backend is None:
+        _backend = _default_backend()
+    return _backend
+
+
+def set_backend(backend: Optional[Backend]) -> None:
+    """Replace the active backend (None restores the platform default)."""
+    global _backend
+    _backend = backend
@@ -0,0 +1,81 @@
+import time
+from typing import List
+import AppKit
+import Quartz
+import mss
+import pyautogui
+from PIL import Image
+
+from game_automator.core.capture import bgra_to_image
+from . import Backend
+
+
+# Safety settings
+pyautogui.FAILSAFE = True  # Move mouse to corner to abort
+pyautogui.PAUSE = 0.1  # Small pause between actions
+
+
+class MacOSBackend(Backend):
+    """Quartz window lookup, mss capture and pyautogui input."""
+    
+    name = "macos"
+    
+    def list_windows(self) -> List[dict]:
+        window_list = Quartz.CGWindowListCopyWindowInfo(
+            Quartz.kCGWindowListOptionOnScreenOnly | Quartz.kCGWindowListExcludeDesktopElements,
+            Quartz.kCGNullWindowID
+        )
+        
+        windows = []
+        for window in window_list:
+            name = window.get(Quartz.kCGWindowName, "")
+            if name:
+                bounds = window.get(Quartz.kCGWindowBounds)
+                windows.append({
+                    "id": window.get(Quartz.kCGWindowNumber),
+                    "title": name,
+                    "owner": window.get(Quartz.kCGWindowOwnerName, ""),
+                    "pid": window.get(Quartz.kCGWindowOwnerPID),
+                    "x": int(bounds["X"]),
+                    "y": int(bounds["Y"]),
+                    "width": int(bounds["Width"]),
+                    "height": int(bounds["Height"]),
+                })
+        
+        return windows
+    
+    def grab(self, left: int, top: int, width: int, height: int) -> Image.Image:
+        with mss.mss() as sct:
+            monitor = {
+                "left": left,
+                "top": top,
+                "width": width,
+                "height": height,
+            }
+            screenshot = sct.grab(monitor)
+            return bgra_to_image(screenshot.size, screenshot.bgra)
+    
+    def move_to(self, x: int, y: int, pause: bool = True) -> None:
+        pyautogui.moveTo(x, y, _pause=pause)
+    
+    def mouse_down(self, pause: bool = True) -> None:
+        pyautogui.mouseDown(_pause=pause)
+    
+    def mouse_up(self, pause: bool = True) -> None:
+        pyautogui.mouseUp(_pause=pause)
+    
+    def press(self, key: str, pause: bool = True) -> None:
+        pyautogui.press(key, _pause=pause)
+    
+    def focus(self, window: dict) -> None:
+        # Activate the owning app; each game client runs as its own process
+        pid = window.get("pid")
+        if pid is None:
+            return
+        frontmost = AppKit.NSWorkspace.sharedWorkspace().frontmostApplication()
+        if frontmost is not None and frontmost.processIdentifier() == pid:
+            return
+        app = AppKit.NSRunningApplication.runningApplicationWithProcessIdentifier_(pid)
+        if app is not None:
+            app.activateWithOptions_(AppKit.NSApplicationActivateIgnoringOtherApps)
+            time.sleep(0.1)  # Let the window server switch focus
@@ -0,0 +1,515 @@
+import ctypes
+import ctypes.util
+import os
+import threading
+import time
+from collections import OrderedDict
+from ctypes import POINTER, byref, c_char, c_char_p, c_int, c_long, c_uint, c_ulong, c_void_p
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pyautogui
+from PIL import Image
+
+from . import Backend
+
+
+# Safety settings
+pyautogui.FAILSAFE = True  # Move mouse to corner to abort
+pyautogui.PAUSE = 0.1  # Small pause between actions
+
+# Shared-memory capture buffers kept around, one per capture size
+MAX_SHM_BUFFERS = 8
+
+# Xlib constants
+Window = c_ulong
+Atom = c_ulong
+ZPIXMAP = 2
+ALL_PLANES = c_ulong(~0 & 0xFFFFFFFFFFFFFFFF)
+IS_VIEWABLE = 2
+ANY_PROPERTY_TYPE = 0
+CURRENT_TIME = 0
+REVERT_TO_PARENT = 2
+CLIENT_MESSAGE = 33
+
+STRUCTURE_NOTIFY_MASK = 1 << 17
+SUBSTRUCTURE_NOTIFY_MASK = 1 << 19
+SUBSTRUCTURE_REDIRECT_MASK = 1 << 20
+PROPERTY_CHANGE_MASK = 1 << 22
+
+CREATE_NOTIFY = 16
+DESTROY_NOTIFY = 17
+UNMAP_NOTIFY = 18
+MAP_NOTIFY = 19
+REPARENT_NOTIFY = 21
+CONFIGURE_NOTIFY = 22
+PROPERTY_NOTIFY = 28
+
+IPC_PRIVATE = 0
+IPC_CREAT = 0o1000
+IPC_RMID = 0
+
+
+class XWindowAttributes(ctypes.Structure):
+    _fields_ = [
+        ("x", c_int), ("y", c_int), ("width", c_int), ("height", c_int), ("border_width", c_int),
+        ("depth", c_int), ("visual", c_void_p), ("root", Window), ("class_", c_int),
+        ("bit_gravity", c_int), ("win_gravity", c_int), ("backing_store", c_int),
+        ("backing_planes", c_ulong), ("backing_pixel", c_ulong), ("save_under", c_int),
+        ("colormap", c_ulong), ("map_installed", c_int), ("map_state", c_int),
+        ("all_event_masks", c_long), ("your_event_mask", c_long), ("do_not_propagate_mask", c_long),
+        ("override_redirect", c_int), ("screen", c_void_p),
+    ]
+
+
+class XImage(ctypes.Structure):
+    # Leading fields only; images are always allocated by Xlib
+    _fields_ = [
+        ("width", c_int), ("height", c_int), ("xoffset", c_int), ("format", c_int),
+        ("data", c_void_p), ("byte_order", c_int), ("bitmap_unit", c_int),
+        ("bitmap_bit_order", c_int), ("bitmap_pad", c_int), ("depth", c_int),
+        ("bytes_per_line", c_int), ("bits_per_pixel", c_int),
+    ]
+
+
+class XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [("shmseg", c_ulong), ("shmid", c_int), ("shmaddr", c_void_p), ("readOnly", c_int)]
+
+
+class XAnyEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", c_int), ("serial", c_ulong), ("send_event", c_int), ("display", c_void_p),
+        ("window", Window),
+    ]
+
+
+class XStructureEvent(ctypes.Structure):
+    """Common layout of Configure/Map/Unmap/Destroy/ReparentNotify: event window, then subject window."""
+    _fields_ = [
+        ("type", c_int), ("serial", c_ulong), ("send_event", c_int), ("display", c_void_p),
+        ("event", Window), ("window", Window),
+    ]
+
+
+class XPropertyEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", c_int), ("serial", c_ulong), ("send_event", c_int), ("display", c_void_p),
+        ("window", Window), ("atom", Atom), ("time", c_ulong), ("state", c_int),
+    ]
+
+
+class XClientMessageEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", c_int), ("serial", c_ulong), ("send_event", c_int), ("display", c_void_p),
+        ("window", Window), ("message_type", Atom), ("format", c_int), ("data", c_long * 5),
+    ]
+
+
+class XErrorEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", c_int), ("display", c_void_p), ("resourceid", c_ulong), ("serial", c_ulong),
+        ("error_code", ctypes.c_ubyte), ("request_code", ctypes.c_ubyte), ("minor_code", ctypes.c_ubyte),
+    ]
+
+
+class XEvent(ctypes.Union):
+    _fields_ = [
+        ("type", c_int), ("any", XAnyEvent), ("structure", XStructureEvent),
+        ("property", XPropertyEvent), ("client", XClientMessageEvent), ("pad", c_long * 24),
+    ]
+
+
+XErrorHandler = ctypes.CFUNCTYPE(c_int, c_void_p, POINTER(XErrorEvent))
+
+
+def _load(name: str) -> ctypes.CDLL:
+    path = ctypes.util.find_library(name)
+    if path is None:
+        raise RuntimeError(f"lib{name} not found; the X11 backend needs libX11 and libXext")
+    return ctypes.CDLL(path)
+
+
+def _prototype(lib: ctypes.CDLL, name: str, restype, *argtypes) -> None:
+    func = getattr(lib, name)
+    func.restype = restype
+    func.argtypes = argtypes
+
+
+_xlib = _load("X11")
+_xext = _load("Xext")
+_libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+_prototype(_xlib, "XInitThreads", c_int)
+_prototype(_xlib, "XOpenDisplay", c_void_p, c_char_p)
+_prototype(_xlib, "XCloseDisplay", c_int, c_void_p)
+_prototype(_xlib, "XDefaultRootWindow", Window, c_void_p)
+_prototype(_xlib, "XSetErrorHandler", c_void_p, XErrorHandler)
+_prototype(_xlib, "XInternAtom", Atom, c_void_p, c_char_p, c_int)
+_prototype(_xlib, "XGetWindowProperty", c_int, c_void_p, Window, Atom, c_long, c_long, c_int, Atom,
+           POINTER(Atom), POINTER(c_int), POINTER(c_ulong), POINTER(c_ulong), POINTER(c_void_p))
+_prototype(_xlib, "XQueryTree", c_int, c_void_p, Window, POINTER(Window), POINTER(Window),
+           POINTER(POINTER(Window)), POINTER(c_uint))
+_prototype(_xlib, "XGetWindowAttributes", c_int, c_void_p, Window, POINTER(XWindowAttributes))
+_prototype(_xlib, "XTranslateCoordinates", c_int, c_void_p, Window, Window, c_int, c_int,
+           POINTER(c_int), POINTER(c_int), POINTER(Window))
+_prototype(_xlib, "XFetchName", c_int, c_void_p, Window, POINTER(c_char_p))
+_prototype(_xlib, "XSelectInput", c_int, c_void_p, Window, c_long)
+_prototype(_xlib, "XPending", c_int, c_void_p)
+_prototype(_xlib, "XNextEvent", c_int, c_void_p, POINTER(XEvent))
+_prototype(_xlib, "XSendEvent", c_int, c_void_p, Window, c_int, c_long, POINTER(XEvent))
+_prototype(_xlib, "XRaiseWindow", c_int, c_void_p, Window)
+_prototype(_xlib, "XSetInputFocus", c_int, c_void_p, Window, c_int, c_ulong)
+_prototype(_xlib, "XGetImage", POINTER(XImage), c_void_p, Window, c_int, c_int, c_uint, c_uint, c_ulong, c_int)
+_prototype(_xlib, "XFlush", c_int, c_void_p)
+_prototype(_xlib, "XSync", c_int, c_void_p, c_int)
+_prototype(_xlib, "XFree", c_int, c_void_p)
+
+_prototype(_xext, "XShmQueryExtension", c_int, c_void_p)
+_prototype(_xext, "XShmCreateImage", POINTER(XImage), c_void_p, c_void_p, c_uint, c_int, c_void_p,
+           POINTER(XShmSegmentInfo), c_uint, c_uint)
+_prototype(_xext, "XShmAttach", c_int, c_void_p, POINTER(XShmSegmentInfo))
+_prototype(_xext, "XShmDetach", c_int, c_void_p, POINTER(XShmSegmentInfo))
+_prototype(_xext, "XShmGetImage", c_int, c_void_p, Window, POINTER(XImage), c_int, c_int, c_ulong)
+
+_prototype(_libc, "shmget", c_int, c_int, ctypes.c_size_t, c_int)
+_prototype(_libc, "shmat", c_void_p, c_int, c_void_p, c_int)
+_prototype(_libc, "shmdt", c_int, c_void_p)
+_prototype(_libc, "shmctl", c_int, c_int, c_int, c_void_p)
+
+# Must precede any other Xlib call; capture and input run on several threads
+_xlib.XInitThreads()
+
+
+class _ShmBuffer:
+    """A shared-memory XImage of one size, reused for every capture of that size."""
+
+    def __init__(self, display: int, visual: int, depth: int, width: int, height: int):
+        self.display = display
+        self.info = XShmSegmentInfo()
+        self.image = _xext.XShmCreateImage(display, visual, depth, ZPIXMAP, None, byref(self.info), width, height)
+        if not self.image:
+            raise RuntimeError("XShmCreateImage failed")
+        image = self.image.contents
+        if image.bits_per_pixel != 32:
+            _xlib.XFree(self.image)
+            raise RuntimeError(f"Unsupported X11 pixel format ({image.bits_per_pixel} bits per pixel)")
+
+        size = image.bytes_per_line * height
+        self.info.shmid = _libc.shmget(IPC_PRIVATE, size, IPC_CREAT | 0o600)
+        if self.info.shmid < 0:
+            _xlib.XFree(self.image)
+            raise OSError(ctypes.get_errno(), "shmget failed")
+        address = _libc.shmat(self.info.shmid, None, 0)
+        if address in (None, ctypes.c_void_p(-1).value):
+            _libc.shmctl(self.info.shmid, IPC_RMID, None)
+            _xlib.XFree(self.image)
+            raise OSError(ctypes.get_errno(), "shmat failed")
+        self.info.shmaddr = address
+        self.info.readOnly = 0
+        image.data = address
+
+        _xext.XShmAttach(display, byref(self.info))
+        _xlib.XSync(display, 0)
+        # Marked for removal now so the segment goes away even if we crash;
+        # it lives on while attached
+        _libc.shmctl(self.info.shmid, IPC_RMID, None)
+
+        self.size = (width, height)
+        self.stride = image.bytes_per_line
+        self.data = (c_char * size).from_address(address)
+        self.array = np.frombuffer(self.data, dtype=np.uint8).reshape(height, self.stride // 4, 4)[:, :width]
+
+    def release(self) -> None:
+        _xext.XShmDetach(self.display, byref(self.info))
+        _xlib.XSync(self.display, 0)
+        _xlib.XFree(self.image)
+        _libc.shmdt(self.info.shmaddr)
+
+
+class X11Backend(Backend):
+    """
+    X11 window lookup and MIT-SHM capture through Xlib (ctypes), with
+    pyautogui input. Works under Xvfb and for games running under Wine.
+    Window titles and geometry are cached and invalidated by X events
+    (configure, map, property changes), so repeated lookups don't
+    re-query the server; captures reuse shared-memory buffers.
+    """
+
+    name = "x11"
+
+    def __init__(self, display_name: Optional[str] = None):
+        display_name = display_name or os.environ.get("DISPLAY")
+        self.display = _xlib.XOpenDisplay(display_name.encode() if display_name else None)
+        if not self.display:
+            raise RuntimeError(f"Cannot open X display '{display_name}'")
+        self.root = _xlib.XDefaultRootWindow(self.display)
+        self._lock = threading.RLock()
+        self._error: Optional[int] = None
+        self._error_handler = XErrorHandler(self._on_error)  # Kept referenced while installed
+        _xlib.XSetErrorHandler(self._error_handler)
+
+        attributes = XWindowAttributes()
+        _xlib.XGetWindowAttributes(self.display, self.root, byref(attributes))
+        self._visual = attributes.visual
+        self._depth = attributes.depth
+        self.use_shm = bool(_xext.XShmQueryExtension(self.display))
+        self._buffers: "OrderedDict[Tuple[int, int], _ShmBuffer]" = OrderedDict()
+
+        self._atoms: Dict[str, int] = {}
+        self._clients: Optional[List[int]] = None  # Top-level client windows
+        self._info: Dict[int, dict] = {}  # Title, owner and pid per window
+        self._geometry: Dict[int, Optional[Tuple[int, int, int, int]]] = {}  # None when not viewable
+        _xlib.XSelectInput(self.display, self.root, PROPERTY_CHANGE_MASK | SUBSTRUCTURE_NOTIFY_MASK)
+        _xlib.XFlush(self.display)
+
+    def close(self) -> None:
+        with self._lock:
+            for buffer in self._buffers.values():
+                buffer.release()
+            self._buffers.clear()
+            _xlib.XCloseDisplay(self.display)
+            self.display = None
+
+    # Windows
+
+    def list_windows(self) -> List[dict]:
+        with self._lock:
+            self._process_events()
+            if self._clients is None:
+                self._clients = self._query_clients()
+
+            windows = []
+            for window_id in self._clients:
+                info = self._info.get(window_id)
+                if info is None:
+                    info = self._query_info(window_id)
+                    if info is None:
+                        continue
+                    self._info[window_id] = info
+                if window_id not in self._geometry:
+                    self._geometry[window_id] = self._query_geometry(window_id)
+                geometry = self._geometry[window_id]
+                if not info["title"] or geometry is None:
+                    continue
+                x, y, width, height = geometry
+                windows.append({
+                    "id": window_id,
+                    **info,
+                    "x": x,
+                    "y": y,
+                    "width": width,
+                    "height": height,
+                })
+            return windows
+
+    def focus(self, window: dict) -> None:
+        window_id = window["id"]
+        with self._lock:
+            active = self._get_property(self.root, "_NET_ACTIVE_WINDOW")
+            if active is not None:
+                if _to_longs(active)[:1] == [window_id]:
+                    return
+                # Ask the window manager, which may refuse a plain focus change
+                event = XEvent()
+                event.client.type = CLIENT_MESSAGE
+                event.client.window = window_id
+                event.client.message_type = self._atom("_NET_ACTIVE_WINDOW")
+                event.client.format = 32
+                event.client.data[0] = 2  # Source: pager/tool rather than application
+                event.client.data[1] = CURRENT_TIME
+                _xlib.XSendEvent(
+                    self.display, self.root, 0,
+                    SUBSTRUCTURE_REDIRECT_MASK | SUBSTRUCTURE_NOTIFY_MASK, byref(event),
+                )
+            else:
+                _xlib.XRaiseWindow(self.display, window_id)
+                _xlib.XSetInputFocus(self.display, window_id, REVERT_TO_PARENT, CURRENT_TIME)
+            _xlib.XSync(self.display, 0)
+            self._error = None
+        time.sleep(0.1)  # Let the window manager switch focus
+
+    def _process_events(self) -> None:
+        """Apply pending X events to the window caches."""
+        event = XEvent()
+        while _xlib.XPending(self.display):
+            _xlib.XNextEvent(self.display, byref(event))
+            kind = event.type
+            if kind == CONFIGURE_NOTIFY:
+                window_id = event.structure.window
+                if window_id in self._geometry:
+                    self._geometry.pop(window_id)
+                else:
+                    # A window manager frame moved; its client's absolute position changed too
+                    self._geometry.clear()
+            elif kind in (MAP_NOTIFY, UNMAP_NOTIFY, REPARENT_NOTIFY):
+                self._geometry.pop(event.structure.window, None)
+                self._clients = None
+            elif kind in (CREATE_NOTIFY, DESTROY_NOTIFY):
+                self._info.pop(event.structure.window, None)
+                self._geometry.pop(event.structure.window, None)
+                self._clients = None
+            elif kind == PROPERTY_NOTIFY:
+                if event.property.window == self.root:
+                    if event.property.atom == self._atom("_NET_CLIENT_LIST"):
+                        self._clients = None
+                else:
+                    self._info.pop(event.property.window, None)
+
+    def _query_clients(self) -> List[int]:
+        clients = self._get_property(self.root, "_NET_CLIENT_LIST")
+        if clients is not None:
+            return _to_longs(clients)
+
+        # No EWMH window manager (e.g. bare Xvfb): use the root's children
+        root_return, parent_return = Window(), Window()
+        children = POINTER(Window)()
+        count = c_uint()
+        if not _xlib.XQueryTree(self.display, self.root, byref(root_return), byref(parent_return),
+                                byref(children), byref(count)):
+            return []
+        windows = [children[i] for i in range(count.value)]
+        if children:
+            _xlib.XFree(children)
+        return windows
+
+    def _query_info(self, window_id: int) -> Optional[dict]:
+        # Watch the window so moves and title changes invalidate the cache
+        _xlib.XSelectInput(self.display, window_id, STRUCTURE_NOTIFY_MASK | PROPERTY_CHANGE_MASK)
+        title = self._get_property(window_id, "_NET_WM_NAME")
+        if title is not None:
+            title = title.decode("utf-8", "replace")
+        else:
+            name = c_char_p()
+            if _xlib.XFetchName(self.display, window_id, byref(name)) and name.value is not None:
+                title = name.value.decode("latin-1")
+                _xlib.XFree(name)
+        wm_class = self._get_property(window_id, "WM_CLASS")
+        pid = self._get_property(window_id, "_NET_WM_PID")
+        _xlib.XSync(self.display, 0)
+        if self._take_error() is not None:
+            return None  # Destroyed meanwhile
+        return {
+            "title": title or "",
+            "owner": wm_class.split(b"\0")[1].decode("latin-1") if wm_class and wm_class.count(b"\0") >= 1 else "",
+            "pid": _to_longs(pid)[0] if pid else None,
+        }
+
+    def _query_geometry(self, window_id: int) -> Optional[Tuple[int, int, int, int]]:
+        attributes = XWindowAttributes()
+        if not _xlib.XGetWindowAttributes(self.display, window_id, byref(attributes)):
+            self._take_error()
+            return None
+        if attributes.map_state != IS_VIEWABLE:
+            return None
+        x, y, child = c_int(), c_int(), Window()
+        _xlib.XTranslateCoordinates(self.display, window_id, self.root, 0, 0, byref(x), byref(y), byref(child))
+        if self._take_error() is not None:
+            return None
+        return x.value, y.value, attributes.width, attributes.height
+
+    def _get_property(self, window_id: int, name: str) -> Optional[bytes]:
+        """Raw value of a window property (format-32 items are C longs), or None."""
+        actual_type, actual_format = Atom(), c_int()
+        count, remaining = c_ulong(), c_ulong()
+        data = c_void_p()
+        status = _xlib.XGetWindowProperty(
+            self.display, window_id, self._atom(name), 0, 1 << 16, 0, ANY_PROPERTY_TYPE,
+            byref(actual_type), byref(actual_format), byref(count), byref(remaining), byref(data),
+        )
+        if status != 0 or not data.value:
+            return None
+        try:
+            if actual_type.value == 0:
+                return None
+            item_size = {8: 1, 16: ctypes.sizeof(ctypes.c_short), 32: ctypes.sizeof(c_long)}[actual_format.value]
+            return ctypes.string_at(data.value, count.value * item_size)
+        finally:
+            _xlib.XFree(data)
+
+    def _atom(self, name: str) -> int:
+        atom = self._atoms.get(name)
+        if atom is None:
+            atom = self._atoms[name] = _xlib.XInternAtom(self.display, name.encode(), 0)
+        return atom
+
+    def _on_error(self, display, error) -> int:
+        # Windows can vanish between listing and querying them; note and carry on
+        self._error = error.contents.error_code
+        return 0
+
+    def _take_error(self) -> Optional[int]:
+        error, self._error = self._error, None
+        return error
+
+    # Capture
+
+    def grab(self, left: int, top: int, width: int, height: int) -> Image.Image:
+        with self._lock:
+            if not self.use_shm:
+                return self._grab_copy(left, top, width, height)
+            buffer = self._shm_grab(left, top, width, height)
+            return Image.frombytes("RGB", (width, height), buffer.data, "raw", "BGRX", buffer.stride)
+
+    def grab_array(self, left: int, top: int, width: int, height: int) -> np.ndarray:
+        """
+        Capture a screen rectangle as a (height, width, 4) BGRA array.
+        With MIT-SHM this is a view of the reusable shared-memory buffer,
+        overwritten by the next capture of the same size; copy it to keep it.
+        """
+        with self._lock:
+            if not self.use_shm:
+                image = self._grab_copy(left, top, width, height)
+                rgb = np.asarray(image)
+                return np.dstack([rgb[..., ::-1], np.full(rgb.shape[:2], 255, dtype=np.uint8)])
+            return self._shm_grab(left, top, width, height).array
+
+    def _shm_grab(self, left: int, top: int, width: int, height: int) -> _ShmBuffer:
+        key = (width, height)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = _ShmBuffer(self.display, self._visual, self._depth, width, height)
+            if len(self._buffers) > MAX_SHM_BUFFERS:
+                _, oldest = self._buffers.popitem(last=False)
+                oldest.release()
+        else:
+            self._buffers.move_to_end(key)
+
+        ok = _xext.XShmGetImage(self.display, self.root, buffer.image, left, top, ALL_PLANES)
+        error = self._take_error()
+        if not ok or error is not None:
+            raise RuntimeError(f"X11 capture of {width}x{height} at ({left}, {top}) failed (is it on screen?)")
+        return buffer
+
+    def _grab_copy(self, left: int, top: int, width: int, height: int) -> Image.Image:
+        """Capture without shared memory (e.g. a remote display)."""
+        image = _xlib.XGetImage(self.display, self.root, left, top, width, height, ALL_PLANES, ZPIXMAP)
+        self._take_error()
+        if not image:
+            raise RuntimeError(f"X11 capture of {width}x{height} at ({left}, {top}) failed (is it on screen?)")
+        try:
+            contents = image.contents
+            data = ctypes.string_at(contents.data, contents.bytes_per_line * height)
+            return Image.frombytes("RGB", (width, height), data, "raw", "BGRX", contents.bytes_per_line)
+        finally:
+            _xlib.XFree(image.contents.data)
+            _xlib.XFree(image)
+
+    # Input
+
+    def move_to(self, x: int, y: int, pause: bool = True) -> None:
+        pyautogui.moveTo(x, y, _pause=pause)
+
+    def mouse_down(self, pause: bool = True) -> None:
+        pyautogui.mouseDown(_pause=pause)
+
+    def mouse_up(self, pause: bool = True) -> None:
+        pyautogui.mouseUp(_pause=pause)
+
+    def press(self, key: str, pause: bool = True) -> None:
+        pyautogui.press(key, _pause=pause)
+
+
+def _to_longs(data: bytes) -> List[int]:
+    """Decode a format-32 property value (an array of C longs)."""
+    count = len(data) // ctypes.sizeof(c_ulong)
+    return list((c_ulong * count).from_buffer_copy(data))
@@ -1,24 +1,47 @@
+import hashlib
+import time
 from typing import Optional, Tuple
-import mss
-from PIL import Image
+from PIL import Image, ImageChops
 
+from game_automator.core import metrics
+from game_automator.core.backends import get_backend
+from game_automator.core.recorder import record_frame
+from game_automator.core.trace import traced
 
+# Size of the thumbnail used for cheap frame comparisons
+SIGNATURE_SIZE = (64, 64)
+
+# Per-pixel thumbnail difference (0-255) above which a pixel counts as
+# changed, and the fraction of changed pixels above which two frames
+# differ. Counting pixels rather than taking a mean, so a changed label
+# counts; a fraction rather than any pixel, so ambient animation (a few
+# flickering pixels) doesn't
+CHANGE_THRESHOLD = 24
+CHANGE_FRACTION = 0.005
+
+FRAMES_CAPTURED = metrics.counter("frames_captured_total", "Screen grabs, by kind (window or region).", ["kind"])
+CAPTURE_SECONDS = metrics.histogram("capture_seconds", "Time to grab a window or region.", ["kind"])
+
+
+def bgra_to_image(size: Tuple[int, int], bgra: bytes) -> Image.Image:
+    """Convert a raw BGRA screen grab into an RGB image."""
+    return Image.frombytes("RGB", size, bgra, "raw", "BGRX")
+
+
+@traced("capture.window")
 def capture_window(window: dict) -> Image.Image:
     """
     Capture a screenshot of the specified window.
     Returns a PIL Image.
     """
-    with mss.mss() as sct:
-        monitor = {
-            "left": window["x"],
-            "top": window["y"],
-            "width": window["width"],
-            "height": window["height"],
-        }
-        screenshot = sct.grab(monitor)
-        return Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
+    with CAPTURE_SECONDS.time(kind="window"):
+        image = get_backend().grab(window["x"], window["y"], window["width"], window["height"])
+    FRAMES_CAPTURED.inc(kind="window")
+    record_frame(image, "window")
+    return image
 
 
+@traced("capture.region")
 def capture_region(window: dict, region: Tuple[int, int, int, int]) -> Image.Image:
     """
     Capture a specific region within a window.
@@ -26,12 +49,102 @@ def capture_region(window: dict, region: Tuple[int, int, int, int]) -> Image.Ima
     Returns a PIL Image.
     """
     x, y, width, height = region
-    with mss.mss() as sct:
-        monitor = {
-            "left": window["x"] + x,
-            "top": window["y"] + y,
-            "width": width,
-            "height": height,
-        }
-        screenshot = sct.grab(monitor)
-        return Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
\ No newline at end of file
+    with CAPTURE_SECONDS.time(kind="region"):
+        image = get_backend().grab(window["x"] + x, window["y"] + y, width, height)
+    FRAMES_CAPTURED.inc(kind="region")
+    return image
+
+
+@traced("capture.signature")
+def frame_signature(image: Image.Image) -> Image.Image:
+    """
+    Reduce a frame to a small grayscale thumbnail for change detection.
+    Comparing signatures is far cheaper than running OCR on the full frame.
+    """
+    return image.convert("L").resize(SIGNATURE_SIZE, Image.BILINEAR)
+
+
+def frames_differ(
+    a: Optional[Image.Image],
+    b: Optional[Image.Image],
+    threshold: int = CHANGE_THRESHOLD,
+    fraction: float = CHANGE_FRACTION
+) -> bool:
+    """
+    Compare two frame signatures.
+    Returns True if more than fraction of their pixels differ by more than
+    threshold (or either is missing).
+    """
+    if a is None or b is None or a.size != b.size:
+        return True
+    histogram = ImageChops.difference(a, b).histogram()
+    changed = sum(histogram[threshold + 1:])
+    return changed > fraction * a.width * a.height
+
+
+@traced("capture.fingerprint")
+def region_fingerprint(image: Image.Image, size: Tuple[int, int] = (160, 96)) -> str:
+    """
+    Content fingerprint of an image region (e.g. a building panel).
+    Coarsely quantized so capture noise doesn't change it, but fine enough
+    that any changed digit does.
+    """
+    reduced = image.convert("L").resize(size, Image.BILINEAR).point(lambda p: p >> 5)
+    return hashlib.sha1(reduced.tobytes()).hexdigest()[:20]
+
+
+@traced("capture.wait_for_change", "wait")
+def wait_for_change(
+    window: dict,
+    reference: Optional[Image.Image],
+    timeout: float = 5.0,
+    poll_interval: float = 0.1,
+    threshold: int = CHANGE_THRESHOLD
+) -> Optional[Tuple[Image.Image, Image.Image]]:
+    """
+    Block until the window contents differ from the reference signature.
+    Returns (frame, signature) for the changed frame, or None on timeout.
+    A reference of None returns the first captured frame immediately.
+    """
+    deadline = time.time() + timeout
+    while True:
+        frame = capture_window(window)
+        signature = frame_signature(frame)
+        if frames_differ(reference, signature, threshold):
+            return frame, signature
+        
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return None
+        time.sleep(min(poll_interval, remaining))
+
+@traced("capture.wait_for_stable", "wait")
+def wait_for_stable(
+    window: dict,
+    timeout: float = 2.0,
+    settle: float = 0.15,
+    poll_interval: float = 0.05,
+    threshold: int = CHANGE_THRESHOLD
+) -> Optional[Image.Image]:
+    """
+    Block until the window contents stop changing for `settle` seconds
+    (e.g. an animation has finished).
+    Returns the settled frame, or None on timeout.
+    """
+    deadline = time.time() + timeout
+    frame = capture_window(window)
+    signature = frame_signature(frame)
+    stable_since = time.time()
+    
+    while True:
+        if time.time() - stable_since >= settle:
+            return frame
+        if time.time() >= deadline:
+            return None
+        time.sleep(poll_interval)
+        
+        frame = capture_window(window)
+        new_signature = frame_signature(frame)
+        if frames_differ(signature, new_signature, threshold):
+            stable_since = time.time()
+        signature = new_signature
\ No newline at end of file
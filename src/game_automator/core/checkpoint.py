@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
+
+from PIL import Image
+
+DEFAULT_CHECKPOINT_DIR = os.path.join("output", "checkpoints")
+
+
+class Checkpoint:
+    """
+    On-disk progress of a workflow run: the current step, its JSON state,
+    and captured frames. Frames are written on a background thread; state
+    is only saved once the frames it may refer to are on disk.
+    """
+
+    def __init__(self, workflow_name: str, root: str = DEFAULT_CHECKPOINT_DIR):
+        self.workflow_name = workflow_name
+        self.directory = os.path.join(root, workflow_name)
+        self.frames_dir = os.path.join(self.directory, "frames")
+        self.state_path = os.path.join(self.directory, "state.json")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        self._pending: List[Future] = []
+
+    def exists(self) -> bool:
+        return os.path.exists(self.state_path)
+
+    def load(self) -> Dict:
+        """Load saved state ({"step": ..., **data}), or {} if there is none."""
+        if not self.exists():
+            return {}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def save(self, step: str, **data) -> None:
+        """Record that the run reached `step`, with any JSON-serializable state."""
+        self.wait()
+        os.makedirs(self.directory, exist_ok=True)
+        state = {"step": step, "updated_at": time.time(), **data}
+
+        # Write then rename so a crash never leaves a half-written state file
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def save_frame(self, key: str, image: Union[Image.Image, bytes]) -> str:
+        """Queue a frame (image or PNG bytes) to be written as PNG. Returns its path."""
+        os.makedirs(self.frames_dir, exist_ok=True)
+        path = self.frame_path(key)
+        if isinstance(image, bytes):
+            self._pending.append(self._writer.submit(_write_bytes, path, image))
+        else:
+            self._pending.append(self._writer.submit(image.save, path, format="PNG"))
+        return path
+
+    def load_frame(self, key: str) -> Optional[Image.Image]:
+        path = self.frame_path(key)
+        if not os.path.exists(path):
+            return None
+        with Image.open(path) as image:
+            return image.convert("RGB")
+
+    def load_frame_data(self, key: str) -> Optional[bytes]:
+        """PNG bytes of a saved frame, or None."""
+        path = self.frame_path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def frame_path(self, key: str) -> str:
+        return os.path.join(self.frames_dir, f"{key}.png")
+
+    def wait(self) -> None:
+        """Block until queued frame writes have finished."""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def clear(self) -> None:
+        """Delete the checkpoint (e.g. after a successful run)."""
+        self.wait()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
\ No newline at end of file
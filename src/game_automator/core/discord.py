@@ -1,35 +1,183 @@
-import requests
+import threading
+import time
 from typing import List, Dict, Optional
 
+import requests
+
+from game_automator.core.trace import traced
+
+# Discord rejects messages longer than this
+MESSAGE_LIMIT = 2000
+
+DEFAULT_TIMEOUT = 10.0
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Shared HTTP session, so connections to Discord are reused."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+    return _session
+
+
+class RateLimiter:
+    """
+    Tracks Discord rate limit buckets from response headers.
+    Requests to a URL wait until its bucket has capacity again.
+    """
+    
+    def __init__(self):
+        self._buckets: Dict[str, str] = {}  # URL -> bucket id
+        self._resume_at: Dict[str, float] = {}  # Bucket id (or URL) -> time it has capacity
+        self._lock = threading.Lock()
+    
+    def delay(self, url: str) -> float:
+        """Seconds to wait before the next request to url."""
+        with self._lock:
+            key = self._buckets.get(url, url)
+            return max(0.0, self._resume_at.get(key, 0.0) - time.monotonic())
+    
+    def wait(self, url: str) -> None:
+        delay = self.delay(url)
+        if delay > 0:
+            time.sleep(delay)
+    
+    def update(self, url: str, headers) -> None:
+        """Record the bucket state reported by a response."""
+        with self._lock:
+            key = headers.get("X-RateLimit-Bucket") or self._buckets.get(url, url)
+            self._buckets[url] = key
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset_after = headers.get("X-RateLimit-Reset-After")
+            if remaining is not None and reset_after is not None and int(remaining) == 0:
+                self._resume_at[key] = time.monotonic() + float(reset_after)
+    
+    def block(self, url: str, seconds: float) -> None:
+        """Hold off requests to url's bucket (after a 429)."""
+        with self._lock:
+            key = self._buckets.get(url, url)
+            self._resume_at[key] = max(self._resume_at.get(key, 0.0), time.monotonic() + seconds)
+
+
+_rate_limiter = RateLimiter()
+
+
+def retry_after(response: requests.Response) -> float:
+    """Seconds to wait after a 429, from the JSON body or Retry-After header."""
+    try:
+        return float(response.json()["retry_after"])
+    except Exception:
+        pass
+    try:
+        return float(response.headers.get("Retry-After", 1.0))
+    except ValueError:
+        return 1.0
+
+
+class DiscordWebhook:
+    """
+    Posts messages to a Discord webhook over a pooled session.
+    Waits for rate limit buckets, honours 429 retry_after, and retries
+    server errors and connection failures with backoff.
+    """
+    
+    def __init__(
+        self,
+        url: str,
+        session: Optional[requests.Session] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = 3,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        self.url = url
+        self.session = session or get_session()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter or _rate_limiter
+        # Why the last send() failed, and whether sending again could succeed
+        # (False when Discord rejected the message itself or the webhook)
+        self.last_error: Optional[str] = None
+        self.retryable = True
+    
+    @traced("discord.post")
+    def send(self, content: str) -> bool:
+        """Post one message. Returns True once Discord accepts it."""
+        self.last_error = None
+        self.retryable = True
+        backoff = 1.0
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait(self.url)
+            try:
+                response = self.session.post(self.url, json={"content": content}, timeout=self.timeout)
+            except requests.RequestException as e:
+                print(f"[WARNING] Discord request failed: {type(e).__name__}")
+                self.last_error = f"Request failed: {type(e).__name__}"
+                if attempt < self.max_retries:
+                    time.sleep(backoff)
+                    backoff *= 2
+                continue
+            
+            self.rate_limiter.update(self.url, response.headers)
+            
+            if response.status_code == 429:
+                wait = retry_after(response)
+                print(f"[INFO] Discord rate limited, retrying in {wait:.1f}s")
+                self.rate_limiter.block(self.url, wait)
+                continue
+            
+            if 500 <= response.status_code < 600 and attempt < self.max_retries:
+                time.sleep(backoff)
+                backoff *= 2
+                continue
+            
+            if response.ok:
+                return True
+            
+            print(f"[ERROR] Discord rejected message: {response.status_code} {response.text[:200]}")
+            self.last_error = f"{response.status_code} {response.text[:200]}"
+            # Other 4xx (bad content, unknown or revoked webhook) won't succeed on retry
+            self.retryable = not 400 <= response.status_code < 500
+            return False
+        
+        print("[ERROR] Failed to post to Discord after retries")
+        return False
+    
+    def send_all(self, messages: List[str]) -> bool:
+        """Post messages in order. Returns True if all were accepted."""
+        success = True
+        for message in messages:
+            if not self.send(message):
+                success = False
+        return success
+
 
 def post_to_discord(webhook_url: str, content: str) -> bool:
     """Post a simple text message to Discord."""
     try:
-        response = requests.post(webhook_url, json={"content": content})
-        return response.status_code == 204
+        return DiscordWebhook(webhook_url).send(content)
     except Exception as e:
         print(f"[ERROR] Failed to post to Discord: {e}")
         return False
 
 
-def post_table_to_discord(
-    webhook_url: str, 
-    title: str,
-    data: List[Dict], 
+def format_rows(
+    data: List[Dict],
     columns: List[str],
-    column_headers: Optional[List[str]] = None
-) -> bool:
+    column_headers: Optional[List[str]] = None,
+    max_line: Optional[int] = None
+) -> List[str]:
     """
-    Post a formatted table to Discord.
+    Format rows as aligned plain-text table lines (header, rule, rows).
+    With max_line, the widest columns are narrowed until a line fits in
+    max_line characters; longer cells are cut with an ellipsis.
     """
     if not column_headers:
         column_headers = columns
     
-    # Build the table as a code block for monospace formatting
-    lines = []
-    lines.append(f"**{title}**")
-    lines.append("```")
-    
     # Calculate column widths
     widths = []
     for i, col in enumerate(columns):
@@ -37,43 +185,109 @@ def post_table_to_discord(
         data_width = max((len(str(row.get(col, ""))) for row in data), default=0)
         widths.append(max(header_width, data_width))
     
+    if max_line is not None:
+        separators = 3 * (len(widths) - 1)
+        while sum(widths) + separators > max_line and max(widths, default=0) > 1:
+            widths[widths.index(max(widths))] -= 1
+    
+    def cell(value, width: int) -> str:
+        text = str(value)
+        if len(text) > width:
+            text = text[:width - 1] + "…"
+        return text.ljust(width)
+    
     # Header row
-    header = " | ".join(h.ljust(widths[i]) for i, h in enumerate(column_headers))
-    lines.append(header)
-    lines.append("-" * len(header))
+    header = " | ".join(cell(h, widths[i]) for i, h in enumerate(column_headers))
+    lines = [header, "-" * len(header)]
     
     # Data rows
     for row in data:
-        line = " | ".join(str(row.get(col, "")).ljust(widths[i]) for i, col in enumerate(columns))
+        line = " | ".join(cell(row.get(col, ""), widths[i]) for i, col in enumerate(columns))
         lines.append(line)
     
+    return lines
+
+
+def format_table(
+    title: str,
+    data: List[Dict],
+    columns: List[str],
+    column_headers: Optional[List[str]] = None
+) -> str:
+    """
+    Format rows as a Discord message with a monospace table.
+    """
+    # Build the table as a code block for monospace formatting
+    lines = [f"**{title}**", "```"]
+    lines.extend(format_rows(data, columns, column_headers))
     lines.append("```")
     
-    content = "\n".join(lines)
+    return "\n".join(lines)
+
+
+def pack_table(
+    title: str,
+    data: List[Dict],
+    columns: List[str],
+    column_headers: Optional[List[str]] = None,
+    limit: int = MESSAGE_LIMIT
+) -> List[str]:
+    """
+    Format a table as as few Discord messages as possible.
+    Each message is filled with rows up to the character limit and repeats
+    the header; column widths are computed once so parts line up, and
+    narrowed if needed so the header and a row always fit in one message.
+    """
+    # Reserve room for the longest part title we could need
+    max_title = limit // 4
+    if len(title) > max_title:
+        title = title[:max_title - 1] + "…"
+    reserved = len(f"**{title} (Part 999/999)**\n```\n") + len("\n```")
+    budget = limit - reserved
+    
+    # Header, rule and one row, each max_line long, joined by newlines
+    lines = format_rows(data, columns, column_headers, max_line=(budget - 2) // 3)
+    header, rows = lines[:2], lines[2:]
     
-    # Discord has a 2000 character limit
-    if len(content) > 2000:
-        return post_table_chunked(webhook_url, title, data, columns, column_headers)
+    header_size = len("\n".join(header))
+    parts: List[List[str]] = []
+    current, size = list(header), header_size
+    for row in rows:
+        if len(current) > len(header) and size + 1 + len(row) > budget:
+            parts.append(current)
+            current, size = list(header), header_size
+        current.append(row)
+        size += 1 + len(row)
+    parts.append(current)
     
-    return post_to_discord(webhook_url, content)
+    if len(parts) == 1:
+        messages = [format_message(title, parts[0])]
+    else:
+        messages = [
+            format_message(f"{title} (Part {i + 1}/{len(parts)})", part)
+            for i, part in enumerate(parts)
+        ]
+    assert all(len(message) <= limit for message in messages), "packed message over the limit"
+    return messages
 
 
-def post_table_chunked(
-    webhook_url: str,
-    title: str, 
-    data: List[Dict],
+def format_message(title: str, lines: List[str]) -> str:
+    return "\n".join([f"**{title}**", "```", *lines, "```"])
+
+
+def post_table_to_discord(
+    webhook_url: str, 
+    title: str,
+    data: List[Dict], 
     columns: List[str],
-    column_headers: List[str]
+    column_headers: Optional[List[str]] = None
 ) -> bool:
-    """Post a large table in multiple messages."""
-    chunk_size = 15  # Buildings per message
-    success = True
-    
-    for i in range(0, len(data), chunk_size):
-        chunk = data[i:i + chunk_size]
-        chunk_title = f"{title} (Part {i//chunk_size + 1})"
-        
-        if not post_table_to_discord(webhook_url, chunk_title, chunk, columns, column_headers):
-            success = False
+    """
+    Post a formatted table to Discord, split over as few messages as the
+    2000 character limit allows.
+    """
+    if not column_headers:
+        column_headers = columns
     
-    return success
\ No newline at end of file
+    messages = pack_table(title, data, columns, column_headers)
+    return DiscordWebhook(webhook_url).send_all(messages)
\ No newline at end of file
@@ -0,0 +1,177 @@
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+from PIL import Image
+
+from game_automator.core.capture import (
+    capture_window,
+    capture_region,
+    frame_signature,
+    frames_differ,
+    wait_for_change,
+    wait_for_stable,
+)
+from game_automator.core.input import InputPolicy, DEFAULT_POLICY, perform_click, perform_key
+
+
+class InputHandle:
+    """
+    Handle for a queued input action.
+    Returned immediately by InputExecutor; callers can wait for the action
+    itself or for an observable post-condition instead of a fixed delay.
+    """
+
+    def __init__(self, description: str, window: Optional[dict] = None):
+        self.description = description
+        self.window = window
+        self.reference: Optional[Image.Image] = None  # Frame signature just before the action
+        self.error: Optional[BaseException] = None
+        self.finished_at: Optional[float] = None
+        self._done = threading.Event()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the action to be performed.
+        Returns False on timeout; re-raises any error from the action.
+        """
+        if not self._done.wait(timeout):
+            return False
+        if self.error is not None:
+            raise self.error
+        return True
+
+    def wait_for(
+        self,
+        condition: Callable[[], bool],
+        timeout: float = 5.0,
+        poll_interval: float = 0.05
+    ) -> bool:
+        """
+        Wait until condition() is true after the action has been performed.
+        Returns False on timeout.
+        """
+        deadline = time.time() + timeout
+        if not self.wait(timeout):
+            return False
+        while not condition():
+            if time.time() >= deadline:
+                return False
+            time.sleep(poll_interval)
+        return True
+
+    def wait_for_change(self, timeout: float = 2.0, settle: float = 0.15) -> Optional[Image.Image]:
+        """
+        Wait until the window differs from how it looked before the action,
+        then (if settle > 0) until it stops changing.
+        Returns the resulting frame, or None on timeout.
+        """
+        if self.window is None:
+            raise ValueError("wait_for_change requires an action submitted with a window")
+
+        deadline = time.time() + timeout
+        if not self.wait(timeout):
+            return None
+
+        changed = wait_for_change(self.window, self.reference, max(0.0, deadline - time.time()))
+        if changed is None:
+            return None
+        if settle <= 0:
+            return changed[0]
+        return wait_for_stable(self.window, max(0.0, deadline - time.time()), settle)
+
+    def _finish(self, error: Optional[BaseException] = None) -> None:
+        self.error = error
+        self.finished_at = time.time()
+        self._done.set()
+
+
+class InputExecutor:
+    """
+    Performs mouse/keyboard actions on a background thread, in order.
+    Actions are queued and return an InputHandle immediately, so the caller
+    can do other work (e.g. OCR of the previous frame) while they run.
+    """
+
+    def __init__(self, policy: InputPolicy = DEFAULT_POLICY, humanize: bool = True):
+        self.policy = policy
+        self.humanize = humanize
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        action: Callable[[], None],
+        description: str,
+        window: Optional[dict] = None
+    ) -> InputHandle:
+        """
+        Queue an action. If window is given, its frame signature is recorded
+        right before the action runs so post-conditions can detect a change.
+        """
+        handle = InputHandle(description, window)
+        self._ensure_thread()
+        self._queue.put((action, handle))
+        return handle
+
+    def click(self, window: dict, x: int, y: int) -> InputHandle:
+        """Queue a click at window-relative coordinates."""
+        abs_x = window["x"] + x
+        abs_y = window["y"] + y
+        return self.submit(
+            lambda: perform_click(abs_x, abs_y, self.policy, self.humanize, window),
+            f"click({x}, {y})",
+            window,
+        )
+
+    def press(self, key: str, window: Optional[dict] = None) -> InputHandle:
+        """Queue a key press. If window is given, it is focused first."""
+        return self.submit(lambda: perform_key(key, window), f"press({key})", window)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued action has run. Returns False on timeout."""
+        handle = self.submit(lambda: None, "drain")
+        return handle.wait(timeout)
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="input-executor", daemon=True)
+                self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            action, handle = self._queue.get()
+            try:
+                if handle.window is not None:
+                    handle.reference = frame_signature(capture_window(handle.window))
+                action()
+                if self.humanize and handle.window is not None:
+                    time.sleep(self.policy.jitter_delay())
+                handle._finish()
+            except BaseException as e:
+                handle._finish(e)
+
+
+def region_matches(window: dict, region: tuple, reference: Image.Image) -> Callable[[], bool]:
+    """
+    Post-condition: the region (x, y, width, height) looks like the reference image.
+    """
+    expected = frame_signature(reference)
+    return lambda: not frames_differ(expected, frame_signature(capture_region(window, region)))
+
+
+_executor: Optional[InputExecutor] = None
+
+
+def get_executor() -> InputExecutor:
+    """Get or create the shared input executor."""
+    global _executor
+    if _executor is None:
+        _executor = InputExecutor()
+    return _executor
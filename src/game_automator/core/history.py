@@ -0,0 +1,242 @@
+import os
+import csv
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from game_automator.core.trace import traced
+
+DEFAULT_HISTORY_PATH = os.path.join("output", "history.sqlite3")
+
+# CSV files written by CSVStorage: <workflow>-<YYYY-mm-dd-HHMMSS>.csv
+CSV_NAME_PATTERN = re.compile(r"^(?P<workflow>.+)-(?P<stamp>\d{4}-\d{2}-\d{2}-\d{6})\.csv$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    workflow TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    source TEXT UNIQUE
+);
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    workflow TEXT NOT NULL,
+    entity TEXT,
+    timestamp REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_workflow ON runs (workflow, started_at);
+CREATE INDEX IF NOT EXISTS idx_records_entity ON records (workflow, entity, timestamp);
+CREATE INDEX IF NOT EXISTS idx_records_time ON records (workflow, timestamp);
+CREATE INDEX IF NOT EXISTS idx_records_run ON records (run_id);
+"""
+
+
+class HistoryStore:
+    """
+    Persistent, indexed store of workflow results across runs (SQLite).
+    Each row belongs to a run and is keyed by workflow, entity (e.g. the
+    building name) and timestamp; the row's fields are kept as JSON.
+    Writes are buffered and committed in one transaction per flush.
+    A store can be shared by threads (a run's worker threads, windows run
+    by the orchestrator); its connection is used by one at a time.
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH, flush_rows: int = 50):
+        self.path = path
+        self.flush_rows = flush_rows
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._pending: List[tuple] = []
+
+    def start_run(self, workflow: str, started_at: Optional[float] = None, source: Optional[str] = None) -> int:
+        """Register a new run and return its id."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (workflow, started_at, source) VALUES (?, ?, ?)",
+                (workflow, started_at if started_at is not None else time.time(), source),
+            )
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def add(self, run_id: int, workflow: str, entity: Optional[str], timestamp: float, data: Dict) -> None:
+        """Queue a record for the run."""
+        record = (run_id, workflow, entity, timestamp, json.dumps(data, default=str))
+        with self._lock:
+            self._pending.append(record)
+            if len(self._pending) >= self.flush_rows:
+                self.flush()
+
+    @traced("storage.history_flush")
+    def flush(self) -> None:
+        """Commit queued records."""
+        with self._lock:
+            if not self._pending:
+                return
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO records (run_id, workflow, entity, timestamp, data) VALUES (?, ?, ?, ?, ?)",
+                    self._pending,
+                )
+            self._pending = []
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def _query(self, query: str, params) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # Queries
+
+    def records(
+        self,
+        workflow: str,
+        entity: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Records for a workflow, oldest first, optionally filtered by entity
+        and time range (epoch seconds). Each dict has run_id, entity,
+        timestamp and the stored fields.
+        """
+        query = "SELECT run_id, entity, timestamp, data FROM records WHERE workflow = ?"
+        params: list = [workflow]
+        if entity is not None:
+            query += " AND entity = ?"
+            params.append(entity)
+        if since is not None:
+            query += " AND timestamp >= ?"
+            params.append(since)
+        if until is not None:
+            query += " AND timestamp < ?"
+            params.append(until)
+        query += " ORDER BY timestamp, id"
+
+        return [
+            {**json.loads(data), "run_id": run_id, "entity": row_entity, "timestamp": timestamp}
+            for run_id, row_entity, timestamp, data in self._query(query, params)
+        ]
+
+    def columns(
+        self,
+        workflow: str,
+        fields: List[str],
+        since: Optional[float] = None
+    ) -> List[tuple]:
+        """
+        (run_id, entity, timestamp, *fields) tuples ordered by entity then
+        time, with fields extracted by SQLite rather than in Python.
+        """
+        extracts = ", ".join("json_extract(data, ?)" for _ in fields)
+        query = f"SELECT run_id, entity, timestamp, {extracts} FROM records WHERE workflow = ?"
+        params: list = [f"$.{field}" for field in fields] + [workflow]
+        if since is not None:
+            query += " AND timestamp >= ?"
+            params.append(since)
+        query += " ORDER BY entity, timestamp"
+        return self._query(query, params)
+
+    def latest(self, workflow: str, entity: str) -> Optional[Dict]:
+        """Most recent record for an entity, or None."""
+        rows = self._query(
+            "SELECT run_id, timestamp, data FROM records "
+            "WHERE workflow = ? AND entity = ? ORDER BY timestamp DESC, id DESC LIMIT 1",
+            (workflow, entity),
+        )
+        if not rows:
+            return None
+        run_id, timestamp, data = rows[0]
+        return {**json.loads(data), "run_id": run_id, "entity": entity, "timestamp": timestamp}
+
+    def entities(self, workflow: str) -> List[str]:
+        """All entities recorded for a workflow."""
+        rows = self._query(
+            "SELECT DISTINCT entity FROM records WHERE workflow = ? AND entity IS NOT NULL ORDER BY entity",
+            (workflow,),
+        )
+        return [entity for (entity,) in rows]
+
+    def has_source(self, source: str) -> bool:
+        return bool(self._query("SELECT 1 FROM runs WHERE source = ?", (source,)))
+
+
+def parse_timestamp(value: str) -> Optional[float]:
+    """Parse an ISO timestamp (as written by CSVStorage) to epoch seconds."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def import_csv(store: HistoryStore, path: str, entity_column: Optional[str] = None) -> int:
+    """
+    Import one CSVStorage output file as a run.
+    Files already imported are skipped. Returns the number of rows imported.
+    """
+    match = CSV_NAME_PATTERN.match(os.path.basename(path))
+    if match is None:
+        return 0
+
+    source = os.path.abspath(path)
+    if store.has_source(source):
+        return 0
+
+    workflow = match.group("workflow")
+    started_at = datetime.strptime(match.group("stamp"), "%Y-%m-%d-%H%M%S").timestamp()
+
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    run_id = store.start_run(workflow, started_at, source)
+    for row in rows:
+        timestamp = parse_timestamp(row.pop("timestamp", "")) or started_at
+        entity = row.get(entity_column) if entity_column else None
+        store.add(run_id, workflow, entity, timestamp, row)
+    store.flush()
+    return len(rows)
+
+
+def import_csv_dir(
+    store: HistoryStore,
+    directory: str = "output",
+    entity_columns: Optional[Dict[str, str]] = None
+) -> Dict[str, int]:
+    """
+    Import every CSVStorage file in a directory.
+    entity_columns maps workflow name to the column identifying an entity.
+    Files of per-window runs ("<workflow>@<window>-...") are imported under
+    that record name, as the runs themselves record them, using the
+    workflow's entity column. Returns rows imported per file.
+    """
+    entity_columns = entity_columns or {}
+    imported = {}
+    for filename in sorted(os.listdir(directory)):
+        match = CSV_NAME_PATTERN.match(filename)
+        if match is None:
+            continue
+        path = os.path.join(directory, filename)
+        workflow = match.group("workflow").partition("@")[0]
+        imported[filename] = import_csv(store, path, entity_columns.get(workflow))
+    return imported
@@ -1,24 +1,95 @@
 import time
 import random
-import pyautogui
+import threading
+from dataclasses import dataclass
+from typing import Optional
 
+from game_automator.core.backends import get_backend
+from game_automator.core.trace import span, traced
 
-# Safety settings
-pyautogui.FAILSAFE = True  # Move mouse to corner to abort
-pyautogui.PAUSE = 0.1  # Small pause between actions
 
+@dataclass
+class InputPolicy:
+    """Timing and humanization settings for mouse and keyboard actions."""
+    move_settle: float = 0.05  # Pause between moving the mouse and pressing
+    press_duration: float = 0.05  # Time the button is held down
+    jitter_px: int = 3  # Max random offset applied to humanized clicks
+    delay_jitter: float = 0.1  # Max random extra delay after humanized actions
+    
+    def jitter_offset(self) -> tuple:
+        return (
+            random.randint(-self.jitter_px, self.jitter_px),
+            random.randint(-self.jitter_px, self.jitter_px),
+        )
+    
+    def jitter_delay(self) -> float:
+        return random.uniform(0, self.delay_jitter)
 
-def click(x: int, y: int, delay_after: float = 0.3) -> None:
+
+DEFAULT_POLICY = InputPolicy()
+
+# Held while driving the physical mouse/keyboard, so workflows running for
+# different windows never interleave their moves, clicks and key presses.
+INPUT_LOCK = threading.RLock()
+
+
+@traced("input.perform_click")
+def perform_click(
+    x: int,
+    y: int,
+    policy: InputPolicy = DEFAULT_POLICY,
+    humanize: bool = False,
+    window: Optional[dict] = None
+) -> None:
+    """
+    Move to absolute screen coordinates and click, without any trailing delay.
+    Uses explicit mouseDown/mouseUp for better Wine compatibility.
+    If window is given, it is brought to the front first.
+    """
+    if humanize:
+        offset_x, offset_y = policy.jitter_offset()
+        x, y = x + offset_x, y + offset_y
+    backend = get_backend()
+    with INPUT_LOCK:
+        if window is not None:
+            backend.focus(window)
+        backend.move_to(x, y, pause=False)
+        time.sleep(policy.move_settle)
+        backend.mouse_down(pause=False)
+        time.sleep(policy.press_duration)
+        backend.mouse_up(pause=False)
+
+
+@traced("input.perform_key")
+def perform_key(key: str, window: Optional[dict] = None) -> None:
+    """
+    Press a keyboard key without any trailing delay.
+    If window is given, it is brought to the front first so it gets the key.
+    """
+    backend = get_backend()
+    with INPUT_LOCK:
+        if window is not None:
+            backend.focus(window)
+        backend.press(key, pause=False)
+
+
+@traced("input.click")
+def click(x: int, y: int, delay_after: float = 0.3, window: Optional[dict] = None) -> None:
     """
     Click at absolute screen coordinates.
     Uses explicit mouseDown/mouseUp for better Wine compatibility.
     """
-    pyautogui.moveTo(x, y)
-    time.sleep(0.05)
-    pyautogui.mouseDown()
-    time.sleep(0.05)
-    pyautogui.mouseUp()
-    time.sleep(delay_after)
+    backend = get_backend()
+    with INPUT_LOCK:
+        if window is not None:
+            backend.focus(window)
+        backend.move_to(x, y)
+        time.sleep(DEFAULT_POLICY.move_settle)
+        backend.mouse_down()
+        time.sleep(DEFAULT_POLICY.press_duration)
+        backend.mouse_up()
+    with span("input.delay_after", "sleep"):
+        time.sleep(delay_after)
 
 
 def click_in_window(window: dict, x: int, y: int, delay_after: float = 0.3) -> None:
@@ -27,7 +98,7 @@ def click_in_window(window: dict, x: int, y: int, delay_after: float = 0.3) -> N
     """
     abs_x = window["x"] + x
     abs_y = window["y"] + y
-    click(abs_x, abs_y, delay_after)
+    click(abs_x, abs_y, delay_after, window)
 
 
 def click_region_center(window: dict, region: tuple, delay_after: float = 0.3) -> None:
@@ -40,18 +111,23 @@ def click_region_center(window: dict, region: tuple, delay_after: float = 0.3) -
     click_in_window(window, center_x, center_y, delay_after)
 
 
-def humanized_click(x: int, y: int, delay_after: float = 0.3) -> None:
+@traced("input.humanized_click")
+def humanized_click(x: int, y: int, delay_after: float = 0.3, window: Optional[dict] = None) -> None:
     """
     Click with slight randomization to appear more human.
     """
-    offset_x = random.randint(-3, 3)
-    offset_y = random.randint(-3, 3)
-    pyautogui.moveTo(x + offset_x, y + offset_y)
-    time.sleep(0.05)
-    pyautogui.mouseDown()
-    time.sleep(0.05)
-    pyautogui.mouseUp()
-    time.sleep(delay_after + random.uniform(0, 0.1))
+    offset_x, offset_y = DEFAULT_POLICY.jitter_offset()
+    backend = get_backend()
+    with INPUT_LOCK:
+        if window is not None:
+            backend.focus(window)
+        backend.move_to(x + offset_x, y + offset_y)
+        time.sleep(DEFAULT_POLICY.move_settle)
+        backend.mouse_down()
+        time.sleep(DEFAULT_POLICY.press_duration)
+        backend.mouse_up()
+    with span("input.delay_after", "sleep"):
+        time.sleep(delay_after + DEFAULT_POLICY.jitter_delay())
 
 
 def humanized_click_in_window(window: dict, x: int, y: int, delay_after: float = 0.3) -> None:
@@ -60,12 +136,18 @@ def humanized_click_in_window(window: dict, x: int, y: int, delay_after: float =
     """
     abs_x = window["x"] + x
     abs_y = window["y"] + y
-    humanized_click(abs_x, abs_y, delay_after)
+    humanized_click(abs_x, abs_y, delay_after, window)
 
 
-def press_key(key: str, delay_after: float = 0.3) -> None:
+@traced("input.press_key")
+def press_key(key: str, delay_after: float = 0.3, window: Optional[dict] = None) -> None:
     """
-    Press a keyboard key.
+    Press a keyboard key, bringing window (if given) to the front first.
     """
-    pyautogui.press(key)
-    time.sleep(delay_after)
\ No newline at end of file
+    backend = get_backend()
+    with INPUT_LOCK:
+        if window is not None:
+            backend.focus(window)
+        backend.press(key)
+    with span("input.delay_after", "sleep"):
+        time.sleep(delay_after)
\ No newline at end of file
@@ -0,0 +1,314 @@
+import json
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+PREFIX = "game_automator_"
+DEFAULT_PORT = 9477
+
+# Upper bounds (seconds) of latency histogram buckets: capture and OCR sit
+# at the low end, vision requests and whole runs at the high end
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+def metrics_port() -> int:
+    """Port of the metrics endpoint, overridable with GAME_AUTOMATOR_METRICS_PORT (0 disables it)."""
+    return int(os.environ.get("GAME_AUTOMATOR_METRICS_PORT", DEFAULT_PORT))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = PREFIX + name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def _label_text(self, key: Tuple[str, ...], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = list(zip(self.labels, key)) + list(extra)
+        if not pairs:
+            return ""
+        escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+        return "{" + ",".join(f'{label}="{value}"' for (label, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. requests made."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        if not self.labels:
+            self._values[()] = 0  # Exposed from the start, so rates begin at zero
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[Tuple[str, float]]:
+        with self._lock:
+            return [(self.name + self._label_text(key), value) for key, value in sorted(self._values.items())]
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            return [{"labels": dict(zip(self.labels, key)), "value": value} for key, value in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    """Value that goes up and down, e.g. workflows running."""
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (e.g. latencies) in cumulative buckets."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], List] = {}  # key -> [bucket counts..., count, sum]
+        if not self.labels:
+            self._values[()] = self._empty()
+
+    def _empty(self) -> List:
+        return [0] * (len(self.buckets) + 1) + [0.0]
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = self._empty()
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += 1
+            state[-1] += value
+
+    def time(self, **labels) -> "_Timer":
+        """Context manager observing the duration of its block."""
+        return _Timer(self, labels)
+
+    def samples(self) -> List[Tuple[str, float]]:
+        lines = []
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (math.inf,), state[:-2] + [state[-2] - sum(state[:-2])]):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else repr(float(bound))
+                    lines.append((self.name + "_bucket" + self._label_text(key, (("le", le),)), cumulative))
+                lines.append((self.name + "_count" + self._label_text(key), state[-2]))
+                lines.append((self.name + "_sum" + self._label_text(key), state[-1]))
+        return lines
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            return [
+                {
+                    "labels": dict(zip(self.labels, key)),
+                    "count": state[-2],
+                    "sum": round(state[-1], 6),
+                    # Observations per bucket (not cumulative), by upper bound
+                    "buckets": {str(bound): count for bound, count in zip(self.buckets, state[:-2]) if count},
+                }
+                for key, state in sorted(self._values.items())
+            ]
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: Dict):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class Registry:
+    """
+    The process's metrics, by name. Modules declare theirs once at import
+    (counter/gauge/histogram return the existing metric if already
+    declared) and update them from any thread.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(PREFIX + name)
+            if metric is None:
+                metric = self._metrics[PREFIX + name] = cls(name, *args, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"{metric.name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, help, labels)
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets)
+
+    def prometheus_text(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample, value in metric.samples():
+                lines.append(f"{sample} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict:
+        """All metrics as a JSON-serializable dict (metrics with no samples are left out)."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        result = {}
+        for metric in metrics:
+            values = metric.snapshot()
+            if values:
+                result[metric.name] = {"type": metric.kind, "help": metric.help, "values": values}
+        return {
+            "started_at": self.started,
+            "written_at": time.time(),
+            "metrics": result,
+        }
+
+    def write_json(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+    """Declare (or get) a counter in the process registry."""
+    return REGISTRY.counter(name, help, labels)
+
+
+def gauge(name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+    """Declare (or get) a gauge in the process registry."""
+    return REGISTRY.gauge(name, help, labels)
+
+
+def histogram(name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    """Declare (or get) a histogram in the process registry."""
+    return REGISTRY.histogram(name, help, labels, buckets)
+
+
+class MetricsServer:
+    """
+    Serves the registry over HTTP on localhost: /metrics in the Prometheus
+    text format, /metrics.json as a JSON snapshot.
+    """
+
+    def __init__(self, port: int = DEFAULT_PORT, host: str = "127.0.0.1", registry: Registry = REGISTRY):
+        self.registry = registry
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if path in ("/", "/metrics"):
+                    self._send(registry.prometheus_text().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8")
+                elif path == "/metrics.json":
+                    self._send(json.dumps(registry.snapshot()).encode("utf-8"), "application/json")
+                else:
+                    self.send_error(404)
+
+            def _send(self, payload: bytes, content_type: str) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def serve(port: Optional[int] = None) -> Optional[MetricsServer]:
+    """
+    Start the metrics endpoint for a long-running process.
+    Returns None if it is disabled (port 0) or the port is taken.
+    """
+    port = metrics_port() if port is None else port
+    if not port:
+        return None
+    try:
+        server = MetricsServer(port).start()
+    except OSError as e:
+        print(f"[METRICS] Could not serve metrics on port {port}: {e}")
+        return None
+    print(f"[METRICS] Serving metrics at {server.url}")
+    return server
\ No newline at end of file
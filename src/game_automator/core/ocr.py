@@ -1,42 +1,82 @@
+import threading
+import time
 from typing import List, Tuple, Optional
 import easyocr
 from PIL import Image
 import numpy as np
 
-# Global reader instance (expensive to initialize)
+from game_automator.core import metrics
+from game_automator.core.recorder import record
+from game_automator.core.trace import span, traced
+
+# Global reader instance (expensive to initialize), shared by all workflows
 _reader: Optional[easyocr.Reader] = None
+_reader_lock = threading.Lock()
+
+# OCR calls allowed to run on the shared reader at once. Each call already
+# uses several cores, so more workers mostly help when waits interleave.
+_ocr_workers = threading.BoundedSemaphore(1)
+
+OCR_CALLS = metrics.counter("ocr_calls_total", "OCR passes run on the reader.")
+OCR_SECONDS = metrics.histogram("ocr_seconds", "Time per OCR pass, including waiting for a worker.")
+OCR_PIXELS = metrics.counter("ocr_pixels_total", "Pixels read by OCR.")
 
 
 def get_reader() -> easyocr.Reader:
     """Get or create the EasyOCR reader instance."""
     global _reader
-    if _reader is None:
-        _reader = easyocr.Reader(["en"], gpu=False)
+    with _reader_lock:
+        if _reader is None:
+            with span("ocr.load_model"):
+                _reader = easyocr.Reader(["en"], gpu=False)
     return _reader
 
 
+def set_ocr_workers(count: int) -> None:
+    """Set how many OCR calls may run concurrently (e.g. across windows)."""
+    global _ocr_workers
+    _ocr_workers = threading.BoundedSemaphore(max(1, count))
+
+
+def _readtext(image: Image.Image) -> list:
+    reader = get_reader()
+    img_array = np.array(image)
+    start = time.perf_counter()
+    with _ocr_workers:
+        results = reader.readtext(img_array)
+    seconds = time.perf_counter() - start
+    OCR_CALLS.inc()
+    OCR_SECONDS.observe(seconds)
+    OCR_PIXELS.inc(image.width * image.height)
+    record(
+        "ocr",
+        size=image.size,
+        seconds=round(seconds, 3),
+        text=" | ".join(text for _, text, _ in results),
+    )
+    return results
+
+
+@traced("ocr.extract_text")
 def extract_text(image: Image.Image) -> str:
     """
     Extract all text from an image.
     Returns concatenated text.
     """
-    reader = get_reader()
-    img_array = np.array(image)
-    results = reader.readtext(img_array)
+    results = _readtext(image)
     
     # Results are list of (bbox, text, confidence)
     return " ".join([text for _, text, _ in results])
 
 
+@traced("ocr.extract_text_with_positions")
 def extract_text_with_positions(image: Image.Image) -> List[dict]:
     """
     Extract text with bounding box positions.
     Returns list of {text, confidence, bbox} dicts.
     bbox is (x, y, width, height) relative to image.
     """
-    reader = get_reader()
-    img_array = np.array(image)
-    results = reader.readtext(img_array)
+    results = _readtext(image)
     
     extracted = []
     for bbox, text, confidence in results:
@@ -0,0 +1,282 @@
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from game_automator.core.discord import DiscordWebhook
+
+DEFAULT_OUTBOX_DIR = os.path.join("output", "outbox")
+
+# Retry delays grow from RETRY_BASE seconds up to RETRY_MAX
+RETRY_BASE = 5.0
+RETRY_MAX = 600.0
+
+# A claim on a report not touched for this long is taken to be left by a
+# sender that died, and the report is queued again
+CLAIM_TIMEOUT = 900.0
+
+# File suffixes of a queued report, one claimed by a sender, and one
+# Discord rejected outright (kept for inspection, never retried)
+QUEUED = ".json"
+CLAIMED = ".sending"
+REJECTED = ".rejected"
+
+
+class Outbox:
+    """
+    Durable on-disk queue of Discord reports.
+    Each report is a JSON file holding its messages and delivery state.
+    Reports share a key (e.g. the workflow name); enqueuing a report drops
+    any unsent report with the same key, so after an outage only the
+    latest report per key is delivered.
+
+    Several senders may share an outbox (the daemon, a CLI run, 'outbox
+    flush'). A sender claims a report by renaming <id>.json to
+    <id>.sending, which only one can do, and renames it back if delivery
+    fails.
+    """
+
+    def __init__(self, directory: str = DEFAULT_OUTBOX_DIR):
+        self.directory = directory
+        self._lock = threading.RLock()
+
+    def enqueue(self, key: str, webhook_url: str, messages: List[str]) -> Dict:
+        """Queue a report, replacing unsent reports with the same key."""
+        with self._lock:
+            for item in self.pending(include_claimed=True):
+                if item["key"] == key:
+                    self._remove(item)
+                    print(f"[OUTBOX] Dropped superseded '{key}' report from {_ago(item['created_at'])}")
+            now = time.time()
+            item = {
+                "id": f"{time.time_ns()}-{uuid.uuid4().hex[:8]}",
+                "key": key,
+                "webhook_url": webhook_url,
+                "messages": messages,
+                "sent": 0,  # Messages already delivered, for resuming a partial send
+                "attempts": 0,
+                "created_at": now,
+                "next_attempt_at": now,
+                "last_error": None,
+            }
+            self._save(item)
+            return item
+
+    def pending(self, include_claimed: bool = False) -> List[Dict]:
+        """Queued reports, oldest first; with include_claimed, also those being sent."""
+        if not os.path.isdir(self.directory):
+            return []
+        suffixes = (".json", ".sending") if include_claimed else (".json",)
+        items = []
+        for filename in sorted(os.listdir(self.directory)):
+            if not filename.endswith(suffixes):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as f:
+                    items.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # Removed or being replaced concurrently
+        return items
+
+    def due(self, now: Optional[float] = None) -> List[Dict]:
+        now = time.time() if now is None else now
+        return [item for item in self.pending() if item["next_attempt_at"] <= now]
+
+    def deliver(self, item: Dict) -> bool:
+        """
+        Send a report's remaining messages. On failure the report stays
+        queued with a backed-off retry time. Returns True if delivered,
+        False also if another sender has claimed the report.
+        """
+        item = self._claim(item)
+        if item is None:
+            return False
+
+        # Only retry briefly here; the outbox retries later with longer backoff
+        webhook = DiscordWebhook(item["webhook_url"], max_retries=1)
+        while item["sent"] < len(item["messages"]):
+            if not webhook.send(item["messages"][item["sent"]]):
+                with self._lock:
+                    if not self._exists(item, CLAIMED):
+                        return False  # Superseded while sending
+                    if not webhook.retryable:
+                        item["last_error"] = webhook.last_error
+                        self._save(item, CLAIMED)
+                        os.replace(self._path(item, CLAIMED), self._path(item, REJECTED))
+                        print(f"[OUTBOX] Discord rejected the '{item['key']}' report ({webhook.last_error}); "
+                              f"not retrying, kept as {self._path(item, REJECTED)}")
+                        return False
+                    item["attempts"] += 1
+                    delay = min(RETRY_MAX, RETRY_BASE * 2 ** (item["attempts"] - 1))
+                    item["next_attempt_at"] = time.time() + delay
+                    item["last_error"] = webhook.last_error or "Discord did not accept the message"
+                    self._release(item)
+                print(f"[OUTBOX] '{item['key']}' report not delivered, retrying in {delay:.0f}s")
+                return False
+            item["sent"] += 1
+            with self._lock:
+                if not self._exists(item, CLAIMED):
+                    return False
+                self._save(item, CLAIMED)
+
+        with self._lock:
+            self._remove(item)
+        print(f"[OUTBOX] Delivered '{item['key']}' report ({len(item['messages'])} messages)")
+        return True
+
+    def flush(self, force: bool = False) -> int:
+        """
+        Try to deliver due (or, with force, all) reports. Returns how many
+        are left, including any another sender is delivering.
+        """
+        self._release_stale_claims()
+        for item in self.pending() if force else self.due():
+            self.deliver(item)
+        return len(self.pending(include_claimed=True))
+
+    def _path(self, item: Dict, state: str = QUEUED) -> str:
+        return os.path.join(self.directory, f"{item['id']}{state}")
+
+    def _exists(self, item: Dict, state: str = QUEUED) -> bool:
+        return os.path.exists(self._path(item, state))
+
+    def _claim(self, item: Dict) -> Optional[Dict]:
+        """Claim a queued report for delivery. Returns its current state, or None if taken."""
+        path = self._path(item, CLAIMED)
+        try:
+            os.rename(self._path(item), path)
+            with open(path) as f:
+                return json.load(f)  # May have progressed since item was read
+        except (OSError, ValueError):
+            return None
+
+    def _release(self, item: Dict) -> None:
+        """Save a claimed report and queue it again."""
+        self._save(item, CLAIMED)
+        os.replace(self._path(item, CLAIMED), self._path(item))
+
+    def _release_stale_claims(self) -> None:
+        if not os.path.isdir(self.directory):
+            return
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(CLAIMED):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                if time.time() - os.path.getmtime(path) > CLAIM_TIMEOUT:
+                    os.rename(path, path[:-len(CLAIMED)] + QUEUED)
+                    print(f"[OUTBOX] Requeued {filename[:-len(CLAIMED)]}, left claimed by a stopped sender")
+            except OSError:
+                continue  # Released or delivered meanwhile
+
+    def _save(self, item: Dict, state: str = QUEUED) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(item, state)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(item, f)
+        os.replace(tmp_path, path)
+
+    def _remove(self, item: Dict) -> None:
+        for state in (QUEUED, CLAIMED):
+            try:
+                os.remove(self._path(item, state))
+            except FileNotFoundError:
+                pass
+
+
+class OutboxSender:
+    """Background thread that delivers queued reports as they become due."""
+
+    def __init__(self, outbox: Outbox, poll_interval: float = 5.0):
+        self.outbox = outbox
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._passes = threading.Condition()
+        self._started = 0  # Delivery passes started / completed
+        self._completed = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "OutboxSender":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="outbox-sender", daemon=True)
+            self._thread.start()
+        return self
+
+    def notify(self) -> None:
+        """Wake the sender to look for new reports."""
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def drain(self, timeout: float) -> bool:
+        """
+        Wait up to timeout for every due report to be attempted.
+        Returns True if nothing is left in the outbox.
+        """
+        with self._passes:
+            target = self._started + 1  # A pass that starts after this call
+            self.notify()
+            self._passes.wait_for(lambda: self._completed >= target, timeout)
+        return not self.outbox.pending(include_claimed=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._passes:
+                self._wake.clear()
+                self._started += 1
+            try:
+                self.outbox.flush()
+            except Exception as e:
+                print(f"[OUTBOX] Sender error: {e}")
+            with self._passes:
+                self._completed += 1
+                self._passes.notify_all()
+            self._wake.wait(self.poll_interval)
+
+
+_outbox: Optional[Outbox] = None
+_sender: Optional[OutboxSender] = None
+
+
+def get_outbox() -> Outbox:
+    global _outbox
+    if _outbox is None:
+        _outbox = Outbox()
+    return _outbox
+
+
+def get_sender() -> OutboxSender:
+    """Get the shared sender for the default outbox, starting it if needed."""
+    global _sender
+    if _sender is None:
+        _sender = OutboxSender(get_outbox())
+    return _sender.start()
+
+
+def queue_report(key: str, webhook_url: str, messages: List[str]) -> None:
+    """Queue a report for background delivery and return immediately."""
+    get_outbox().enqueue(key, webhook_url, messages)
+    get_sender().notify()
+
+
+def wait_for_delivery(timeout: float = 30.0) -> int:
+    """
+    Before a short-lived process exits, give reports it queued a chance
+    to go out. Returns the number of reports still queued.
+    """
+    if _sender is None:
+        return 0
+    _sender.drain(timeout)
+    return len(get_outbox().pending(include_claimed=True))
+
+
+def _ago(timestamp: float) -> str:
+    minutes = (time.time() - timestamp) / 60
+    return f"{minutes:.0f} min ago" if minutes >= 1 else "just now"
\ No newline at end of file
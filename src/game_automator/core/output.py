@@ -0,0 +1,58 @@
+import contextvars
+import io
+import threading
+from typing import Callable, Optional
+
+
+class OutputRouter(io.TextIOBase):
+    """
+    Replacement for sys.stdout that sends each thread's output to the sink
+    attached for that thread, and everything else to the original stream.
+    The sink is held in a context variable, so work the thread hands to
+    asyncio.to_thread() or event loop tasks prints to the same sink.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._sink: contextvars.ContextVar = contextvars.ContextVar("output_sink", default=None)
+
+    def attach(self, sink: Optional[Callable[[str], None]]) -> None:
+        self._sink.set(sink)
+
+    def write(self, text: str) -> int:
+        sink = self._sink.get()
+        if sink is None:
+            return self.stream.write(text)
+        sink(text)
+        return len(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+class LinePrefixer:
+    """
+    Sink writing whole lines to a stream with a prefix (e.g. "[2] "), so
+    output from several threads doesn't interleave mid-line. A workflow's
+    worker threads share its sink, so the buffer is guarded by the lock too.
+    """
+
+    def __init__(self, stream, prefix: str, lock: threading.Lock):
+        self.stream = stream
+        self.prefix = prefix
+        self.lock = lock
+        self._buffer = ""
+
+    def __call__(self, text: str) -> None:
+        with self.lock:
+            self._buffer += text
+            *lines, self._buffer = self._buffer.split("\n")
+            if lines:
+                for line in lines:
+                    self.stream.write(f"{self.prefix}{line}\n")
+                self.stream.flush()
+
+    def flush(self) -> None:
+        """Write any partial line still buffered."""
+        if self._buffer:
+            self("\n")
\ No newline at end of file
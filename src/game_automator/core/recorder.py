@@ -0,0 +1,152 @@
+import contextvars
+import io
+import json
+import os
+import threading
+import time
+import zipfile
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+DEFAULT_RECORDING_DIR = "output"
+
+# Longest string kept per event field (OCR text can be long)
+MAX_FIELD_LENGTH = 300
+
+
+class FlightRecorder:
+    """
+    Fixed-size ring buffer of a run's recent frames (downscaled JPEGs) and
+    events (actions, OCR results, timings), written out as one zip archive
+    when something goes wrong. Memory stays bounded however long the run:
+    at most max_frames frames of about frame_width pixels and max_events
+    events are kept, and frames are recorded at most every frame_interval
+    seconds.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_frames: int = 30,
+        max_events: int = 500,
+        frame_width: int = 320,
+        frame_interval: float = 0.25,
+        quality: int = 60,
+        directory: str = DEFAULT_RECORDING_DIR,
+        max_dumps: int = 3
+    ):
+        self.name = name
+        self.frame_width = frame_width
+        self.frame_interval = frame_interval
+        self.quality = quality
+        self.directory = directory
+        self.max_dumps = max_dumps
+        self.started = time.time()
+        self.dumps: List[str] = []
+        self._frames: Deque[Tuple[float, str, bytes]] = deque(maxlen=max_frames)
+        self._events: Deque[Dict] = deque(maxlen=max_events)
+        self._last_frame_at = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, **data) -> None:
+        """Record an event (e.g. "click", "ocr", "navigate")."""
+        event = {"t": round(time.time() - self.started, 3), "kind": kind}
+        for key, value in data.items():
+            if isinstance(value, str) and len(value) > MAX_FIELD_LENGTH:
+                value = value[:MAX_FIELD_LENGTH] + "..."
+            event[key] = value
+        with self._lock:
+            self._events.append(event)
+
+    def record_frame(self, image: Image.Image, label: str = "") -> None:
+        """Keep a downscaled JPEG of the frame, unless one was kept very recently."""
+        now = time.time()
+        if now - self._last_frame_at < self.frame_interval:
+            return
+        self._last_frame_at = now
+
+        factor = max(1, -(-image.width // self.frame_width))  # Ceiling division
+        small = image.reduce(factor) if factor > 1 else image
+        buffer = io.BytesIO()
+        small.convert("RGB").save(buffer, format="JPEG", quality=self.quality)
+        with self._lock:
+            self._frames.append((now - self.started, label, buffer.getvalue()))
+
+    def dump(self, reason: str) -> Optional[str]:
+        """
+        Write the buffered frames and events to a zip archive.
+        Returns its path, or None once max_dumps archives have been written.
+        """
+        if len(self.dumps) >= self.max_dumps:
+            return None
+        with self._lock:
+            frames = list(self._frames)
+            events = list(self._events)
+
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now().strftime("%Y-%m-%d-%H%M%S")
+        path = os.path.join(self.directory, f"flight-{self.name}-{stamp}-{len(self.dumps) + 1}.zip")
+
+        frame_index = []
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as archive:  # JPEGs don't compress further
+            for i, (t, label, data) in enumerate(frames):
+                filename = f"frames/{i:03d}-{t:08.3f}s.jpg"
+                archive.writestr(filename, data)
+                frame_index.append({"t": round(t, 3), "label": label, "file": filename})
+            manifest = {
+                "workflow": self.name,
+                "reason": reason,
+                "started_at": datetime.fromtimestamp(self.started).isoformat(),
+                "dumped_at": datetime.now().isoformat(),
+                "frames": frame_index,
+                "events": events,
+            }
+            archive.writestr("recording.json", json.dumps(manifest, indent=2, default=str))
+
+        self.dumps.append(path)
+        return path
+
+
+# Recorder of the workflow running in the current thread
+_current: contextvars.ContextVar = contextvars.ContextVar("flight_recorder", default=None)
+
+
+def activate(recorder: Optional[FlightRecorder]) -> contextvars.Token:
+    """Make recorder the current thread's recorder. Pass the token to deactivate()."""
+    return _current.set(recorder)
+
+
+def deactivate(token: contextvars.Token) -> None:
+    _current.reset(token)
+
+
+def get_recorder() -> Optional[FlightRecorder]:
+    return _current.get()
+
+
+def record(kind: str, **data) -> None:
+    """Record an event on the current recorder, if any."""
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.record(kind, **data)
+
+
+def record_frame(image: Image.Image, label: str = "") -> None:
+    """Record a frame on the current recorder, if any."""
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.record_frame(image, label)
+
+
+def dump(reason: str) -> Optional[str]:
+    """Dump the current recorder, if any. Returns the archive path."""
+    recorder = _current.get()
+    if recorder is None:
+        return None
+    path = recorder.dump(reason)
+    if path:
+        print(f"[DEBUG] Flight recording saved: {path}")
+    return path
\ No newline at end of file
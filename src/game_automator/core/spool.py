@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from typing import List, Optional, Union
+
+from PIL import Image
+
+from game_automator.core.trace import traced
+
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+
+
+def encode_png(image: Image.Image) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class FrameSpool:
+    """
+    Ordered store of captured frames, kept PNG-encoded.
+    Frames stay in memory until memory_limit bytes are used; later frames
+    are spooled to a temporary directory. Frames are decoded on access.
+    """
+
+    def __init__(self, memory_limit: int = DEFAULT_MEMORY_LIMIT, directory: Optional[str] = None):
+        self.memory_limit = memory_limit
+        self.memory_used = 0
+        self._directory = directory
+        self._temp_dir: Optional[str] = None
+        self._frames: List[Union[bytes, str]] = []  # Encoded bytes, or path of a spooled frame
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __getitem__(self, index: int) -> Image.Image:
+        return self.image(index)
+
+    def __iter__(self):
+        for index in range(len(self._frames)):
+            yield self.image(index)
+
+    @traced("spool.append")
+    def append(self, image: Image.Image) -> int:
+        """Encode and store a frame. Returns its index."""
+        return self.append_encoded(encode_png(image))
+
+    def append_encoded(self, data: bytes) -> int:
+        """Store an already PNG-encoded frame. Returns its index."""
+        if self.memory_used + len(data) <= self.memory_limit:
+            self._frames.append(data)
+            self.memory_used += len(data)
+        else:
+            path = os.path.join(self._spool_dir(), f"{len(self._frames):04d}.png")
+            with open(path, "wb") as f:
+                f.write(data)
+            self._frames.append(path)
+        return len(self._frames) - 1
+
+    def data(self, index: int) -> bytes:
+        """PNG bytes of a frame."""
+        frame = self._frames[index]
+        if isinstance(frame, bytes):
+            return frame
+        with open(frame, "rb") as f:
+            return f.read()
+
+    def image(self, index: int) -> Image.Image:
+        """Decoded frame."""
+        with Image.open(BytesIO(self.data(index))) as image:
+            return image.convert("RGB")
+
+    @property
+    def spooled(self) -> int:
+        """Number of frames held on disk rather than in memory."""
+        return sum(1 for frame in self._frames if not isinstance(frame, bytes))
+
+    def close(self) -> None:
+        """Drop all frames and delete spooled files."""
+        self._frames = []
+        self.memory_used = 0
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+    def __enter__(self) -> "FrameSpool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _spool_dir(self) -> str:
+        if self._temp_dir is None:
+            self._temp_dir = tempfile.mkdtemp(prefix="game-automator-spool-", dir=self._directory)
+        return self._temp_dir
\ No newline at end of file
@@ -1,16 +1,35 @@
 import os
 import csv
+import threading
+import time
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
+
+from game_automator.core.trace import traced
 
 
 class CSVStorage:
-    """Handles writing workflow data to CSV files."""
+    """
+    Handles writing workflow data to CSV files.
+    The file stays open for the storage's lifetime; rows are buffered and
+    written once `flush_rows` are pending or `flush_interval` seconds have
+    passed since the last flush, and on close(). A timer enforces the
+    interval, so buffered rows reach the disk even if no more rows follow.
+    """
     
-    def __init__(self, workflow_name: str, columns: List[str], output_dir: str = "output"):
+    def __init__(
+        self,
+        workflow_name: str,
+        columns: List[str],
+        output_dir: str = "output",
+        flush_rows: int = 50,
+        flush_interval: float = 5.0
+    ):
         self.workflow_name = workflow_name
         self.columns = ["timestamp"] + columns
         self.output_dir = output_dir
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
         
         # Create output directory if needed
         os.makedirs(output_dir, exist_ok=True)
@@ -20,18 +39,72 @@ class CSVStorage:
         self.filepath = os.path.join(output_dir, f"{workflow_name}-{timestamp}.csv")
         
         # Write header row
-        with open(self.filepath, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=self.columns)
-            writer.writeheader()
+        self._file = open(self.filepath, "w", newline="")
+        # Rows may carry extra fields meant for the history store only
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction="ignore")
+        self._writer.writeheader()
+        self._file.flush()
+        
+        self._buffer: List[Dict] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
     
+    @traced("storage.write_row")
     def write_row(self, **data) -> None:
-        """Append a row to the CSV. Timestamp is added automatically."""
-        data["timestamp"] = datetime.now().isoformat()
-        
-        with open(self.filepath, "a", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=self.columns)
-            writer.writerow(data)
+        """Append a row to the CSV. Timestamp is added automatically if not given."""
+        data.setdefault("timestamp", datetime.now().isoformat())
+        with self._lock:
+            self._buffer.append(data)
+            self._maybe_flush()
+    
+    @traced("storage.write_rows")
+    def write_rows(self, rows: Iterable[Dict]) -> None:
+        """Append several rows at once. Timestamps are added automatically if not given."""
+        timestamp = datetime.now().isoformat()
+        with self._lock:
+            for row in rows:
+                self._buffer.append({"timestamp": timestamp, **row})
+            self._maybe_flush()
+    
+    def flush(self) -> None:
+        """Write any buffered rows to disk."""
+        with self._lock:
+            self._flush()
+    
+    def close(self) -> None:
+        """Flush remaining rows and close the file."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush()
+            self._file.close()
     
     def get_filepath(self) -> str:
         """Return the path to the CSV file."""
-        return self.filepath
\ No newline at end of file
+        return self.filepath
+    
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffer and not self._file.closed:
+            self._writer.writerows(self._buffer)
+            self._file.flush()
+            self._buffer = []
+        self._last_flush = time.monotonic()
+    
+    def _maybe_flush(self) -> None:
+        elapsed = time.monotonic() - self._last_flush
+        if len(self._buffer) >= self.flush_rows or elapsed >= self.flush_interval:
+            self._flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.flush_interval - elapsed, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def __enter__(self) -> "CSVStorage":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
\ No newline at end of file
@@ -0,0 +1,205 @@
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class Tracer:
+    """
+    Collects timed spans for a run.
+    Spans nest per thread / asyncio task; each span records its own
+    (exclusive) time so stage totals don't double count nested work.
+    """
+
+    def __init__(self):
+        self.events: List[dict] = []
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, event: dict) -> None:
+        with self._lock:
+            self.events.append(event)
+
+    def chrome_trace(self) -> dict:
+        """Events in Chrome trace format (load in chrome://tracing or Perfetto)."""
+        pid = os.getpid()
+        trace_events = []
+        for e in self.events:
+            trace_events.append({
+                "name": e["name"],
+                "cat": e["category"],
+                "ph": "X",
+                "ts": (e["start"] - self.started) * 1e6,
+                "dur": e["duration"] * 1e6,
+                "pid": pid,
+                "tid": e["thread"],
+                "args": {"site": e["site"], **e["args"]},
+            })
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str) -> None:
+        """Write the Chrome trace plus the summary tables as JSON."""
+        data = self.chrome_trace()
+        data["summary"] = self.summary()
+        with open(path, "w") as f:
+            json.dump(data, f, default=str)
+
+    def summary(self) -> Dict[str, List[dict]]:
+        """
+        Aggregate spans by stage (category) and by call site.
+        Times are exclusive of nested spans.
+        """
+        stages: Dict[str, dict] = {}
+        sites: Dict[tuple, dict] = {}
+        for e in self.events:
+            stage = stages.setdefault(e["category"], {"stage": e["category"], "calls": 0, "total": 0.0})
+            stage["calls"] += 1
+            stage["total"] += e["self"]
+
+            site = sites.setdefault((e["name"], e["site"]), {
+                "name": e["name"], "site": e["site"], "calls": 0, "total": 0.0,
+            })
+            site["calls"] += 1
+            site["total"] += e["self"]
+
+        for site in sites.values():
+            site["mean"] = site["total"] / site["calls"]
+
+        return {
+            "stages": sorted(stages.values(), key=lambda s: -s["total"]),
+            "sites": sorted(sites.values(), key=lambda s: -s["total"]),
+        }
+
+    def format_summary(self, max_sites: int = 20) -> str:
+        """Human-readable summary tables."""
+        summary = self.summary()
+        wall = time.perf_counter() - self.started
+        lines = ["Time per stage:", f"  {'Stage':12} {'Calls':>7} {'Total (s)':>10} {'Share':>7}"]
+        for s in summary["stages"]:
+            share = s["total"] / wall if wall else 0.0
+            lines.append(f"  {s['stage']:12} {s['calls']:7d} {s['total']:10.3f} {share:7.1%}")
+
+        lines.append("")
+        lines.append("Top call sites:")
+        lines.append(f"  {'Span':32} {'Site':40} {'Calls':>6} {'Total (s)':>10} {'Mean (ms)':>10}")
+        for s in summary["sites"][:max_sites]:
+            lines.append(
+                f"  {s['name']:32} {s['site']:40} {s['calls']:6d} {s['total']:10.3f} {s['mean'] * 1000:10.1f}"
+            )
+        return "\n".join(lines)
+
+
+# Innermost open span in the current thread or task
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "site", "args", "start", "child_time", "parent", "token")
+
+    def __init__(self, tracer: Tracer, name: str, category: str, site: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.site = site
+        self.args = args
+        self.child_time = 0.0
+
+    def __enter__(self):
+        self.parent = _current_span.get()
+        self.token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.start
+        _current_span.reset(self.token)
+        if self.parent is not None:
+            self.parent.child_time += duration
+        self.tracer.record({
+            "name": self.name,
+            "category": self.category,
+            "site": self.site,
+            "args": self.args,
+            "start": self.start,
+            "duration": duration,
+            "self": max(0.0, duration - self.child_time),
+            "thread": threading.get_ident(),
+        })
+        return False
+
+
+class _NullSpan:
+    """Shared no-op span returned while tracing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+_tracer: Optional[Tracer] = None
+
+
+def enable() -> Tracer:
+    """Start collecting spans. Returns the active tracer."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable() -> Optional[Tracer]:
+    """Stop collecting spans. Returns the tracer that was active, if any."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def _call_site(depth: int) -> str:
+    frame = sys._getframe(depth + 1)
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} ({frame.f_code.co_name})"
+
+
+def span(name: str, category: Optional[str] = None, **args):
+    """
+    Context manager timing a block. Category defaults to the name's prefix
+    (e.g. "ocr" for "ocr.extract_text").
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _Span(_tracer, name, category or name.split(".")[0], _call_site(1), args)
+
+
+def traced(name: str, category: Optional[str] = None):
+    """Decorator timing every call of a function (sync or async)."""
+    category = category or name.split(".")[0]
+
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _tracer is None:
+                    return await func(*args, **kwargs)
+                with _Span(_tracer, name, category, _call_site(1), {}):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _Span(_tracer, name, category, _call_site(1), {}):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
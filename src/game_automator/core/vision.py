@@ -1,53 +1,56 @@
 import asyncio
 import base64
+import concurrent.futures
+import contextvars
+import json
 import os
+import threading
+import time
+from abc import ABC, abstractmethod
 from io import BytesIO
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict, Tuple, Union
 from PIL import Image
 import anthropic
 import aiohttp
+import requests
 
+from game_automator.core import metrics
+from game_automator.core.recorder import record
+from game_automator.core.trace import traced
 
-def image_to_base64(image: Image.Image) -> str:
-    """Convert PIL Image to base64 string."""
+DEFAULT_API_URL = "https://api.anthropic.com"
+
+VISION_REQUESTS = metrics.counter(
+    "vision_requests_total",
+    "Vision API requests, by outcome (ok, not_found, parse_error, api_error, failed).",
+    ["outcome"],
+)
+VISION_SECONDS = metrics.histogram("vision_request_seconds", "Vision API request latency.")
+VISION_BYTES = metrics.counter("vision_request_bytes_total", "Bytes of request payloads sent to the vision API.")
+
+
+def api_base_url() -> str:
+    """API base URL, overridable with ANTHROPIC_BASE_URL (e.g. for a local stub)."""
+    return os.environ.get("ANTHROPIC_BASE_URL", DEFAULT_API_URL).rstrip("/")
+
+
+# A PIL Image, or an image already encoded as PNG bytes
+ImageSource = Union[Image.Image, bytes]
+
+
+@traced("vision.encode")
+def image_to_base64(image: ImageSource) -> str:
+    """Convert PIL Image (or PNG bytes) to base64 string."""
+    if isinstance(image, bytes):
+        return base64.standard_b64encode(image).decode("utf-8")
     buffer = BytesIO()
     image.save(buffer, format="PNG")
     return base64.standard_b64encode(buffer.getvalue()).decode("utf-8")
 
 
-def extract_building_info(image: Image.Image, api_key: Optional[str] = None) -> Optional[dict]:
-    """
-    Use Claude to extract building name, level, and investment progress from screenshot.
-    Returns dict with 'name', 'level', 'current', 'max' or None if extraction failed.
-    """
-    if api_key is None:
-        api_key = os.environ.get("ANTHROPIC_API_KEY")
-    
-    if not api_key:
-        raise ValueError("ANTHROPIC_API_KEY not set. Export it or pass api_key parameter.")
-    
-    client = anthropic.Anthropic(api_key=api_key)
-    
-    image_data = image_to_base64(image)
-    
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=256,
-        messages=[
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "image",
-                        "source": {
-                            "type": "base64",
-                            "media_type": "image/png",
-                            "data": image_data,
-                        },
-                    },
-                    {
-                        "type": "text",
-                        "text": """Look at this game screenshot and extract:
+VISION_MODEL = "claude-sonnet-4-20250514"
+
+BUILDING_PROMPT = """Look at this game screenshot and extract:
 1. The building name (e.g., "Laboratory", "Academy", "Wizard Tower", "Tailor Workshop")
 2. The building level (the number in the purple/pink shield icon next to the building name, e.g., "17")
 3. The investment progress shown on the progress bar (e.g., "19/2,000")
@@ -60,35 +63,70 @@ Tailor Workshop|17|19|2000
 
 If you cannot find the information, respond with:
 NOT_FOUND"""
-                    }
+
+
+def building_request(image_data: str) -> Dict:
+    """Messages API parameters asking for a panel's building info (image as base64 PNG)."""
+    return {
+        "model": VISION_MODEL,
+        "max_tokens": 256,
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "image",
+                        "source": {
+                            "type": "base64",
+                            "media_type": "image/png",
+                            "data": image_data,
+                        },
+                    },
+                    {"type": "text", "text": BUILDING_PROMPT},
                 ],
             }
         ],
-    )
+    }
+
+
+def parse_building_reply(text: str) -> Optional[Dict]:
+    """Parse a NAME|LEVEL|CURRENT|MAX reply. Returns None for NOT_FOUND or anything else."""
+    parts = text.strip().split("|")
+    if len(parts) != 4:
+        return None
+    return {
+        "name": parts[0].strip(),
+        "level": parts[1].strip(),
+        "current": parts[2].strip().replace(",", ""),
+        "max": parts[3].strip().replace(",", ""),
+    }
+
+
+@traced("vision.extract")
+def extract_building_info(image: ImageSource, api_key: Optional[str] = None) -> Optional[dict]:
+    """
+    Use Claude to extract building name, level, and investment progress from screenshot.
+    Returns dict with 'name', 'level', 'current', 'max' or None if extraction failed.
+    """
+    if api_key is None:
+        api_key = os.environ.get("ANTHROPIC_API_KEY")
     
-    response_text = message.content[0].text.strip()
+    if not api_key:
+        raise ValueError("ANTHROPIC_API_KEY not set. Export it or pass api_key parameter.")
     
-    if response_text == "NOT_FOUND":
-        return None
+    client = anthropic.Anthropic(api_key=api_key)
     
-    try:
-        parts = response_text.split("|")
-        if len(parts) == 4:
-            return {
-                "name": parts[0].strip(),
-                "level": parts[1].strip(),
-                "current": parts[2].strip().replace(",", ""),
-                "max": parts[3].strip().replace(",", ""),
-            }
-    except Exception:
-        pass
+    image_data = image_to_base64(image)
     
-    return None
+    message = client.messages.create(**building_request(image_data))
+    
+    return parse_building_reply(message.content[0].text)
 
 
+@traced("vision.request")
 async def extract_building_info_async(
     session: aiohttp.ClientSession,
-    image: Image.Image,
+    image: ImageSource,
     index: int,
     api_key: str
 ) -> Dict:
@@ -97,6 +135,12 @@ async def extract_building_info_async(
     Returns dict with index, and either data or error.
     """
     image_data = image_to_base64(image)
+    start = time.perf_counter()
+    
+    def finish(outcome: str, result: Dict) -> Dict:
+        VISION_REQUESTS.inc(outcome=outcome)
+        VISION_SECONDS.observe(time.perf_counter() - start)
+        return result
     
     headers = {
         "Content-Type": "application/json",
@@ -104,83 +148,48 @@ async def extract_building_info_async(
         "anthropic-version": "2023-06-01"
     }
     
-    payload = {
-        "model": "claude-sonnet-4-20250514",
-        "max_tokens": 256,
-        "messages": [
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "image",
-                        "source": {
-                            "type": "base64",
-                            "media_type": "image/png",
-                            "data": image_data,
-                        },
-                    },
-                    {
-                        "type": "text",
-                        "text": """Look at this game screenshot and extract:
-1. The building name (e.g., "Laboratory", "Academy", "Wizard Tower", "Tailor Workshop")
-2. The building level (the number in the purple/pink shield icon next to the building name, e.g., "17")
-3. The investment progress shown on the progress bar (e.g., "19/2,000")
-
-Respond with ONLY a single line in this exact format:
-BUILDING_NAME|LEVEL|CURRENT|MAX
-
-For example:
-Tailor Workshop|17|19|2000
-
-If you cannot find the information, respond with:
-NOT_FOUND"""
-                    }
-                ],
-            }
-        ],
-    }
+    payload = building_request(image_data)
+    body = json.dumps(payload).encode("utf-8")
+    VISION_BYTES.inc(len(body))
     
     try:
         async with session.post(
-            "https://api.anthropic.com/v1/messages",
+            f"{api_base_url()}/v1/messages",
             headers=headers,
-            json=payload
+            data=body
         ) as response:
             if response.status != 200:
                 error_text = await response.text()
-                return {"index": index, "error": f"API error {response.status}: {error_text}"}
+                return finish("api_error", {"index": index, "error": f"API error {response.status}: {error_text}"})
             
             data = await response.json()
             response_text = data["content"][0]["text"].strip()
             
             if response_text == "NOT_FOUND":
-                return {"index": index, "error": "NOT_FOUND"}
+                return finish("not_found", {"index": index, "error": "NOT_FOUND"})
             
-            parts = response_text.split("|")
-            if len(parts) == 4:
-                return {
-                    "index": index,
-                    "data": {
-                        "name": parts[0].strip(),
-                        "level": parts[1].strip(),
-                        "current": parts[2].strip().replace(",", ""),
-                        "max": parts[3].strip().replace(",", ""),
-                    }
-                }
+            building = parse_building_reply(response_text)
+            if building is not None:
+                return finish("ok", {"index": index, "data": building})
             
-            return {"index": index, "error": f"Parse error: {response_text}"}
+            return finish("parse_error", {"index": index, "error": f"Parse error: {response_text}"})
             
     except Exception as e:
-        return {"index": index, "error": str(e)}
+        return finish("failed", {"index": index, "error": str(e)})
 
 
+@traced("vision.extract_all")
 async def extract_all_buildings_async(
-    images: List[Image.Image],
+    images: List[ImageSource],
     api_key: Optional[str] = None,
-    max_concurrent: int = 10
+    max_concurrent: int = 10,
+    session: Optional[aiohttp.ClientSession] = None,
+    semaphore: Optional[asyncio.Semaphore] = None
 ) -> List[Optional[Dict]]:
     """
     Extract building info from multiple images concurrently.
+    Pass session/semaphore to share a connection pool and concurrency
+    limit with other callers.
     Returns list of results in same order as input images.
     """
     if api_key is None:
@@ -189,18 +198,24 @@ async def extract_all_buildings_async(
     if not api_key:
         raise ValueError("ANTHROPIC_API_KEY not set.")
     
-    semaphore = asyncio.Semaphore(max_concurrent)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max_concurrent)
     
     async def limited_extract(session, image, index):
         async with semaphore:
             return await extract_building_info_async(session, image, index, api_key)
     
-    async with aiohttp.ClientSession() as session:
-        tasks = [
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            results = await asyncio.gather(*[
+                limited_extract(session, img, i) 
+                for i, img in enumerate(images)
+            ])
+    else:
+        results = await asyncio.gather(*[
             limited_extract(session, img, i) 
             for i, img in enumerate(images)
-        ]
-        results = await asyncio.gather(*tasks)
+        ])
     
     results.sort(key=lambda x: x["index"])
     
@@ -215,8 +230,299 @@ async def extract_all_buildings_async(
     return output
 
 
-def extract_all_buildings(images: List[Image.Image], api_key: Optional[str] = None) -> List[Optional[Dict]]:
+class VisionClient:
+    """
+    One event loop thread and HTTP session for vision requests, shared by
+    every calling thread (e.g. workflows running for several windows), so
+    connections are reused and the concurrency limit applies to all of them.
+    """
+    
+    def __init__(self, max_concurrent: int = 10):
+        self.max_concurrent = max_concurrent
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="vision-client", daemon=True)
+        self._thread.start()
+    
+    def extract_all(self, images: List[ImageSource], api_key: Optional[str] = None) -> List[Optional[Dict]]:
+        """Extract building info from images, blocking until all are done."""
+        return self.submit(images, api_key).result()
+    
+    def submit(self, images: List[ImageSource], api_key: Optional[str] = None) -> concurrent.futures.Future:
+        """Start extracting building info from images. Returns a future of the results."""
+        return self._submit(self._extract_all(images, api_key))
+    
+    def close(self) -> None:
+        if self._session is not None:
+            self._submit(self._session.close()).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+    
+    async def _extract_all(self, images: List[ImageSource], api_key: Optional[str]) -> List[Optional[Dict]]:
+        if self._session is None:
+            # Created on the client's loop, which they are bound to
+            self._session = aiohttp.ClientSession()
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return await extract_all_buildings_async(
+            images, api_key, session=self._session, semaphore=self._semaphore
+        )
+    
+    def _submit(self, coro) -> concurrent.futures.Future:
+        """
+        Run a coroutine on the client's loop in the caller's context, so
+        trace spans nest and its output (e.g. per-image warnings) goes to
+        the caller's output sink.
+        """
+        context = contextvars.copy_context()
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        
+        def done(task: asyncio.Task) -> None:
+            if task.cancelled():
+                future.cancel()
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+        
+        def start() -> None:
+            task = context.run(self._loop.create_task, coro)
+            task.add_done_callback(done)
+        
+        self._loop.call_soon_threadsafe(start)
+        return future
+
+
+_client: Optional[VisionClient] = None
+_client_lock = threading.Lock()
+
+
+def get_vision_client() -> VisionClient:
+    """Get or create the shared vision client."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = VisionClient()
+    return _client
+
+
+def extract_all_buildings(images: List[ImageSource], api_key: Optional[str] = None) -> List[Optional[Dict]]:
+    """
+    Synchronous wrapper for async batch extraction, using the shared client.
+    """
+    start = time.perf_counter()
+    results = get_vision_client().extract_all(images, api_key)
+    _record_extraction(images, results, start)
+    return results
+
+
+async def extract_all_buildings_shared(images: List[ImageSource], api_key: Optional[str] = None) -> List[Optional[Dict]]:
+    """
+    Awaitable counterpart of extract_all_buildings for code running on
+    another event loop (async workflows): the requests run on the shared
+    client and the caller's loop stays free while they are in flight.
+    """
+    start = time.perf_counter()
+    results = await asyncio.wrap_future(get_vision_client().submit(images, api_key))
+    _record_extraction(images, results, start)
+    return results
+
+
+def _record_extraction(images: List[ImageSource], results: List[Optional[Dict]], start: float) -> None:
+    record(
+        "vision",
+        images=len(images),
+        extracted=sum(result is not None for result in results),
+        seconds=round(time.perf_counter() - start, 3),
+    )
+
+
+# Deferred mode: a whole scan as one Message Batches job. Batches cost less
+# and don't use the real-time rate limits, but results can take minutes
+# (at most 24 hours), so they suit unattended scans.
+
+ANTHROPIC_VERSION = "2023-06-01"
+
+VISION_BATCHES = metrics.counter("vision_batches_total", "Vision batch jobs, by outcome (submitted, ended, timeout).", ["outcome"])
+
+
+class VisionBatchError(Exception):
+    """A batch API call failed. retryable is True for errors worth polling through (5xx, 429, network)."""
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class VisionTransport(ABC):
+    """
+    How batch API calls reach the server. request() sends one JSON request
+    and returns (status, body bytes); paths are relative to the API base
+    URL, absolute URLs (e.g. a batch's results_url) are used as they are.
+    Swap in another transport to point the client at a fake server or to
+    answer in-process.
+    """
+
+    @abstractmethod
+    def request(self, method: str, path: str, payload: Optional[Dict] = None) -> Tuple[int, bytes]:
+        """Send a request (with payload as its JSON body, if any). Returns (status, body)."""
+
+
+class HTTPTransport(VisionTransport):
+    """Transport over HTTPS to the Anthropic API (or ANTHROPIC_BASE_URL)."""
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, timeout: float = 60.0):
+        self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+        if not self.api_key:
+            raise ValueError("ANTHROPIC_API_KEY not set.")
+        self.base_url = (base_url or api_base_url()).rstrip("/")
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def request(self, method: str, path: str, payload: Optional[Dict] = None) -> Tuple[int, bytes]:
+        url = path if "://" in path else self.base_url + path
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        if body:
+            VISION_BYTES.inc(len(body))
+        response = self._session.request(
+            method,
+            url,
+            data=body,
+            headers={
+                "Content-Type": "application/json",
+                "x-api-key": self.api_key,
+                "anthropic-version": ANTHROPIC_VERSION,
+            },
+            timeout=self.timeout,
+        )
+        return response.status_code, response.content
+
+
+class VisionBatchClient:
+    """
+    Submits panels as one message batch, polls it with exponential backoff
+    and parses the results. Each call is a single request, so async callers
+    can run them on a worker thread and sleep between polls themselves
+    (see poll_delays()).
+    """
+
+    def __init__(
+        self,
+        transport: Optional[VisionTransport] = None,
+        poll_interval: float = 15.0,
+        max_poll_interval: float = 300.0,
+        backoff: float = 1.5
+    ):
+        self.transport = transport or HTTPTransport()
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+
+    def _call(self, method: str, path: str, payload: Optional[Dict] = None, lines: bool = False):
+        """
+        Make an API call and decode its JSON reply (a list of objects if
+        lines, for JSONL). A reply that isn't JSON, e.g. a proxy's error
+        page, is treated like a server error.
+        """
+        try:
+            status, body = self.transport.request(method, path, payload)
+        except OSError as e:  # Includes requests' connection errors
+            raise VisionBatchError(f"{method} {path} failed: {e}", retryable=True) from e
+        if status >= 300:
+            text = body.decode("utf-8", "replace")[:300]
+            raise VisionBatchError(f"{method} {path}: API error {status}: {text}", retryable=status == 429 or status >= 500)
+        try:
+            text = body.decode("utf-8")
+            if lines:
+                return [json.loads(line) for line in text.splitlines() if line.strip()]
+            return json.loads(text)
+        except ValueError as e:  # Includes JSONDecodeError and UnicodeDecodeError
+            raise VisionBatchError(f"{method} {path}: invalid reply: {e}", retryable=True) from e
+
+    @traced("vision.batch_submit")
+    def submit(self, images: List[ImageSource], ids: Optional[List[str]] = None) -> str:
+        """Submit one extraction request per image. Returns the batch id."""
+        ids = ids or [f"panel-{i:03d}" for i in range(len(images))]
+        requests_ = [
+            {"custom_id": custom_id, "params": building_request(image_to_base64(image))}
+            for custom_id, image in zip(ids, images)
+        ]
+        batch = self._call("POST", "/v1/messages/batches", {"requests": requests_})
+        VISION_BATCHES.inc(outcome="submitted")
+        return batch["id"]
+
+    def status(self, batch_id: str) -> Dict:
+        """The batch object; processing_status is "ended" once results are ready."""
+        return self._call("GET", f"/v1/messages/batches/{batch_id}")
+
+    def poll_delays(self, timeout: float):
+        """Seconds to wait before each poll: growing by backoff up to max_poll_interval, for timeout seconds in all."""
+        delay = self.poll_interval
+        remaining = timeout
+        while remaining > 0:
+            wait = min(delay, remaining)
+            yield wait
+            remaining -= wait
+            delay = min(delay * self.backoff, self.max_poll_interval)
+
+    def poll(self, batch_id: str) -> Optional[Dict]:
+        """The ended batch object, or None while it is still processing (or unreachable)."""
+        try:
+            batch = self.status(batch_id)
+        except VisionBatchError as e:
+            if not e.retryable:
+                raise
+            print(f"[VISION] Polling batch {batch_id} failed, will retry: {e}")
+            return None
+        if batch.get("processing_status") != "ended":
+            return None
+        VISION_BATCHES.inc(outcome="ended")
+        return batch
+
+    @traced("vision.batch_results")
+    def results(self, batch: Dict) -> Dict[str, Optional[Dict]]:
+        """Building info by custom id for an ended batch (None where extraction failed)."""
+        url = batch.get("results_url") or f"/v1/messages/batches/{batch['id']}/results"
+        output: Dict[str, Optional[Dict]] = {}
+        for entry in self._call("GET", url, lines=True):
+            result = entry.get("result", {})
+            building = None
+            if result.get("type") == "succeeded":
+                text = result["message"]["content"][0]["text"].strip()
+                building = parse_building_reply(text)
+                outcome = "ok" if building is not None else ("not_found" if text == "NOT_FOUND" else "parse_error")
+            else:
+                outcome = "api_error"
+                print(f"[WARNING] Batch request {entry.get('custom_id')}: {result.get('type')} {result.get('error', '')}")
+            VISION_REQUESTS.inc(outcome=outcome)
+            output[entry["custom_id"]] = building
+        return output
+
+    def wait(self, batch_id: str, timeout: float = 24 * 3600, sleep: Callable[[float], None] = time.sleep) -> Dict:
+        """Poll until the batch has ended. Raises VisionBatchError after timeout seconds."""
+        for delay in self.poll_delays(timeout):
+            sleep(delay)
+            batch = self.poll(batch_id)
+            if batch is not None:
+                return batch
+        raise self.timed_out(batch_id, timeout)
+
+    def timed_out(self, batch_id: str, timeout: float) -> VisionBatchError:
+        VISION_BATCHES.inc(outcome="timeout")
+        return VisionBatchError(f"Batch {batch_id} did not finish within {timeout:.0f}s")
+
+
+def extract_all_buildings_batch(
+    images: List[ImageSource],
+    timeout: float = 24 * 3600,
+    client: Optional[VisionBatchClient] = None
+) -> List[Optional[Dict]]:
     """
-    Synchronous wrapper for async batch extraction.
+    Deferred counterpart of extract_all_buildings: one batch job, blocking
+    until it has ended. Returns results in the same order as images.
     """
-    return asyncio.run(extract_all_buildings_async(images, api_key))
\ No newline at end of file
+    client = client or VisionBatchClient()
+    ids = [f"panel-{i:03d}" for i in range(len(images))]
+    batch_id = client.submit(images, ids)
+    print(f"[VISION] Submitted batch {batch_id} ({len(images)} images)")
+    results = client.results(client.wait(batch_id, timeout))
+    return [results.get(custom_id) for custom_id in ids]
\ No newline at end of file
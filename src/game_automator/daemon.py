@@ -0,0 +1,343 @@
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from game_automator.core import metrics
+from game_automator.core.output import OutputRouter
+from game_automator.scheduler import JobRejected, Scheduler, workflow_target
+
+DEFAULT_SOCKET_PATH = os.path.join(os.path.expanduser("~"), ".game-automator", "daemon.sock")
+
+
+def socket_path() -> str:
+    """Daemon socket path, overridable with GAME_AUTOMATOR_SOCKET."""
+    return os.environ.get("GAME_AUTOMATOR_SOCKET", DEFAULT_SOCKET_PATH)
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening on the socket."""
+
+
+# Protocol: one JSON object per line in each direction.
+#   client -> daemon: {"command": "run", "workflow": ..., "options": {...}, "resume": bool}
+#                     {"command": "ping"} / {"command": "shutdown"}
+#                     {"command": "cancel"} (every job) / {"command": "cancel", "job": id}
+#   daemon -> client: {"type": "started", "job": id} once the run has started,
+#                     {"type": "log", "text": ...} for workflow output,
+#                     {"type": "prompt", "text": ...} answered with {"answer": ...},
+#                     then a final {"type": "result", ...} or {"type": "error", "message": ...}
+
+def send_message(stream, message: Dict) -> None:
+    stream.write((json.dumps(message) + "\n").encode("utf-8"))
+    stream.flush()
+
+
+def read_message(stream) -> Optional[Dict]:
+    line = stream.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+class _ClientSession:
+    """The client connection a request is being served for."""
+
+    def __init__(self, rfile, wfile):
+        self.rfile = rfile
+        self.wfile = wfile
+        self.connected = True
+        self.on_disconnect: Optional[Callable[[], None]] = None
+        self._send_lock = threading.Lock()  # Log lines arrive from a run's worker threads too
+
+    def send(self, message: Dict) -> None:
+        if not self.connected:
+            return
+        try:
+            with self._send_lock:
+                send_message(self.wfile, message)
+        except OSError:
+            self.disconnected()
+
+    def disconnected(self) -> None:
+        if self.connected:
+            self.connected = False
+            if self.on_disconnect is not None:
+                self.on_disconnect()
+
+    def log(self, text: str) -> None:
+        self.send({"type": "log", "text": text})
+
+    def ask(self, question: str) -> str:
+        """Ask the client's user; an empty answer if the client has gone."""
+        self.send({"type": "prompt", "text": question})
+        if not self.connected:
+            return ""
+        try:
+            reply = read_message(self.rfile)
+        except (OSError, ValueError):
+            reply = None
+        if reply is None:
+            self.disconnected()
+            return ""
+        return str(reply.get("answer", ""))
+
+
+class WorkflowDaemon:
+    """
+    Long-running process that keeps OCR models, API clients and the
+    capture/input backend loaded, and runs workflows for clients
+    connecting over a Unix socket. One workflow runs per game window;
+    a client that disconnects mid-run cancels its workflow.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        from game_automator.workflows import available_workflows
+
+        self.path = path or socket_path()
+        self.workflows = available_workflows()
+        self.scheduler = Scheduler()
+        self.started = time.time()
+        self._server: Optional[socketserver.UnixStreamServer] = None
+
+    def warm_up(self) -> None:
+        """Load everything a run needs up front so runs start immediately."""
+        from game_automator.core.backends import get_backend
+        from game_automator.core.executor import get_executor
+        from game_automator.core.ocr import get_reader
+        import game_automator.core.vision  # noqa: F401 (imports anthropic/aiohttp)
+
+        start = time.perf_counter()
+        for spec in self.workflows.values():
+            spec.load()
+        get_backend()
+        get_executor()
+        get_reader()
+        print(f"[DAEMON] Warmed up in {time.perf_counter() - start:.1f}s")
+
+    def serve_forever(self) -> None:
+        self._prepare_socket()
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    request = read_message(self.rfile)
+                except ValueError:
+                    request = None
+                if request is not None:
+                    daemon.handle(_ClientSession(self.rfile, self.wfile), request)
+
+        from game_automator.core.outbox import get_sender
+
+        get_sender()  # Delivers reports queued by runs, including earlier ones
+        router = OutputRouter(sys.stdout)
+        sys.stdout = router
+        self._server = socketserver.ThreadingUnixStreamServer(self.path, Handler)
+        self._server.daemon_threads = True
+        os.chmod(self.path, 0o600)
+        print(f"[DAEMON] Listening on {self.path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            sys.stdout = router.stream
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def shutdown(self) -> None:
+        self.scheduler.stop()
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def handle(self, session: _ClientSession, request: Dict) -> None:
+        command = request.get("command")
+        if command == "ping":
+            session.send({
+                "type": "result",
+                "pid": os.getpid(),
+                "uptime": time.time() - self.started,
+                "running": [job.name for job in self.scheduler.active()],
+            })
+        elif command == "run":
+            self.run_workflow(session, request)
+        elif command == "cancel":
+            jobs = self.scheduler.cancel(job_id=request.get("job"))
+            for job in jobs:
+                print(f"[DAEMON] Cancelling {job.name}")
+            session.send({"type": "result", "cancelled": [job.name for job in jobs]})
+        elif command == "shutdown":
+            print("[DAEMON] Shutting down")
+            session.send({"type": "result"})
+            self.shutdown()
+        else:
+            session.send({"type": "error", "message": f"Unknown command: {command}"})
+
+    def run_workflow(self, session: _ClientSession, request: Dict) -> None:
+        name = request.get("workflow")
+        if name not in self.workflows:
+            session.send({"type": "error", "message": f"Unknown workflow: {name}"})
+            return
+
+        workflow_class = self.workflows[name].load()
+        target = workflow_target(
+            workflow_class,
+            request.get("options", {}),
+            request.get("resume", False),
+            prompt=session.ask,
+        )
+
+        def run(job):
+            print(f"[DAEMON] Running {name} (job {job.id})")
+            session.on_disconnect = job.cancel
+            session.send({"type": "started", "job": job.id})
+            sys.stdout.attach(session.log)
+            try:
+                return target(job)
+            finally:
+                sys.stdout.attach(None)
+
+        try:
+            job = self.scheduler.run(name, workflow_class.window_title, run)
+        except JobRejected as e:
+            session.send({"type": "error", "message": f"Busy: {e}"})
+            return
+        print(f"[DAEMON] {name} finished ({job.status})")
+        session.send({"type": "result", "success": job.success, "status": job.status})
+
+    def _prepare_socket(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(self.path):
+            return
+        try:
+            request(self.path, {"command": "ping"})
+        except DaemonUnavailable:
+            os.unlink(self.path)  # Stale socket from a daemon that died
+        else:
+            raise RuntimeError(f"A daemon is already running on {self.path}")
+
+
+def connect(path: Optional[str] = None) -> socket.socket:
+    """Connect to the daemon, raising DaemonUnavailable if none is running."""
+    path = path or socket_path()
+    if not hasattr(socket, "AF_UNIX"):
+        raise DaemonUnavailable("Unix sockets are not supported on this platform")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        sock.close()
+        raise DaemonUnavailable(str(e))
+    return sock
+
+
+def request(path: Optional[str], message: Dict) -> Dict:
+    """Send a one-shot command and return the daemon's reply."""
+    with connect(path) as sock:
+        stream = sock.makefile("rwb")
+        send_message(stream, message)
+        return read_message(stream) or {}
+
+
+def run_via_daemon(
+    workflow_name: str,
+    options: Optional[Dict] = None,
+    resume: bool = False,
+    path: Optional[str] = None,
+    prompt: Callable[[str], str] = input,
+    on_start: Optional[Callable[[int], None]] = None
+) -> bool:
+    """
+    Run a workflow in the daemon, streaming its output to stdout and
+    answering its questions with prompt(). on_start is called with the
+    daemon's job id once the run has started. Raises DaemonUnavailable if
+    no daemon is running. Returns whether the workflow succeeded.
+    """
+    with connect(path) as sock:
+        stream = sock.makefile("rwb")
+        send_message(stream, {
+            "command": "run",
+            "workflow": workflow_name,
+            "options": options or {},
+            "resume": resume,
+        })
+        while True:
+            message = read_message(stream)
+            if message is None:
+                print("[ERROR] Daemon closed the connection")
+                return False
+            if message["type"] == "started":
+                if on_start is not None:
+                    on_start(message["job"])
+            elif message["type"] == "log":
+                sys.stdout.write(message["text"])
+                sys.stdout.flush()
+            elif message["type"] == "prompt":
+                send_message(stream, {"answer": prompt(message["text"])})
+            elif message["type"] == "error":
+                print(f"[ERROR] {message['message']}")
+                return False
+            elif message["type"] == "result":
+                return bool(message.get("success"))
+
+
+def cancel_daemon_jobs(path: Optional[str] = None, job_id: Optional[int] = None) -> None:
+    """Cancel a daemon job (or everything the daemon is running), if there is a daemon."""
+    message = {"command": "cancel"}
+    if job_id is not None:
+        message["job"] = job_id
+    try:
+        request(path, message)
+    except DaemonUnavailable:
+        pass
+
+
+def client_target(
+    workflow_name: str,
+    options: Optional[Dict] = None,
+    prompt: Callable[[str], str] = input
+) -> Callable:
+    """
+    Scheduler job target that runs the workflow in the daemon if one is
+    running, otherwise in this process.
+    """
+    def target(job) -> bool:
+        def started(daemon_job: int) -> None:
+            # Cancelling this job cancels only its own run in the daemon
+            job.on_cancel = lambda: cancel_daemon_jobs(job_id=daemon_job)
+            if job.cancelled.is_set():
+                job.on_cancel()
+
+        try:
+            return run_via_daemon(workflow_name, options, prompt=prompt, on_start=started)
+        except DaemonUnavailable:
+            pass
+
+        from game_automator.workflows import get_workflow
+
+        workflow_class = get_workflow(workflow_name)
+        if workflow_class is None:
+            print(f"[ERROR] Unknown workflow: {workflow_name}")
+            return False
+        return workflow_target(workflow_class, options, prompt=prompt)(job)
+    return target
+
+
+def main(path: Optional[str] = None, warm: bool = True, metrics_port: Optional[int] = None) -> None:
+    daemon = WorkflowDaemon(path)
+    if warm:
+        daemon.warm_up()
+    server = metrics.serve(metrics_port)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[DAEMON] Stopped")
+    finally:
+        if server:
+            server.stop()
\ No newline at end of file
@@ -0,0 +1,202 @@
+import functools
+import threading
+from typing import Dict, List, Tuple
+
+import yaml
+
+from game_automator.engine.models import Landmark, Region, Screen, Transition
+
+# Example (regions are (x, y, width, height) and points (x, y), as
+# fractions of the window size):
+#
+#   screens:                 # Checked in this order when identifying the screen
+#     panel:
+#       landmarks:
+#         - nvestment        # Text that must be visible
+#         - {text: X, region: [0.8, 0.5, 0.2, 0.15]}
+#       regions:
+#         panel: [0.04, 0.25, 0.92, 0.40]
+#       points:
+#         close: [0.88, 0.58]
+#   transitions:
+#     - {from: panel, to: city, click: X, fallback: close, timeout: 5}
+
+SCREEN_KEYS = {"landmarks", "regions", "points"}
+TRANSITION_KEYS = {"from", "to", "click", "click_region", "fallback", "wait_for", "timeout"}
+
+
+class DefinitionError(ValueError):
+    """A screen definition file is malformed."""
+
+
+class Layout:
+    """Screens and transitions compiled to pixels for one window size."""
+    __slots__ = ("size", "screens", "transitions")
+
+    def __init__(self, size: Tuple[int, int], screens: Dict[str, Screen], transitions: Dict[Tuple[str, str], Transition]):
+        self.size = size
+        self.screens = screens
+        self.transitions = transitions
+
+    def region(self, screen: str, name: str) -> Region:
+        return self.screens[screen].data_regions[name]
+
+    def point(self, screen: str, name: str) -> Tuple[int, int]:
+        return self.screens[screen].points[name]
+
+
+class ScreenDefinitions:
+    """
+    Validated screen definitions with coordinates as fractions of the
+    window. compile() turns them into pixel regions and click points for a
+    window size, once per size.
+    """
+
+    def __init__(self, data: Dict, source: str = "<definitions>"):
+        self.source = source
+        self.screens, self.transitions = _validate(data, source)
+        self._compiled: Dict[Tuple[int, int], Layout] = {}
+        self._lock = threading.Lock()
+
+    def compile(self, width: int, height: int) -> Layout:
+        """Pixel layout for a window (or captured frame) of this size."""
+        size = (width, height)
+        layout = self._compiled.get(size)
+        if layout is None:
+            with self._lock:
+                layout = self._compiled.get(size)
+                if layout is None:
+                    layout = self._compiled[size] = self._compile(width, height)
+        return layout
+
+    def _compile(self, width: int, height: int) -> Layout:
+        def point(fractions: Tuple[float, float]) -> Tuple[int, int]:
+            return int(width * fractions[0]), int(height * fractions[1])
+
+        screens = {}
+        for name, spec in self.screens.items():
+            screens[name] = Screen(
+                landmarks=[
+                    Landmark(text, Region.scaled(region, width, height) if region else None)
+                    for text, region in spec["landmarks"]
+                ],
+                data_regions={key: Region.scaled(value, width, height) for key, value in spec["regions"].items()},
+                points={key: point(value) for key, value in spec["points"].items()},
+            )
+
+        transitions = {}
+        for spec in self.transitions:
+            source = spec["from"]
+            click_region = spec.get("click_region")
+            fallback = spec.get("fallback")
+            transitions[(source, spec["to"])] = Transition(
+                click_landmark=spec.get("click"),
+                click_region=screens[source].data_regions[click_region] if click_region else None,
+                wait_for=spec.get("wait_for"),
+                timeout=float(spec.get("timeout", 5.0)),
+                fallback_point=screens[source].points[fallback] if fallback else None,
+            )
+        return Layout((width, height), screens, transitions)
+
+
+@functools.lru_cache(maxsize=None)
+def load_definitions(path: str) -> ScreenDefinitions:
+    """Load and validate a YAML definition file (cached per path)."""
+    try:
+        with open(path) as f:
+            data = yaml.safe_load(f)
+    except yaml.YAMLError as e:
+        raise DefinitionError(f"{path}: invalid YAML: {e}") from e
+    return ScreenDefinitions(data, path)
+
+
+def _validate(data, source: str) -> Tuple[Dict[str, Dict], List[Dict]]:
+    def fail(where: str, message: str) -> None:
+        raise DefinitionError(f"{source}: {where}: {message}")
+
+    def fractions(where: str, value, count: int) -> Tuple[float, ...]:
+        if (
+            not isinstance(value, (list, tuple)) or len(value) != count
+            or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value)
+        ):
+            fail(where, f"expected a list of {count} numbers")
+        if not all(0 <= v <= 1 for v in value):
+            fail(where, "values must be fractions of the window size (0 to 1)")
+        if count == 4 and (value[0] + value[2] > 1 or value[1] + value[3] > 1 or value[2] <= 0 or value[3] <= 0):
+            fail(where, "region must be non-empty and inside the window")
+        return tuple(float(v) for v in value)
+
+    def named(where: str, value, count: int) -> Dict[str, Tuple[float, ...]]:
+        if value is None:
+            return {}
+        if not isinstance(value, dict):
+            fail(where, "expected a mapping of names")
+        return {str(key): fractions(f"{where}.{key}", item, count) for key, item in value.items()}
+
+    if not isinstance(data, dict):
+        fail("top level", "expected a mapping with 'screens'")
+    unknown = set(data) - {"screens", "transitions"}
+    if unknown:
+        fail("top level", f"unknown keys {sorted(unknown)}")
+    if not isinstance(data.get("screens"), dict) or not data["screens"]:
+        fail("screens", "expected a mapping of screen names")
+
+    screens = {}
+    for name, spec in data["screens"].items():
+        where = f"screens.{name}"
+        if not isinstance(spec, dict):
+            fail(where, "expected a mapping")
+        unknown = set(spec) - SCREEN_KEYS
+        if unknown:
+            fail(where, f"unknown keys {sorted(unknown)}")
+        landmarks = spec.get("landmarks")
+        if not isinstance(landmarks, list) or not landmarks:
+            fail(f"{where}.landmarks", "expected a non-empty list")
+
+        parsed = []
+        for i, landmark in enumerate(landmarks):
+            if isinstance(landmark, str):
+                parsed.append((landmark, None))
+            elif isinstance(landmark, dict) and isinstance(landmark.get("text"), str) and set(landmark) <= {"text", "region"}:
+                region = landmark.get("region")
+                parsed.append((landmark["text"], fractions(f"{where}.landmarks[{i}].region", region, 4) if region else None))
+            else:
+                fail(f"{where}.landmarks[{i}]", "expected text or {text, region}")
+
+        screens[str(name)] = {
+            "landmarks": parsed,
+            "regions": named(f"{where}.regions", spec.get("regions"), 4),
+            "points": named(f"{where}.points", spec.get("points"), 2),
+        }
+
+    transitions = data.get("transitions") or []
+    if not isinstance(transitions, list):
+        fail("transitions", "expected a list")
+    seen = set()
+    for i, spec in enumerate(transitions):
+        where = f"transitions[{i}]"
+        if not isinstance(spec, dict):
+            fail(where, "expected a mapping")
+        unknown = set(spec) - TRANSITION_KEYS
+        if unknown:
+            fail(where, f"unknown keys {sorted(unknown)}")
+        for key in ("from", "to", "wait_for"):
+            if key in spec and spec[key] not in screens:
+                fail(f"{where}.{key}", f"unknown screen '{spec[key]}'")
+        if "from" not in spec or "to" not in spec:
+            fail(where, "'from' and 'to' are required")
+        if ("click" in spec) == ("click_region" in spec):
+            fail(where, "expected exactly one of 'click' (landmark text) or 'click_region'")
+        from_screen = screens[spec["from"]]
+        if "click_region" in spec and spec["click_region"] not in from_screen["regions"]:
+            fail(f"{where}.click_region", f"no region '{spec['click_region']}' on screen '{spec['from']}'")
+        if "fallback" in spec and spec["fallback"] not in from_screen["points"]:
+            fail(f"{where}.fallback", f"no point '{spec['fallback']}' on screen '{spec['from']}'")
+        if "timeout" in spec and (not isinstance(spec["timeout"], (int, float)) or spec["timeout"] <= 0):
+            fail(f"{where}.timeout", "expected a positive number of seconds")
+        key = (spec["from"], spec["to"])
+        if key in seen:
+            fail(where, f"duplicate transition {key[0]} -> {key[1]}")
+        seen.add(key)
+
+    return screens, transitions
\ No newline at end of file
@@ -0,0 +1,90 @@
+import time
+from typing import Dict, List, Optional, Tuple
+from PIL import Image
+
+from game_automator.core import metrics
+from game_automator.core.capture import capture_window, frame_signature, frames_differ
+from game_automator.core.ocr import extract_text_with_positions
+from game_automator.engine.models import Region
+
+OCR_CACHE = metrics.counter("ocr_cache_total", "Frame OCR lookups, by result (hit: served from the frame's cache).", ["result"])
+
+
+class Frame:
+    """
+    A captured window image with cached OCR results.
+    OCR is run at most once per region, so identification and landmark
+    lookups on the same frame share the work.
+    """
+
+    def __init__(self, image: Image.Image, captured_at: Optional[float] = None):
+        self.image = image
+        self.captured_at = captured_at if captured_at is not None else time.time()
+        self._signature: Optional[Image.Image] = None
+        self._ocr: Dict[Optional[Tuple[int, int, int, int]], List[dict]] = {}
+
+    @property
+    def signature(self) -> Image.Image:
+        """Cheap thumbnail used to compare against other frames."""
+        if self._signature is None:
+            self._signature = frame_signature(self.image)
+        return self._signature
+
+    def age(self) -> float:
+        return time.time() - self.captured_at
+
+    def refreshed(self, window: dict) -> "Frame":
+        """
+        This frame if the window still looks the same, so its OCR results
+        can be reused for clicks; otherwise a new capture. Judged by
+        content rather than age, since OCR of the frame itself may have
+        taken longer than the screen stays unchanged.
+        """
+        current = capture_frame(window)
+        if frames_differ(self.signature, current.signature):
+            return current
+        return self
+
+    def text_with_positions(self, region: Optional[Region] = None) -> List[dict]:
+        """
+        OCR results for the region (or whole frame), cached per region.
+        Bboxes are relative to the window top-left, not the region.
+        """
+        key = region.as_tuple() if region else None
+        OCR_CACHE.inc(result="hit" if key in self._ocr else "miss")
+        if key not in self._ocr:
+            if region:
+                crop = self.image.crop(region.box)
+                results = extract_text_with_positions(crop)
+                for result in results:
+                    x, y, width, height = result["bbox"]
+                    result["bbox"] = (x + region.x, y + region.y, width, height)
+            else:
+                results = extract_text_with_positions(self.image)
+            self._ocr[key] = results
+        return self._ocr[key]
+
+    def text(self, region: Optional[Region] = None) -> str:
+        """Concatenated text for the region (or whole frame)."""
+        return " ".join(result["text"] for result in self.text_with_positions(region))
+
+    def find_text(
+        self,
+        search_text: str,
+        region: Optional[Region] = None,
+        min_confidence: float = 0.5
+    ) -> Optional[dict]:
+        """
+        Find specific text in the frame, optionally restricted to a region.
+        Returns the first match with a window-relative bbox, or None.
+        """
+        search_lower = search_text.lower()
+        for result in self.text_with_positions(region):
+            if search_lower in result["text"].lower() and result["confidence"] >= min_confidence:
+                return result
+        return None
+
+
+def capture_frame(window: dict) -> Frame:
+    """Capture the window as a Frame."""
+    return Frame(capture_window(window))
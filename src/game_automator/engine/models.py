@@ -2,19 +2,43 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
 
-@dataclass
 class Region:
-    """A rectangular region relative to window top-left."""
-    x: int
-    y: int
-    width: int
-    height: int
+    """
+    A rectangular region relative to window top-left, in pixels.
+    The crop box and center are computed once; treat regions as immutable.
+    """
+    __slots__ = ("x", "y", "width", "height", "box", "_center")
+    
+    def __init__(self, x: int, y: int, width: int, height: int):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.box = (x, y, x + width, y + height)  # (left, top, right, bottom) for Image.crop
+        self._center = (x + width // 2, y + height // 2)
+    
+    @classmethod
+    def scaled(cls, fractions: Tuple[float, float, float, float], width: int, height: int) -> "Region":
+        """Region from (x, y, width, height) fractions of a window size."""
+        x, y, w, h = fractions
+        left = int(width * x)
+        top = int(height * y)
+        return cls(left, top, int(width * (x + w)) - left, int(height * (y + h)) - top)
     
     def as_tuple(self) -> Tuple[int, int, int, int]:
         return (self.x, self.y, self.width, self.height)
     
     def center(self) -> Tuple[int, int]:
-        return (self.x + self.width // 2, self.y + self.height // 2)
+        return self._center
+    
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Region) and self.as_tuple() == other.as_tuple()
+    
+    def __hash__(self) -> int:
+        return hash(self.as_tuple())
+    
+    def __repr__(self) -> str:
+        return f"Region(x={self.x}, y={self.y}, width={self.width}, height={self.height})"
 
 
 @dataclass
@@ -29,6 +53,7 @@ class Screen:
     """Definition of a game screen."""
     landmarks: List[Landmark]
     data_regions: Dict[str, Region] = field(default_factory=dict)
+    points: Dict[str, Tuple[int, int]] = field(default_factory=dict)  # Named click points
 
 
 @dataclass 
@@ -37,4 +62,5 @@ class Transition:
     click_landmark: Optional[str] = None  # Text to find and click
     click_region: Optional[Region] = None  # Or click a fixed region
     wait_for: Optional[str] = None  # Screen name to wait for
-    timeout: float = 5.0
\ No newline at end of file
+    timeout: float = 5.0
+    fallback_point: Optional[Tuple[int, int]] = None  # Clicked if the landmark isn't found
\ No newline at end of file
@@ -1,12 +1,21 @@
 from typing import Dict, Tuple, Optional
 
-from game_automator.core.capture import capture_window
-from game_automator.core.ocr import find_text
+from game_automator.core import metrics, recorder
 from game_automator.core.input import click_in_window, click_region_center
-from game_automator.engine.models import Screen, Transition
+from game_automator.core.trace import traced
+from game_automator.engine.frame import Frame, capture_frame
+from game_automator.engine.models import Screen, Transition, Region
 from game_automator.engine.state import identify_screen, wait_for_screen
 
+NAVIGATIONS = metrics.counter(
+    "navigations_total",
+    "navigate() calls, by outcome (ok, unknown_screen, no_transition, landmark_not_found, timeout).",
+    ["outcome"],
+)
+NAVIGATION_FALLBACKS = metrics.counter("navigation_fallbacks_total", "Fallback clicks used because OCR missed a landmark.")
 
+
+@traced("engine.navigate")
 def navigate(
     window: dict,
     screens: Dict[str, Screen],
@@ -17,27 +26,40 @@ def navigate(
     Navigate from current screen to target screen.
     Returns True if successful, False otherwise.
     """
-    current = identify_screen(window, screens)
+    frame = capture_frame(window)
+    current = identify_screen(window, screens, frame)
     
     if current is None:
         print("[NAV] Could not identify current screen")
+        NAVIGATIONS.inc(outcome="unknown_screen")
         return False
     
     if current == target:
+        NAVIGATIONS.inc(outcome="ok")
         return True
     
     transition_key = (current, target)
     if transition_key not in transitions:
         print(f"[NAV] No transition defined from '{current}' to '{target}'")
+        NAVIGATIONS.inc(outcome="no_transition")
         return False
     
     transition = transitions[transition_key]
+    recorder.record("navigate", source=current, target=target)
     
-    # Execute the click
+    # Execute the click, reusing the frame (and its OCR) from identification
     if transition.click_landmark:
-        if not click_landmark(window, transition.click_landmark):
-            print(f"[NAV] Could not find landmark '{transition.click_landmark}'")
-            return False
+        region = landmark_region(screens[current], transition.click_landmark)
+        if not click_landmark(window, transition.click_landmark, frame=frame, region=region):
+            if transition.fallback_point is None:
+                print(f"[NAV] Could not find landmark '{transition.click_landmark}'")
+                NAVIGATIONS.inc(outcome="landmark_not_found")
+                return False
+            print(f"[NAV] Could not find landmark '{transition.click_landmark}', using its fallback position")
+            recorder.record("click", x=transition.fallback_point[0], y=transition.fallback_point[1],
+                            fallback_for=transition.click_landmark)
+            NAVIGATION_FALLBACKS.inc()
+            click_in_window(window, *transition.fallback_point)
     elif transition.click_region:
         click_region_center(window, transition.click_region.as_tuple())
     
@@ -48,27 +70,50 @@ def navigate(
         target_screen = target
     
     if wait_for_screen(window, screens, target_screen, transition.timeout):
+        NAVIGATIONS.inc(outcome="ok")
         return True
     else:
         print(f"[NAV] Timeout waiting for screen '{target_screen}'")
+        NAVIGATIONS.inc(outcome="timeout")
+        recorder.record("navigate_timeout", source=current, target=target_screen, timeout=transition.timeout)
+        recorder.dump(f"navigation timeout: '{current}' -> '{target_screen}'")
         return False
 
 
-def click_landmark(window: dict, text: str) -> bool:
+def landmark_region(screen: Screen, text: str) -> Optional[Region]:
+    """Return the known region of a screen's landmark with this text, if any."""
+    for landmark in screen.landmarks:
+        if landmark.text.lower() == text.lower():
+            return landmark.region
+    return None
+
+
+@traced("engine.click_landmark")
+def click_landmark(
+    window: dict,
+    text: str,
+    frame: Optional[Frame] = None,
+    region: Optional[Region] = None
+) -> bool:
     """
     Find text on screen and click it.
+    Reuses the given frame's OCR results if the window still looks the
+    same, otherwise uses a new capture. The search is restricted to region if given.
     Returns True if found and clicked, False otherwise.
     """
-    image = capture_window(window)
-    result = find_text(image, text)
+    frame = capture_frame(window) if frame is None else frame.refreshed(window)
+    
+    result = frame.find_text(text, region)
     
     if result is None:
+        recorder.record("click_landmark", text=text, found=False)
         return False
     
     # Click center of the found text
     bbox = result["bbox"]
     center_x = bbox[0] + bbox[2] // 2
     center_y = bbox[1] + bbox[3] // 2
+    recorder.record("click_landmark", text=text, found=True, x=center_x, y=center_y)
     
     click_in_window(window, center_x, center_y)
     return True
\ No newline at end of file
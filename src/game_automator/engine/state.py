@@ -1,40 +1,39 @@
+import time
 from typing import Dict, Optional
-from PIL import Image
 
-from game_automator.core.ocr import extract_text, find_text
-from game_automator.core.capture import capture_window, capture_region
+from game_automator.core.capture import wait_for_change
+from game_automator.core.trace import traced
+from game_automator.engine.frame import Frame, capture_frame
 from game_automator.engine.models import Screen, Region
 
 
-def identify_screen(window: dict, screens: Dict[str, Screen]) -> Optional[str]:
+@traced("engine.identify_screen")
+def identify_screen(
+    window: dict,
+    screens: Dict[str, Screen],
+    frame: Optional[Frame] = None
+) -> Optional[str]:
     """
     Identify which screen we're currently on by checking landmarks.
+    Uses the given frame if provided, otherwise captures a new one.
+    OCR results are cached on the frame for reuse by later lookups.
     Returns screen name or None if no match.
     """
-    image = capture_window(window)
+    if frame is None:
+        frame = capture_frame(window)
     
     for screen_name, screen in screens.items():
-        if _screen_matches(image, window, screen):
+        if _screen_matches(frame, screen):
             return screen_name
     
     return None
 
 
-def _screen_matches(image: Image.Image, window: dict, screen: Screen) -> bool:
+def _screen_matches(frame: Frame, screen: Screen) -> bool:
     """Check if all landmarks for a screen are present."""
     for landmark in screen.landmarks:
-        if landmark.region:
-            # Search within specific region
-            region_img = image.crop((
-                landmark.region.x,
-                landmark.region.y,
-                landmark.region.x + landmark.region.width,
-                landmark.region.y + landmark.region.height,
-            ))
-            text = extract_text(region_img)
-        else:
-            # Search entire screen
-            text = extract_text(image)
+        # Search within the landmark's region, or the entire screen if None
+        text = frame.text(landmark.region)
         
         if landmark.text.lower() not in text.lower():
             return False
@@ -42,24 +41,32 @@ def _screen_matches(image: Image.Image, window: dict, screen: Screen) -> bool:
     return True
 
 
+@traced("engine.wait_for_screen")
 def wait_for_screen(
     window: dict, 
     screens: Dict[str, Screen], 
     target: str, 
     timeout: float = 5.0,
-    poll_interval: float = 0.5
+    poll_interval: float = 0.1
 ) -> bool:
     """
     Wait for a specific screen to appear.
+    Screen identification (OCR) only runs when the frame has changed since
+    the last evaluated one; static screens just poll a cheap pixel signature.
     Returns True if screen appeared, False if timeout.
     """
-    import time
+    deadline = time.time() + timeout
+    last_signature = None
     
-    start = time.time()
-    while time.time() - start < timeout:
-        current = identify_screen(window, screens)
-        if current == target:
-            return True
-        time.sleep(poll_interval)
-    
-    return False
\ No newline at end of file
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return False
+        
+        changed = wait_for_change(window, last_signature, remaining, poll_interval)
+        if changed is None:
+            return False
+        
+        image, last_signature = changed
+        if identify_screen(window, screens, Frame(image)) == target:
+            return True
\ No newline at end of file
@@ -1,16 +1,17 @@
-import threading
+from typing import Optional
+
 from pynput import keyboard
 
-from game_automator.workflows import discover_workflows
+from game_automator.core import metrics
+from game_automator.daemon import client_target
+from game_automator.scheduler import JobRejected, Scheduler
 
 
 class HotkeyListener:
     """Listens for global hotkeys to trigger workflows."""
     
     def __init__(self):
-        self.workflows = discover_workflows()
-        self.running = False
-        self.current_workflow = None
+        self.scheduler = Scheduler()
         self.listener = None
     
     def start(self):
@@ -22,8 +23,6 @@ class HotkeyListener:
         print()
         print("Waiting for hotkey...")
         
-        self.running = True
-        
         with keyboard.Listener(on_press=self.on_press) as listener:
             self.listener = listener
             listener.join()
@@ -33,34 +32,48 @@ class HotkeyListener:
             if key == keyboard.Key.f9:
                 self.run_workflow("city-investment-scan")
             elif key == keyboard.Key.f10:
-                print("\n[HOTKEY] Stop requested (not implemented yet)")
+                self.stop_workflow()
             elif key == keyboard.Key.f12:
                 print("\n[HOTKEY] Exiting...")
+                self.scheduler.stop()
                 return False  # Stop listener
         except Exception as e:
             print(f"[ERROR] Hotkey error: {e}")
     
     def run_workflow(self, name: str):
-        if name not in self.workflows:
-            print(f"[ERROR] Unknown workflow: {name}")
-            return
+        target = client_target(name)
         
-        print(f"\n[HOTKEY] Starting workflow: {name}")
-        
-        # Run workflow in a separate thread so hotkeys still work
-        def run():
-            workflow_class = self.workflows[name]
-            workflow = workflow_class()
-            workflow.execute()
-            print("\nWaiting for hotkey...")
+        def run(job):
+            try:
+                return target(job)
+            finally:
+                print("\nWaiting for hotkey...")
         
-        thread = threading.Thread(target=run)
-        thread.start()
-
+        # Runs on a scheduler thread so hotkeys still work; one run at a time
+        try:
+            self.scheduler.submit(name, "hotkey", run)
+        except JobRejected as e:
+            print(f"\n[HOTKEY] Not starting {name}: {e}")
+            return
+        print(f"\n[HOTKEY] Starting workflow: {name}")
+    
+    def stop_workflow(self):
+        jobs = self.scheduler.cancel()
+        if not jobs:
+            print("\n[HOTKEY] Nothing is running")
+            return
+        for job in jobs:
+            print(f"\n[HOTKEY] Stopping {job.name}...")
 
-def main():
+def main(metrics_port: Optional[int] = None):
+    # Runs handed to a daemon are counted by the daemon's own endpoint
+    server = metrics.serve(metrics_port)
     listener = HotkeyListener()
-    listener.start()
+    try:
+        listener.start()
+    finally:
+        if server:
+            server.stop()
 
 
 if __name__ == "__main__":
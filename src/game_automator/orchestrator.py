@@ -0,0 +1,115 @@
+import sys
+import threading
+from typing import Callable, Dict, List, Optional
+
+from game_automator.core.output import LinePrefixer, OutputRouter
+from game_automator.core.window import list_windows
+from game_automator.scheduler import Job, Scheduler
+
+
+def find_windows(title_substring: str) -> List[dict]:
+    """All windows whose title contains the substring, ordered left to right, then top to bottom."""
+    matches = [w for w in list_windows() if title_substring.lower() in w["title"].lower()]
+    return sorted(matches, key=lambda w: (w["x"], w["y"]))
+
+
+class Orchestrator:
+    """
+    Runs a workflow once per matching game window, concurrently.
+    Windows are labelled "1", "2", ... in screen order; each run records
+    under "<workflow>@<label>" (own checkpoint, CSV file and history) and
+    its output lines are prefixed with the label. Prompts are asked one at
+    a time. Input is serialized across runs and focuses the target window
+    first, so windows must not overlap.
+    """
+
+    def __init__(
+        self,
+        workflow_class,
+        options: Optional[Dict] = None,
+        title: Optional[str] = None,
+        ocr_workers: int = 1
+    ):
+        self.workflow_class = workflow_class
+        self.options = options or {}
+        self.title = title or workflow_class.window_title
+        self.ocr_workers = ocr_workers
+        self.scheduler = Scheduler()
+        self.workflows: Dict[str, object] = {}  # Workflow instance per window label
+        self._router: Optional[OutputRouter] = None
+        self._output_lock = threading.Lock()
+        self._prompt_lock = threading.Lock()
+
+    def run(self, resume: bool = False) -> Dict[str, bool]:
+        """Run on every window and wait for all of them. Returns success per window label."""
+        windows = find_windows(self.title)
+        if not windows:
+            print(f"[ERROR] Could not find any window matching '{self.title}'")
+            return {}
+
+        from game_automator.core.ocr import set_ocr_workers
+        set_ocr_workers(self.ocr_workers)
+
+        labelled = [(str(i), window) for i, window in enumerate(windows, start=1)]
+        for label, window in labelled:
+            print(f"[ORCHESTRATOR] Window {label}: {window['title']} at ({window['x']}, {window['y']})")
+
+        self._router = OutputRouter(sys.stdout)
+        sys.stdout = self._router
+        jobs: Dict[str, Job] = {}
+        try:
+            for label, window in labelled:
+                # A single window records under the plain workflow name
+                instance = label if len(windows) > 1 else None
+                jobs[label] = self.scheduler.submit(
+                    f"{self.workflow_class.name}@{label}",
+                    str(window["id"]),
+                    self._target(label, window, instance, resume),
+                )
+            self._wait(jobs.values())
+        finally:
+            sys.stdout = self._router.stream
+
+        for label, job in jobs.items():
+            print(f"[ORCHESTRATOR] Window {label}: {job.status}")
+        return {label: bool(job.success) for label, job in jobs.items()}
+
+    def cancel(self) -> None:
+        self.scheduler.cancel()
+
+    def _wait(self, jobs) -> None:
+        try:
+            for job in jobs:
+                while not job.wait(0.2):
+                    pass
+        except KeyboardInterrupt:
+            print("\n[ORCHESTRATOR] Interrupted, cancelling all windows...")
+            self.cancel()
+            for job in jobs:
+                job.wait()
+
+    def _target(self, label: str, window: dict, instance: Optional[str], resume: bool) -> Callable[[Job], bool]:
+        def run(job: Job) -> bool:
+            sink = LinePrefixer(self._router.stream, f"[{label}] ", self._output_lock)
+            self._router.attach(sink)
+            try:
+                workflow = self.workflow_class(window=window, instance=instance, **self.options)
+                workflow.prompt = self._prompt(label)
+                self.workflows[label] = workflow
+                job.on_cancel = workflow.cancel
+                if job.cancelled.is_set():
+                    workflow.cancel()
+                return workflow.execute(resume=resume)
+            finally:
+                sink.flush()
+                self._router.attach(None)
+        return run
+
+    def _prompt(self, label: str) -> Callable[[str], str]:
+        def prompt(question: str) -> str:
+            with self._prompt_lock:
+                with self._output_lock:
+                    self._router.stream.write(f"[{label}] {question}")
+                    self._router.stream.flush()
+                return sys.stdin.readline().rstrip("\n")
+        return prompt
\ No newline at end of file
@@ -0,0 +1,186 @@
+import itertools
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class JobRejected(Exception):
+    """A job was submitted while another job holds the same window."""
+
+
+class Job:
+    """
+    A workflow run owned by the scheduler.
+    target(job) does the work and returns whether it succeeded; it may
+    set job.on_cancel to hook cancellation (e.g. to BaseWorkflow.cancel).
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name: str, key: str, target: Callable[["Job"], bool]):
+        self.id = next(self._ids)
+        self.name = name
+        self.key = key  # Jobs with the same key (window) never run concurrently
+        self.target = target
+        self.status = "pending"  # pending, running, succeeded, failed, cancelled
+        self.success: Optional[bool] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.on_cancel: Optional[Callable[[], None]] = None
+        self.cancelled = threading.Event()
+        self._done = threading.Event()
+
+    def cancel(self) -> None:
+        """Ask the job to stop at its next cancellation check."""
+        self.cancelled.set()
+        if self.on_cancel is not None:
+            self.on_cancel()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the job to finish. Returns False on timeout."""
+        return self._done.wait(timeout)
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def __repr__(self) -> str:
+        return f"Job({self.id}, {self.name!r}, {self.status})"
+
+
+class Scheduler:
+    """
+    Runs jobs with at most one active job per key (game window), so two
+    runs never fight over the mouse and OCR. Jobs can be cancelled and
+    scheduled to repeat on an interval with jitter.
+    """
+
+    def __init__(self):
+        self._active: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._timers: List[threading.Thread] = []
+
+    def active(self) -> List[Job]:
+        with self._lock:
+            return list(self._active.values())
+
+    def submit(self, name: str, key: str, target: Callable[[Job], bool]) -> Job:
+        """
+        Start a job on its own thread and return it.
+        Raises JobRejected if a job with the same key is still running.
+        """
+        job = self._claim(name, key, target)
+        threading.Thread(target=self._execute, args=(job,), name=f"job-{job.id}", daemon=True).start()
+        return job
+
+    def run(self, name: str, key: str, target: Callable[[Job], bool]) -> Job:
+        """
+        Run a job on the calling thread, with the same single-flight rule
+        as submit(). Returns the finished job.
+        """
+        job = self._claim(name, key, target)
+        self._execute(job)
+        return job
+
+    def cancel(self, key: Optional[str] = None, job_id: Optional[int] = None) -> List[Job]:
+        """Cancel running jobs (all, those for one key, or the one with job_id). Returns them."""
+        with self._lock:
+            jobs = [
+                job for job in self._active.values()
+                if (key is None or job.key == key) and (job_id is None or job.id == job_id)
+            ]
+        for job in jobs:
+            job.cancel()
+        return jobs
+
+    def every(
+        self,
+        interval: float,
+        name: str,
+        key: str,
+        target: Callable[[Job], bool],
+        jitter: float = 0.1,
+        run_now: bool = True
+    ) -> threading.Thread:
+        """
+        Submit a job every `interval` seconds, varied by +/- jitter (a
+        fraction of the interval) so runs don't land at fixed times.
+        A run is skipped if the previous one still holds the window.
+        """
+        def loop():
+            delay = 0.0 if run_now else next_delay()
+            while not self._stop.wait(delay):
+                try:
+                    job = self.submit(name, key, target)
+                    print(f"[SCHEDULER] Started {name} (job {job.id})")
+                except JobRejected as e:
+                    print(f"[SCHEDULER] Skipping {name}: {e}")
+                delay = next_delay()
+                print(f"[SCHEDULER] Next {name} run in {delay / 60:.1f} min")
+
+        def next_delay() -> float:
+            return max(0.0, interval * (1 + random.uniform(-jitter, jitter)))
+
+        thread = threading.Thread(target=loop, name=f"every-{name}", daemon=True)
+        self._timers.append(thread)
+        thread.start()
+        return thread
+
+    def stop(self, cancel: bool = True) -> None:
+        """Stop periodic scheduling and (by default) cancel running jobs."""
+        self._stop.set()
+        if cancel:
+            self.cancel()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait for the currently running jobs to finish."""
+        deadline = None if timeout is None else time.time() + timeout
+        for job in self.active():
+            remaining = None if deadline is None else max(0.0, deadline - time.time())
+            job.wait(remaining)
+
+    def _claim(self, name: str, key: str, target: Callable[[Job], bool]) -> Job:
+        with self._lock:
+            current = self._active.get(key)
+            if current is not None:
+                raise JobRejected(f"{current.name} is already running for '{key}'")
+            job = Job(name, key, target)
+            self._active[key] = job
+            return job
+
+    def _execute(self, job: Job) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.success = bool(job.target(job))
+        except Exception as e:
+            print(f"[ERROR] Job {job.id} ({job.name}) failed: {e}")
+            job.success = False
+        finally:
+            job.finished_at = time.time()
+            if job.cancelled.is_set():
+                job.status = "cancelled"
+            else:
+                job.status = "succeeded" if job.success else "failed"
+            with self._lock:
+                self._active.pop(job.key, None)
+            job._done.set()
+
+
+def workflow_target(
+    workflow_class,
+    options: Optional[Dict] = None,
+    resume: bool = False,
+    prompt: Optional[Callable[[str], str]] = None
+) -> Callable[[Job], bool]:
+    """Job target that runs a workflow in this process, cancellable via the job."""
+    def target(job: Job) -> bool:
+        workflow = workflow_class(**(options or {}))
+        if prompt is not None:
+            workflow.prompt = prompt
+        job.on_cancel = workflow.cancel
+        if job.cancelled.is_set():
+            workflow.cancel()
+        return workflow.execute(resume=resume)
+    return target
\ No newline at end of file
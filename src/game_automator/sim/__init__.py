@@ -0,0 +1,6 @@
+"""Headless simulated game environment for running workflows without the real game."""
+
+from .game import SimulatedGame, SimBuilding
+from .backend import SimulatorBackend, SimulatorDesktop
+from .vision_stub import VisionStub
+from .discord_stub import DiscordStub
\ No newline at end of file
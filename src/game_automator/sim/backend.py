@@ -0,0 +1,121 @@
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+from game_automator.core.backends import Backend
+from game_automator.sim.game import SimulatedGame
+
+
+class SimulatorBackend(Backend):
+    """Serves frames from a SimulatedGame and forwards input to it."""
+    
+    name = "sim"
+    
+    def __init__(self, game: SimulatedGame, title: str = "Shop Titans (simulated)", x: int = 0, y: int = 0):
+        self.game = game
+        self.title = title
+        self.x = x
+        self.y = y
+        self.pointer: Tuple[int, int] = (0, 0)
+        self.frames_captured = 0
+        self._pressed_at: Optional[Tuple[int, int]] = None
+    
+    def list_windows(self) -> List[dict]:
+        return [{
+            "id": 1,
+            "title": self.title,
+            "owner": "simulator",
+            "x": self.x,
+            "y": self.y,
+            "width": self.game.width,
+            "height": self.game.height,
+        }]
+    
+    def grab(self, left: int, top: int, width: int, height: int) -> Image.Image:
+        self.frames_captured += 1
+        frame = self.game.frame()
+        x = left - self.x
+        y = top - self.y
+        if (x, y, width, height) == (0, 0, frame.width, frame.height):
+            return frame.copy()
+        return frame.crop((x, y, x + width, y + height))
+    
+    def move_to(self, x: int, y: int, pause: bool = True) -> None:
+        self.pointer = (x, y)
+    
+    def mouse_down(self, pause: bool = True) -> None:
+        self._pressed_at = self.pointer
+    
+    def mouse_up(self, pause: bool = True) -> None:
+        if self._pressed_at is None:
+            return
+        self._pressed_at = None
+        self.game.click(self.pointer[0] - self.x, self.pointer[1] - self.y)
+    
+    def press(self, key: str, pause: bool = True) -> None:
+        self.game.key(key)
+
+class SimulatorDesktop(Backend):
+    """
+    Several simulated game windows side by side. Captures and clicks are
+    routed by screen coordinates; key presses go to the focused window,
+    as they would on a real desktop.
+    """
+    
+    name = "sim"
+    
+    def __init__(self, games: List[SimulatedGame], title: str = "Shop Titans (simulated)", gap: int = 20):
+        self.windows: List[SimulatorBackend] = []
+        x = 0
+        for i, game in enumerate(games, start=1):
+            self.windows.append(SimulatorBackend(game, f"{title} {i}", x=x, y=0))
+            x += game.width + gap
+        self.focused = self.windows[0]
+        self.pointer: Tuple[int, int] = (0, 0)
+        self._pressed: Optional[SimulatorBackend] = None
+    
+    @property
+    def frames_captured(self) -> int:
+        return sum(window.frames_captured for window in self.windows)
+    
+    def list_windows(self) -> List[dict]:
+        windows = []
+        for window_id, window in enumerate(self.windows, start=1):
+            info = window.list_windows()[0]
+            info["id"] = window_id
+            windows.append(info)
+        return windows
+    
+    def window_at(self, x: int, y: int) -> Optional[SimulatorBackend]:
+        for window in self.windows:
+            if window.x <= x < window.x + window.game.width and window.y <= y < window.y + window.game.height:
+                return window
+        return None
+    
+    def grab(self, left: int, top: int, width: int, height: int) -> Image.Image:
+        window = self.window_at(left, top)
+        if window is None:
+            return Image.new("RGB", (width, height))
+        return window.grab(left, top, width, height)
+    
+    def move_to(self, x: int, y: int, pause: bool = True) -> None:
+        self.pointer = (x, y)
+    
+    def mouse_down(self, pause: bool = True) -> None:
+        self._pressed = self.window_at(*self.pointer)
+        if self._pressed is not None:
+            self._pressed.move_to(*self.pointer)
+            self._pressed.mouse_down()
+    
+    def mouse_up(self, pause: bool = True) -> None:
+        if self._pressed is None:
+            return
+        window, self._pressed = self._pressed, None
+        window.move_to(*self.pointer)
+        window.mouse_up()
+    
+    def press(self, key: str, pause: bool = True) -> None:
+        self.focused.press(key)
+    
+    def focus(self, window: dict) -> None:
+        self.focused = self.windows[window["id"] - 1]
\ No newline at end of file
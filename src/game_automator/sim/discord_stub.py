@@ -0,0 +1,119 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+
+class DiscordStub:
+    """
+    Local stand-in for a Discord webhook.
+    Records posted messages and enforces a rate limit bucket (limit
+    requests per window seconds) with Discord's headers and 429 replies.
+    """
+    
+    def __init__(
+        self,
+        limit: int = 5,
+        window: float = 2.0,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        self.limit = limit
+        self.window = window
+        self.latency = latency
+        self.messages: List[str] = []
+        self.requests = 0
+        self.rate_limited = 0
+        self.rejected = 0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/webhooks/1/stub"
+    
+    def start(self) -> "DiscordStub":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="discord-stub", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self) -> "DiscordStub":
+        return self.start()
+    
+    def __exit__(self, *exc) -> None:
+        self.stop()
+    
+    def _take(self):
+        """Count a request against the bucket. Returns (allowed, remaining, reset_after)."""
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+            if now - self._window_start >= self.window:
+                self._window_start = now
+                self._window_count = 0
+            reset_after = self.window - (now - self._window_start)
+            if self._window_count >= self.limit:
+                self.rate_limited += 1
+                return False, 0, reset_after
+            self._window_count += 1
+            return True, self.limit - self._window_count, reset_after
+    
+    def _handler_class(self):
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                
+                if stub.latency:
+                    time.sleep(stub.latency)
+                
+                allowed, remaining, reset_after = stub._take()
+                headers = {
+                    "X-RateLimit-Bucket": "stub-bucket",
+                    "X-RateLimit-Limit": str(stub.limit),
+                    "X-RateLimit-Remaining": str(remaining),
+                    "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+                }
+                if not allowed:
+                    headers["Retry-After"] = f"{reset_after:.3f}"
+                    self._send(429, {"message": "You are being rate limited.", "retry_after": reset_after}, headers)
+                    return
+                
+                content = body.get("content", "")
+                if not content or len(content) > 2000:
+                    with stub._lock:
+                        stub.rejected += 1
+                    self._send(400, {"message": "Invalid Form Body", "code": 50035}, headers)
+                    return
+                
+                with stub._lock:
+                    stub.messages.append(content)
+                self._send(204, None, headers)
+            
+            def _send(self, status: int, data: Optional[dict], headers: dict) -> None:
+                payload = json.dumps(data).encode("utf-8") if data is not None else b""
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                if payload:
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
\ No newline at end of file
@@ -0,0 +1,271 @@
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+
+BUILDING_NAMES = [
+    "Academy", "Apothecary", "Emerald Inn", "Ether Well", "Garden",
+    "Iron Mine", "Ironwood Sawmill", "Jewel Storehouse", "Jewel Workshop",
+    "Laboratory", "Lumberyard", "Master Lodge", "Mausoleum", "Oil Press",
+    "Smelter", "Smithy", "Summoner's Tent", "Tailor Workshop", "Tannery",
+    "Tavern", "Temple", "Town Hall", "Training Hall", "Weaver Mill",
+    "Wizard Tower", "Wood Workshop",
+]
+
+# Building panels carry a small block of this colour (red channel = building
+# index, blue channel = MARKER_BLUE + game id) so the vision stub can tell
+# which building, in which simulated game, an image shows.
+MARKER_GREEN = 201
+MARKER_BLUE = 99
+MAX_GAMES = 16
+MARKER_SIZE = 4
+
+# Panel area as fractions of the window (left, top, right, bottom)
+PANEL_BOUNDS = (0.04, 0.25, 0.96, 0.65)
+
+# Distinct frames drawn per transition animation
+ANIMATION_STEPS = 6
+
+BACKGROUNDS = {
+    "shop": (92, 64, 51),
+    "city": (60, 110, 70),
+    "panel": (60, 110, 70),
+}
+
+
+@dataclass
+class SimBuilding:
+    """A city building as the simulator shows it."""
+    name: str
+    level: int
+    current: int
+    maximum: int
+
+
+@dataclass
+class _Element:
+    """A piece of on-screen text, optionally clickable."""
+    text: str
+    center: Tuple[float, float]  # Fractions of window size
+    size: int = 28
+    action: Optional[Callable[[], None]] = None
+
+
+def make_buildings(count: int = len(BUILDING_NAMES), seed: int = 0) -> List[SimBuilding]:
+    """Generate a deterministic set of buildings with random investment progress."""
+    rng = random.Random(seed)
+    buildings = []
+    for i in range(count):
+        name = BUILDING_NAMES[i % len(BUILDING_NAMES)]
+        if i >= len(BUILDING_NAMES):
+            name = f"{name} {i // len(BUILDING_NAMES) + 1}"
+        maximum = rng.choice([1000, 2000, 5000])
+        buildings.append(SimBuilding(name, rng.randint(1, 30), rng.randint(0, maximum), maximum))
+    return buildings
+
+
+def _font(size: int) -> ImageFont.ImageFont:
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 only has the fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+class SimulatedGame:
+    """
+    Scripted state machine standing in for the game.
+    Screens: shop -> (City) -> city -> (character) -> panel -> (right/left)
+    -> next/previous building, (X) -> city -> (Shop) -> shop.
+    Inputs take effect after `latency` seconds and transitions animate for
+    `animation` seconds, like the real client.
+    """
+    
+    def __init__(
+        self,
+        buildings: Optional[List[SimBuilding]] = None,
+        width: int = 540,
+        height: int = 960,
+        latency: float = 0.1,
+        animation: float = 0.2,
+        screens_dir: Optional[str] = None,
+        game_id: int = 0
+    ):
+        self.buildings = buildings if buildings is not None else make_buildings()
+        self.width = width
+        self.height = height
+        self.latency = latency
+        self.animation = animation
+        self.screens_dir = screens_dir
+        self.game_id = game_id
+        
+        self.state = "shop"
+        self.index = 0
+        self.clicks = 0
+        self.key_presses = 0
+        
+        self._pending: Optional[Tuple[float, str, int]] = None
+        self._cache: Dict[Tuple[str, int, Optional[int]], Image.Image] = {}
+        self._lock = threading.Lock()
+    
+    # Input
+    
+    def click(self, x: int, y: int) -> None:
+        """Handle a click at window-relative pixel coordinates."""
+        with self._lock:
+            self._settle()
+            self.clicks += 1
+            for element in self._elements(self.state, self.index):
+                if element.action and self._hit(element, x, y):
+                    element.action()
+                    return
+    
+    def key(self, key: str) -> None:
+        """Handle a key press."""
+        with self._lock:
+            self._settle()
+            self.key_presses += 1
+            if self.state != "panel":
+                return
+            if key == "right":
+                self._go("panel", (self.index + 1) % len(self.buildings))
+            elif key == "left":
+                self._go("panel", (self.index - 1) % len(self.buildings))
+            elif key in ("escape", "esc"):
+                self._go("city", self.index)
+    
+    # Output
+    
+    def frame(self) -> Image.Image:
+        """Render what the window currently shows."""
+        with self._lock:
+            self._settle()
+            if self._pending is not None:
+                apply_at, state, index = self._pending
+                elapsed = time.time() - apply_at
+                if elapsed >= 0:
+                    # Mid-animation: the target screen wipes in from the left
+                    step = min(ANIMATION_STEPS - 1, int(elapsed / self.animation * ANIMATION_STEPS))
+                    return self._render(state, index, step)
+            return self._render(self.state, self.index)
+    
+    def render_screen(self, state: str, index: int = 0) -> Image.Image:
+        """Render a settled screen without affecting game state."""
+        return self._render(state, index).copy()
+    
+    def building_at(self, index: int) -> Optional[SimBuilding]:
+        if 0 <= index < len(self.buildings):
+            return self.buildings[index]
+        return None
+    
+    # Internals
+    
+    def _go(self, state: str, index: int) -> None:
+        apply_at = time.time() + self.latency
+        self._pending = (apply_at, state, index)
+    
+    def _settle(self) -> None:
+        if self._pending is None:
+            return
+        apply_at, state, index = self._pending
+        if time.time() >= apply_at + self.animation:
+            self.state, self.index = state, index
+            self._pending = None
+    
+    def _hit(self, element: _Element, x: int, y: int) -> bool:
+        cx = element.center[0] * self.width
+        cy = element.center[1] * self.height
+        half_w = max(len(element.text) * element.size * 0.35, 20)
+        half_h = max(element.size * 0.75, 20)
+        return abs(x - cx) <= half_w and abs(y - cy) <= half_h
+    
+    def _elements(self, state: str, index: int) -> List[_Element]:
+        if state == "shop":
+            return [
+                _Element("Market Square", (0.5, 0.06), 32),
+                _Element("Customers waiting", (0.5, 0.5), 24),
+                _Element("City", (0.13, 0.95), 30, lambda: self._go("city", self.index)),
+            ]
+        
+        if state == "city":
+            elements = [
+                _Element("Hire", (0.8, 0.12), 26),
+                _Element("Shop", (0.13, 0.95), 30, lambda: self._go("shop", self.index)),
+            ]
+            for slot, (cx, cy) in enumerate([(0.25, 0.3), (0.7, 0.45), (0.35, 0.7)]):
+                target = slot % len(self.buildings)
+                level = self.buildings[target].level
+                elements.append(_Element(
+                    f"Lv {level}", (cx, cy), 26,
+                    lambda target=target: self._go("panel", target),
+                ))
+            return elements
+        
+        building = self.buildings[index]
+        return [
+            _Element(building.name, (0.45, 0.31), 34),
+            _Element(f"Lv {building.level}", (0.82, 0.38), 26),
+            _Element("Investment", (0.5, 0.47), 28),
+            _Element(f"{building.current:,}/{building.maximum:,}", (0.5, 0.55), 30),
+            _Element("X", (0.92, 0.28), 30, lambda: self._go("city", self.index)),
+        ]
+    
+    def _render(self, state: str, index: int, step: Optional[int] = None) -> Image.Image:
+        key = (state, index, step)
+        if key not in self._cache:
+            image = self._draw(state, index, animating=step is not None)
+            if step is not None:
+                covered = int(self.width * (1 - (step + 1) / (ANIMATION_STEPS + 1)))
+                ImageDraw.Draw(image).rectangle((self.width - covered, 0, self.width, self.height), fill=(15, 15, 25))
+            self._cache[key] = image
+        return self._cache[key]
+    
+    def _draw(self, state: str, index: int, animating: bool) -> Image.Image:
+        image = self._recorded(state, index)
+        if image is None:
+            image = Image.new("RGB", (self.width, self.height), BACKGROUNDS[state])
+        draw = ImageDraw.Draw(image)
+        
+        if state == "panel":
+            left, top, right, bottom = PANEL_BOUNDS
+            box = (left * self.width, top * self.height, right * self.width, bottom * self.height)
+            draw.rectangle(box, fill=(235, 225, 200), outline=(40, 30, 20), width=3)
+            if animating:
+                return image
+            marker_x = int(box[0]) + 8
+            marker_y = int(box[1]) + 8
+            draw.rectangle(
+                (marker_x, marker_y, marker_x + MARKER_SIZE - 1, marker_y + MARKER_SIZE - 1),
+                fill=(index % 256, MARKER_GREEN, MARKER_BLUE + self.game_id),
+            )
+        elif animating:
+            return image
+        
+        if self.screens_dir is None or state == "panel":
+            # Recorded shop/city screens already contain their own text
+            for element in self._elements(state, index):
+                if element.text == "X":
+                    color = (200, 30, 30)
+                elif state == "panel":
+                    color = (20, 20, 20)
+                else:
+                    color = (250, 250, 250)
+                cx = element.center[0] * self.width
+                cy = element.center[1] * self.height
+                draw.text((cx, cy), element.text, fill=color, font=_font(element.size), anchor="mm")
+        
+        return image
+    
+    def _recorded(self, state: str, index: int) -> Optional[Image.Image]:
+        """Load a recorded screen (shop.png, city.png, panel.png) if one exists."""
+        if self.screens_dir is None:
+            return None
+        path = os.path.join(self.screens_dir, f"{state}.png")
+        if not os.path.exists(path):
+            return None
+        return Image.open(path).convert("RGB").resize((self.width, self.height))
@@ -0,0 +1,124 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Union
+
+from game_automator.core.backends import set_backend
+from game_automator.sim.backend import SimulatorBackend, SimulatorDesktop
+from game_automator.sim.game import SimulatedGame, make_buildings
+from game_automator.sim.vision_stub import VisionStub
+
+
+@contextmanager
+def simulated_environment(games: Union[SimulatedGame, List[SimulatedGame]], vision_latency: float = 0.0):
+    """
+    Route window/capture/input through the simulator (one window per game)
+    and the vision API through a local stub for the duration of the block.
+    Yields (backend, stub).
+    """
+    if isinstance(games, list):
+        backend = SimulatorDesktop(games)
+    else:
+        backend = SimulatorBackend(games)
+    stub = VisionStub(games, latency=vision_latency, batch_delay=vision_latency).start()
+    
+    saved_env = {
+        key: os.environ.get(key)
+        for key in ("ANTHROPIC_BASE_URL", "ANTHROPIC_API_KEY", "DISCORD_WEBHOOK_URL")
+    }
+    os.environ["ANTHROPIC_BASE_URL"] = stub.url
+    os.environ["ANTHROPIC_API_KEY"] = "simulator"
+    os.environ.pop("DISCORD_WEBHOOK_URL", None)
+    set_backend(backend)
+    
+    try:
+        yield backend, stub
+    finally:
+        set_backend(None)
+        stub.stop()
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def run_simulation(
+    workflow_name: str = "city-investment-scan",
+    buildings: int = 26,
+    latency: float = 0.1,
+    animation: float = 0.2,
+    vision_latency: float = 0.5,
+    screens_dir: Optional[str] = None,
+    seed: int = 0,
+    options: Optional[Dict] = None,
+    windows: int = 1
+) -> Dict:
+    """
+    Run a workflow end-to-end against the simulator. With windows > 1,
+    runs it on that many simulated games at once (each with different
+    buildings) through the Orchestrator.
+    Returns timing and correctness figures for the run.
+    """
+    from game_automator.workflows import get_workflow
+    
+    workflow_class = get_workflow(workflow_name)
+    if workflow_class is None:
+        raise ValueError(f"Unknown workflow: {workflow_name}")
+    
+    games = [
+        SimulatedGame(
+            make_buildings(buildings, seed + i),
+            latency=latency,
+            animation=animation,
+            screens_dir=screens_dir,
+            game_id=i,
+        )
+        for i in range(windows)
+    ]
+    
+    with simulated_environment(games if windows > 1 else games[0], vision_latency) as (backend, stub):
+        start = time.perf_counter()
+        if windows > 1:
+            from game_automator.orchestrator import Orchestrator
+            orchestrator = Orchestrator(workflow_class, options)
+            results = orchestrator.run()
+            success = bool(results) and all(results.values())
+            # Windows are labelled left to right, in the order the games were laid out
+            workflows = [orchestrator.workflows.get(str(i)) for i in range(1, windows + 1)]
+        else:
+            workflow = workflow_class(**(options or {}))
+            success = workflow.execute()
+            workflows = [workflow]
+        duration = time.perf_counter() - start
+    
+    recorded = 0
+    correct = 0
+    for game, workflow in zip(games, workflows):
+        expected = {b.name: b for b in game.buildings}
+        rows = getattr(workflow, "collected_data", [])
+        recorded += len(rows)
+        for row in rows:
+            building = expected.get(row.get("building_name"))
+            if (
+                building is not None
+                and str(row.get("current_investment")) == str(building.current)
+                and str(row.get("max_investment")) == str(building.maximum)
+            ):
+                correct += 1
+    
+    return {
+        "workflow": workflow_name,
+        "windows": windows,
+        "success": success,
+        "duration": round(duration, 3),
+        "buildings_expected": sum(len(game.buildings) for game in games),
+        "buildings_recorded": recorded,
+        "buildings_correct": correct,
+        "buildings_per_minute": round(recorded / duration * 60, 2) if duration else 0.0,
+        "frames_captured": backend.frames_captured,
+        "clicks": sum(game.clicks for game in games),
+        "key_presses": sum(game.key_presses for game in games),
+        "vision_requests": stub.requests,
+        "vision_bytes": stub.bytes_received,
+    }
\ No newline at end of file
@@ -0,0 +1,194 @@
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple, Union
+
+from PIL import Image
+
+from game_automator.sim.game import SimulatedGame, MARKER_GREEN, MARKER_BLUE, MAX_GAMES
+
+
+def decode_marker(image: Image.Image) -> Optional[Tuple[int, int]]:
+    """Return (game id, building index) encoded in a simulator panel, or None."""
+    colors = image.convert("RGB").getcolors(maxcolors=image.width * image.height)
+    for _, (red, green, blue) in colors or []:
+        if green == MARKER_GREEN and MARKER_BLUE <= blue < MARKER_BLUE + MAX_GAMES:
+            return blue - MARKER_BLUE, red
+    return None
+
+
+def find_marker(image: Image.Image) -> Optional[int]:
+    """Return the building index encoded in a simulator panel, or None."""
+    marker = decode_marker(image)
+    return marker[1] if marker is not None else None
+
+
+class VisionStub:
+    """
+    Local stand-in for the Anthropic messages API.
+    Answers building extraction prompts for SimulatedGame screenshots
+    (of one game or several, told apart by their game id), after an
+    optional artificial latency. Message batches are answered too: a
+    batch ends batch_delay seconds after it was submitted.
+    """
+    
+    def __init__(
+        self,
+        games: Union[SimulatedGame, List[SimulatedGame]],
+        latency: float = 0.0,
+        batch_delay: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        self.games = games if isinstance(games, list) else [games]
+        self.game = self.games[0]
+        self.latency = latency
+        self.batch_delay = batch_delay
+        self.requests = 0
+        self.bytes_received = 0
+        self.batches: Dict[str, Dict] = {}  # Batch id -> {"created", "results"}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "VisionStub":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="vision-stub", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self) -> "VisionStub":
+        return self.start()
+    
+    def __exit__(self, *exc) -> None:
+        self.stop()
+    
+    def answer(self, payload: dict) -> str:
+        """Produce the model's text reply for a messages payload."""
+        for message in payload.get("messages", []):
+            for block in message.get("content", []):
+                if block.get("type") != "image":
+                    continue
+                data = base64.b64decode(block["source"]["data"])
+                marker = decode_marker(Image.open(BytesIO(data)))
+                building = self._building(*marker) if marker is not None else None
+                if building is not None:
+                    return f"{building.name}|{building.level}|{building.current:,}|{building.maximum:,}"
+        return "NOT_FOUND"
+    
+    def submit_batch(self, payload: dict) -> dict:
+        """Answer every request of a batch now; the batch reports them once it has ended."""
+        results = []
+        for request in payload.get("requests", []):
+            results.append({
+                "custom_id": request["custom_id"],
+                "result": {
+                    "type": "succeeded",
+                    "message": {
+                        "type": "message",
+                        "role": "assistant",
+                        "content": [{"type": "text", "text": self.answer(request["params"])}],
+                    },
+                },
+            })
+        with self._lock:
+            batch_id = f"msgbatch_{len(self.batches) + 1:04d}"
+            self.batches[batch_id] = {"created": time.time(), "results": results}
+        return self.batch_status(batch_id)
+    
+    def batch_status(self, batch_id: str) -> Optional[dict]:
+        """The batch object, as the batches API returns it."""
+        batch = self.batches.get(batch_id)
+        if batch is None:
+            return None
+        ended = time.time() - batch["created"] >= self.batch_delay
+        count = len(batch["results"])
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else count,
+                "succeeded": count if ended else 0,
+                "errored": 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "results_url": f"{self.url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+    
+    def _building(self, game_id: int, index: int):
+        for game in self.games:
+            if game.game_id == game_id:
+                return game.building_at(index)
+        return None
+    
+    def _handler_class(self):
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                with stub._lock:
+                    stub.requests += 1
+                    stub.bytes_received += length
+                
+                path = self.path.rstrip("/")
+                if path == "/v1/messages/batches":
+                    self._send(200, stub.submit_batch(json.loads(body)))
+                    return
+                if path != "/v1/messages":
+                    self._send(404, {"type": "error", "error": {"type": "not_found_error"}})
+                    return
+                
+                if stub.latency:
+                    time.sleep(stub.latency)
+                
+                text = stub.answer(json.loads(body))
+                self._send(200, {
+                    "type": "message",
+                    "role": "assistant",
+                    "content": [{"type": "text", "text": text}],
+                })
+            
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                parts = self.path.rstrip("/").split("/")
+                batch = stub.batch_status(parts[4]) if parts[:4] == ["", "v1", "messages", "batches"] and len(parts) > 4 else None
+                if batch is None:
+                    self._send(404, {"type": "error", "error": {"type": "not_found_error"}})
+                elif len(parts) == 5:
+                    self._send(200, batch)
+                elif parts[5:] == ["results"] and batch["processing_status"] == "ended":
+                    lines = "\n".join(json.dumps(result) for result in stub.batches[parts[4]]["results"])
+                    self._send_bytes(200, (lines + "\n").encode("utf-8"), "application/x-jsonl")
+                else:
+                    self._send(404, {"type": "error", "error": {"type": "not_found_error"}})
+            
+            def _send(self, status: int, data: dict) -> None:
+                self._send_bytes(status, json.dumps(data).encode("utf-8"), "application/json")
+            
+            def _send_bytes(self, status: int, payload: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
\ No newline at end of file
@@ -0,0 +1,165 @@
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from PIL import Image
+
+from game_automator.core.capture import capture_region, frame_signature, frames_differ
+from game_automator.engine.models import Region
+
+WATCH_COLUMNS = ["name", "value", "previous", "text"]
+
+
+def parse_region(spec: str, window: dict) -> Region:
+    """
+    Parse "X,Y,WIDTH,HEIGHT" relative to the window: pixels, or fractions
+    of the window size if every value is at most 1.
+    """
+    try:
+        values = [float(part) for part in spec.split(",")]
+    except ValueError:
+        values = []
+    if len(values) != 4:
+        raise ValueError(f"expected X,Y,WIDTH,HEIGHT, got '{spec}'")
+    if all(0 <= v <= 1 for v in values):
+        return Region.scaled(tuple(values), window["width"], window["height"])
+    return Region(*(int(v) for v in values))
+
+
+class RegionWatcher:
+    """
+    Samples a window region at a fixed rate and reads it with OCR only when
+    its pixels have changed and settled (two samples alike), so a static
+    screen costs one small capture and thumbnail comparison per sample.
+    Each time the value read changes, a change event is passed to every
+    handler.
+    """
+
+    def __init__(
+        self,
+        window: dict,
+        region: Region,
+        name: str = "value",
+        interval: float = 1.0,
+        pattern: Optional[str] = None
+    ):
+        self.window = window
+        self.region = region
+        self.name = name
+        self.interval = interval
+        self.pattern = re.compile(pattern) if pattern else None
+        self.handlers: List[Callable[[Dict], None]] = []
+        self.value: Optional[str] = None
+        self.samples = 0
+        self.reads = 0
+        self._previous: Optional[Image.Image] = None  # Signature of the last sample
+        self._read: Optional[Image.Image] = None  # Signature of the last sample read with OCR
+
+    def parse(self, text: str) -> Optional[str]:
+        """
+        Value shown in the OCR text: the pattern's first group (or whole
+        match) if a pattern is set, otherwise the text itself.
+        """
+        if self.pattern is None:
+            return text or None
+        match = self.pattern.search(text)
+        if match is None:
+            return None
+        return match.group(1) if match.groups() else match.group(0)
+
+    def sample(self) -> Optional[Dict]:
+        """Take one sample. Returns the change event if the value changed."""
+        image = capture_region(self.window, self.region.as_tuple())
+        signature = frame_signature(image)
+        self.samples += 1
+
+        changed = frames_differ(self._read, signature)
+        settled = self._read is None or not frames_differ(self._previous, signature)
+        self._previous = signature
+        if not (changed and settled):
+            return None
+
+        from game_automator.core.ocr import extract_text
+
+        self._read = signature
+        self.reads += 1
+        text = extract_text(image).strip()
+        value = self.parse(text)
+        if value is None or value == self.value:
+            return None
+
+        event = {
+            "name": self.name,
+            "value": value,
+            "previous": self.value,
+            "text": text,
+            "timestamp": time.time(),
+        }
+        self.value = value
+        for handler in self.handlers:
+            handler(event)
+        return event
+
+    def run(self, stop: Optional[threading.Event] = None, duration: Optional[float] = None) -> None:
+        """Sample every interval until stopped (or for duration seconds)."""
+        stop = stop or threading.Event()
+        deadline = time.monotonic() + duration if duration else None
+        next_sample = time.monotonic()
+        while not stop.is_set():
+            self.sample()
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                break
+            # Fixed rate, but don't try to catch up after a slow read
+            next_sample = max(next_sample + self.interval, now)
+            wait = next_sample - now
+            if deadline is not None:
+                wait = min(wait, deadline - now)
+            stop.wait(wait)
+
+
+class StorageSink:
+    """Writes change events to a CSV file and the history store ("watch-<name>")."""
+
+    def __init__(self, name: str):
+        from game_automator.core.history import HistoryStore
+        from game_automator.core.storage import CSVStorage
+
+        self.record_name = f"watch-{name}"
+        # Changes are rare, so write each one straight away
+        self.storage = CSVStorage(self.record_name, WATCH_COLUMNS, flush_rows=1)
+        self.history = HistoryStore(flush_rows=1)
+        self.run_id = self.history.start_run(self.record_name, source=os.path.abspath(self.storage.get_filepath()))
+
+    def __call__(self, event: Dict) -> None:
+        row = {key: event[key] for key in WATCH_COLUMNS}
+        self.storage.write_row(timestamp=datetime.fromtimestamp(event["timestamp"]).isoformat(), **row)
+        self.history.add(self.run_id, self.record_name, event["name"], event["timestamp"], row)
+
+    def close(self) -> None:
+        self.storage.close()
+        self.history.close()
+
+
+class DiscordSink:
+    """
+    Queues change events for Discord. Changes that arrive faster than they
+    can be delivered are merged, so the channel always gets the latest value.
+    """
+
+    def __init__(self, name: str, webhook_url: str):
+        self.key = f"watch-{name}"
+        self.webhook_url = webhook_url
+
+    def __call__(self, event: Dict) -> None:
+        from game_automator.core.outbox import queue_report
+
+        stamp = datetime.fromtimestamp(event["timestamp"]).strftime("%H:%M:%S")
+        if event["previous"] is None:
+            message = f"👁️ **{event['name']}**: {event['value']} ({stamp})"
+        else:
+            message = f"👁️ **{event['name']}**: {event['previous']} → {event['value']} ({stamp})"
+        queue_report(self.key, self.webhook_url, [message])
\ No newline at end of file
@@ -0,0 +1,188 @@
+import asyncio
+import random
+from abc import abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+from PIL import Image
+
+from game_automator.core.capture import capture_window, capture_region
+from game_automator.core.executor import InputHandle
+from game_automator.core.ocr import extract_text, extract_text_with_positions
+from game_automator.core.vision import VisionBatchClient, extract_all_buildings_shared
+from game_automator.core.trace import span
+from game_automator.engine.models import Region
+from game_automator.workflows.base import BaseWorkflow
+
+
+class AsyncBaseWorkflow(BaseWorkflow):
+    """
+    Base class for workflows written as coroutines.
+
+    Subclasses implement run_async() instead of run(). run() drives it on
+    an event loop owned by the run, so execute(), checkpoints, the flight
+    recorder, cancellation and the daemon/scheduler work exactly as for
+    BaseWorkflow. The a-prefixed helpers are awaitable: capture, OCR and
+    storage run on worker threads, vision requests on the shared vision
+    client and input on the input executor. Independent steps can then
+    overlap, e.g. OCR of the current frame while the next key press
+    animates:
+
+        handle = self.press_async("right")
+        name, frame = await asyncio.gather(self.aread_text(current), self.await_change(handle))
+
+    The synchronous BaseWorkflow helpers remain available but block the
+    loop while they run.
+    """
+
+    def __init__(self, window: Optional[dict] = None, instance: Optional[str] = None, **options):
+        super().__init__(window, instance, **options)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._cancelled: Optional[asyncio.Event] = None  # Loop-side mirror of cancel_requested
+
+    @abstractmethod
+    async def run_async(self) -> None:
+        """Main workflow logic. Subclasses must implement this."""
+        pass
+
+    def run(self) -> None:
+        asyncio.run(self._run_async())
+
+    async def _run_async(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._cancelled = asyncio.Event()
+        if self.cancel_requested.is_set():
+            self._cancelled.set()
+        try:
+            await self.run_async()
+        finally:
+            self._loop = None
+
+    def cancel(self) -> None:
+        super().cancel()
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._cancelled.set)
+            except RuntimeError:
+                pass  # Loop already closed
+
+    async def to_thread(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking call on a worker thread. The caller's context goes
+        with it, so trace spans, flight recorder events and printed output
+        (the orchestrator's window prefix, the daemon client's log) are
+        attributed to this workflow.
+        """
+        self.check_cancelled()
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    # Capture and OCR
+
+    async def acapture(self) -> Image.Image:
+        """Capture the full game window."""
+        return await self.to_thread(capture_window, self.window)
+
+    async def acapture_region(self, region: Region) -> Image.Image:
+        """Capture a specific region."""
+        return await self.to_thread(capture_region, self.window, region.as_tuple())
+
+    async def aread_text(self, image: Image.Image) -> str:
+        """Extract text from an already captured image."""
+        return await self.to_thread(extract_text, image)
+
+    async def aget_text(self, region: Optional[Region] = None) -> str:
+        """Extract text from region or full screen."""
+        image = await (self.acapture_region(region) if region else self.acapture())
+        return await self.aread_text(image)
+
+    async def aget_text_with_positions(self, region: Optional[Region] = None) -> List[dict]:
+        """Extract text with bounding boxes."""
+        image = await (self.acapture_region(region) if region else self.acapture())
+        return await self.to_thread(extract_text_with_positions, image)
+
+    async def aextract_buildings(self, images: List) -> List[Optional[Dict]]:
+        """Extract building info with Claude vision, without blocking the loop."""
+        self.check_cancelled()
+        return await extract_all_buildings_shared(images)
+
+    async def await_vision_batch(self, client: VisionBatchClient, batch_id: str, timeout: float) -> Dict:
+        """
+        Poll a vision batch until it has ended, backing off between polls.
+        Returns the ended batch object; cancelling the workflow stops the wait.
+        """
+        for delay in client.poll_delays(timeout):
+            await self.asleep(delay, randomize=False)
+            batch = await self.to_thread(client.poll, batch_id)
+            if batch is not None:
+                return batch
+        raise client.timed_out(batch_id, timeout)
+
+    # Input and navigation
+
+    async def await_handle(self, handle: InputHandle) -> None:
+        """Wait until a queued input action has been performed."""
+        await self.to_thread(handle.wait)
+
+    async def await_change(self, handle: InputHandle, timeout: float = 2.0, settle: float = 0.15) -> Optional[Image.Image]:
+        """
+        Wait until the window changes after a queued action and settles.
+        Returns the resulting frame, or None on timeout.
+        """
+        return await self.to_thread(handle.wait_for_change, timeout, settle)
+
+    async def aclick(self, x: int, y: int) -> None:
+        """Click at window-relative coordinates."""
+        await self.await_handle(self.click_async(x, y))
+
+    async def apress(self, key: str) -> None:
+        """Press a key in the game window."""
+        await self.await_handle(self.press_async(key))
+
+    async def afind_and_click(self, text: str, region: Optional[Region] = None) -> bool:
+        """Find text on screen (optionally within a region) and click it."""
+        return await self.to_thread(self.find_and_click, text, region)
+
+    async def aclick_fallback(self, landmark: str) -> bool:
+        """Click the fallback position of the transition that clicks this landmark."""
+        return await self.to_thread(self.click_fallback, landmark)
+
+    async def aclick_point(self, screen: str, point: str) -> None:
+        """Click a screen's named point."""
+        await self.aclick(*self.layout().point(screen, point))
+
+    async def anavigate_to(self, target: str) -> bool:
+        """Navigate to a target screen."""
+        return await self.to_thread(self.navigate_to, target)
+
+    async def acurrent_screen(self) -> Optional[str]:
+        """Identify the current screen."""
+        return await self.to_thread(self.current_screen)
+
+    async def aask(self, question: str) -> str:
+        """Ask the user a question and return their answer."""
+        return await self.to_thread(self.ask, question)
+
+    async def asleep(self, seconds: float, randomize: bool = True) -> None:
+        """Sleep with optional randomization. Returns early if the workflow is cancelled."""
+        if randomize:
+            seconds = seconds + random.uniform(0, seconds * 0.2)
+        with span("workflow.sleep", "sleep"):
+            try:
+                await asyncio.wait_for(self._cancelled.wait(), seconds)
+            except asyncio.TimeoutError:
+                pass
+        self.check_cancelled()
+
+    # Storage
+
+    async def awrite_row(self, **data) -> None:
+        """Write a row to the CSV output and the history store."""
+        await self.awrite_rows([data])
+
+    async def awrite_rows(self, rows: List[Dict]) -> None:
+        """Write several rows to the CSV output and the history store."""
+        await self.to_thread(self.write_rows, rows)
+
+    async def asave_checkpoint(self, step: str, **data) -> None:
+        """Persist progress so a failed run can be resumed from this step."""
+        await self.to_thread(self.save_checkpoint, step, **data)
\ No newline at end of file
@@ -1,18 +1,42 @@
+import os
+import sys
 import time
 import random
-from typing import Dict, List, Tuple, Optional
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple, Optional
 from abc import ABC, abstractmethod
 
 from game_automator.core.window import find_window
 from game_automator.core.capture import capture_window, capture_region
 from game_automator.core.ocr import extract_text, extract_text_with_positions, find_text
 from game_automator.core.input import click_in_window, humanized_click_in_window, click_region_center
+from game_automator.core.executor import InputHandle, get_executor
 from game_automator.core.storage import CSVStorage
+from game_automator.core.history import HistoryStore
+from game_automator.core.checkpoint import Checkpoint
+from game_automator.core import metrics, recorder
+from game_automator.core.recorder import FlightRecorder
+from game_automator.core.trace import span
 from game_automator.engine.models import Screen, Transition, Region
+from game_automator.engine.definitions import Layout, ScreenDefinitions, load_definitions
 from game_automator.engine.state import identify_screen, wait_for_screen
 from game_automator.engine.navigator import navigate, click_landmark
 
 
+WORKFLOW_RUNS = metrics.counter(
+    "workflow_runs_total",
+    "Finished workflow runs, by workflow and outcome (success, failed, cancelled, error).",
+    ["workflow", "outcome"],
+)
+WORKFLOW_SECONDS = metrics.histogram("workflow_run_seconds", "Duration of workflow runs.", ["workflow"])
+WORKFLOWS_RUNNING = metrics.gauge("workflows_running", "Workflow runs in progress.")
+
+
+class WorkflowCancelled(Exception):
+    """Raised inside a workflow when it has been asked to stop."""
+
+
 class BaseWorkflow(ABC):
     """Base class for all workflows."""
     
@@ -20,20 +44,38 @@ class BaseWorkflow(ABC):
     name: str = "base"
     description: str = "Base workflow"
     csv_columns: List[str] = []
+    entity_column: Optional[str] = None  # Column identifying an entity in the history store
     window_title: str = "Shop Titans"
     
-    # Screen and transition definitions
+    # Screen and transition definitions: a YAML file (path relative to the
+    # workflow's module) compiled per window size, or these dicts in pixels
+    screen_file: Optional[str] = None
     screens: Dict[str, Screen] = {}
     transitions: Dict[Tuple[str, str], Transition] = {}
     
-    def __init__(self):
-        self.window: Optional[dict] = None
+    def __init__(self, window: Optional[dict] = None, instance: Optional[str] = None, **options):
+        self.options = options  # Workflow-specific settings, e.g. from `run -o key=value`
+        self.window: Optional[dict] = window  # Found by title in setup() unless given
+        self.instance = instance  # Label of the game window when running one per window
+        self.record_name = f"{self.name}@{instance}" if instance else self.name
         self.storage: Optional[CSVStorage] = None
+        self.history: Optional[HistoryStore] = None
+        self.run_id: Optional[int] = None
+        self.checkpoint = Checkpoint(self.record_name)
+        self.resumed: Dict = {}  # Checkpoint state when resuming, else empty
+        self.prompt: Callable[[str], str] = input  # Replaced when run for a daemon client
+        self.cancel_requested = threading.Event()
+        self.recorder: Optional[FlightRecorder] = None
+        self.definitions: Optional[ScreenDefinitions] = None
+        if self.screen_file:
+            module_dir = os.path.dirname(sys.modules[type(self).__module__].__file__)
+            self.definitions = load_definitions(os.path.join(module_dir, self.screen_file))
     
     def setup(self) -> bool:
         """Initialize the workflow. Returns True if successful."""
         # Find game window
-        self.window = find_window(self.window_title)
+        if self.window is None:
+            self.window = find_window(self.window_title)
         if not self.window:
             print(f"[ERROR] Could not find window '{self.window_title}'")
             return False
@@ -42,8 +84,11 @@ class BaseWorkflow(ABC):
         
         # Initialize CSV storage
         if self.csv_columns:
-            self.storage = CSVStorage(self.name, self.csv_columns)
+            self.storage = CSVStorage(self.record_name, self.csv_columns)
             print(f"[INFO] Output file: {self.storage.get_filepath()}")
+            self.history = HistoryStore()
+            # Keyed by the CSV file, so 'history import' doesn't import this run again
+            self.run_id = self.history.start_run(self.record_name, source=os.path.abspath(self.storage.get_filepath()))
         
         return True
     
@@ -52,46 +97,172 @@ class BaseWorkflow(ABC):
         """Main workflow logic. Subclasses must implement this."""
         pass
     
-    def execute(self) -> bool:
-        """Run the full workflow with setup and teardown."""
+    def execute(self, resume: bool = False) -> bool:
+        """
+        Run the full workflow with setup and teardown.
+        With resume=True, continue from the last checkpoint if there is one;
+        otherwise any old checkpoint is discarded.
+        """
         print(f"[INFO] Starting workflow: {self.name}")
         
-        if not self.setup():
-            return False
+        if resume:
+            self.resumed = self.checkpoint.load()
+            if self.resumed:
+                print(f"[INFO] Resuming from checkpoint at step '{self.resumed['step']}'")
+            else:
+                print("[INFO] No checkpoint found, starting from the beginning")
+        else:
+            self.checkpoint.clear()
+        
+        # Recent frames and actions, written out if the run fails (0 frames disables it)
+        max_frames = int(self.option("flight_frames", 30))
+        self.recorder = FlightRecorder(self.record_name, max_frames=max_frames) if max_frames > 0 else None
+        token = recorder.activate(self.recorder)
+        WORKFLOWS_RUNNING.inc()
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            success = self._execute()
+            outcome = "success" if success else ("cancelled" if self.cancel_requested.is_set() else "failed")
+            return success
+        finally:
+            WORKFLOWS_RUNNING.dec()
+            WORKFLOW_SECONDS.observe(time.perf_counter() - start, workflow=self.name)
+            WORKFLOW_RUNS.inc(workflow=self.name, outcome=outcome)
+            recorder.deactivate(token)
+    
+    def _execute(self) -> bool:
+        with span("workflow.setup"):
+            if not self.setup():
+                return False
         
         try:
-            self.run()
+            with span("workflow.run", workflow=self.name):
+                self.run()
+            self.checkpoint.clear()
             print(f"[INFO] Workflow complete")
             return True
         except KeyboardInterrupt:
             print(f"\n[INFO] Workflow interrupted by user")
+            self.report_checkpoint()
+            return False
+        except WorkflowCancelled:
+            print(f"[INFO] Workflow cancelled")
+            self.report_checkpoint()
             return False
         except Exception as e:
             print(f"[ERROR] Workflow failed: {e}")
+            recorder.record("error", error=f"{type(e).__name__}: {e}")
             self.save_debug_screenshot()
+            self.dump_recording(f"{type(e).__name__}: {e}")
+            self.report_checkpoint()
             raise
+        finally:
+            self.teardown()
+    
+    def teardown(self) -> None:
+        """Release resources held by the workflow. Always runs after run()."""
+        if self.storage:
+            self.storage.close()
+        if self.history:
+            self.history.close()
+    
+    def cancel(self) -> None:
+        """
+        Ask the workflow to stop. Cancellation is cooperative: the workflow
+        stops at its next sleep, capture or input.
+        """
+        self.cancel_requested.set()
+    
+    def check_cancelled(self) -> None:
+        """Raise WorkflowCancelled if the workflow has been asked to stop."""
+        if self.cancel_requested.is_set():
+            raise WorkflowCancelled()
+    
+    def report_checkpoint(self) -> None:
+        if self.checkpoint.exists():
+            print(f"[INFO] Progress saved. Run again with --resume to continue from the last checkpoint")
     
     # Helper methods for subclasses
     
+    def save_checkpoint(self, step: str, **data) -> None:
+        """Persist progress so a failed run can be resumed from this step."""
+        recorder.record("checkpoint", step=step)
+        self.checkpoint.save(step, **data)
+    
+    def dump_recording(self, reason: str) -> Optional[str]:
+        """Write the flight recorder's recent frames and events to a zip archive."""
+        return recorder.dump(reason)
+    
+    def option(self, name: str, default=None):
+        """Get a workflow option."""
+        return self.options.get(name, default)
+    
+    def ask(self, question: str) -> str:
+        """Ask the user a question and return their answer."""
+        answer = self.prompt(question)
+        recorder.record("prompt", question=question, answer=answer)
+        return answer
+    
+    def layout(self, size: Optional[Tuple[int, int]] = None) -> Optional[Layout]:
+        """
+        Screen definitions compiled for a size (default: the window's).
+        Compiled once per size, so this is cheap to call.
+        """
+        if self.definitions is None:
+            return None
+        width, height = size or (self.window["width"], self.window["height"])
+        return self.definitions.compile(width, height)
+    
+    def screen_map(self) -> Dict[str, Screen]:
+        layout = self.layout()
+        return layout.screens if layout else self.screens
+    
+    def transition_map(self) -> Dict[Tuple[str, str], Transition]:
+        layout = self.layout()
+        return layout.transitions if layout else self.transitions
+    
     def current_screen(self) -> Optional[str]:
         """Identify the current screen."""
-        return identify_screen(self.window, self.screens)
+        return identify_screen(self.window, self.screen_map())
     
     def wait_for(self, screen_name: str, timeout: float = 5.0) -> bool:
         """Wait for a specific screen to appear."""
-        return wait_for_screen(self.window, self.screens, screen_name, timeout)
+        return wait_for_screen(self.window, self.screen_map(), screen_name, timeout)
     
     def navigate_to(self, target: str) -> bool:
         """Navigate to a target screen."""
         print(f"[NAV] Navigating to '{target}'...")
-        return navigate(self.window, self.screens, self.transitions, target)
+        return navigate(self.window, self.screen_map(), self.transition_map(), target)
+    
+    def crop(self, image: "Image", screen: str, region: str) -> "Image":
+        """Crop a captured frame to a screen's named region, scaled to the frame's size."""
+        return image.crop(self.layout(image.size).region(screen, region).box)
+    
+    def click_point(self, screen: str, point: str) -> None:
+        """Click a screen's named point."""
+        self.click(*self.layout().point(screen, point))
+    
+    def click_fallback(self, landmark: str) -> bool:
+        """
+        Click the fallback position of the transition that clicks this
+        landmark, for when OCR can't find it. Returns False if there is none.
+        """
+        for transition in self.transition_map().values():
+            if transition.click_landmark == landmark and transition.fallback_point is not None:
+                print(f"[WORKFLOW] Using fallback position for '{landmark}'")
+                self.click(*transition.fallback_point)
+                return True
+        return False
     
     def capture(self) -> "Image":
         """Capture the full game window."""
+        self.check_cancelled()
         return capture_window(self.window)
     
     def capture_region(self, region: Region) -> "Image":
         """Capture a specific region."""
+        self.check_cancelled()
         return capture_region(self.window, region.as_tuple())
     
     def get_text(self, region: Optional[Region] = None) -> str:
@@ -110,34 +281,65 @@ class BaseWorkflow(ABC):
             img = self.capture()
         return extract_text_with_positions(img)
     
-    def find_and_click(self, text: str) -> bool:
-        """Find text on screen and click it."""
-        return click_landmark(self.window, text)
+    def find_and_click(self, text: str, region: Optional[Region] = None) -> bool:
+        """Find text on screen (optionally within a region) and click it."""
+        self.check_cancelled()
+        return click_landmark(self.window, text, region=region)
     
     def click(self, x: int, y: int) -> None:
         """Click at window-relative coordinates."""
+        self.check_cancelled()
+        recorder.record("click", x=x, y=y)
         humanized_click_in_window(self.window, x, y)
     
+    def click_async(self, x: int, y: int) -> InputHandle:
+        """
+        Queue a click at window-relative coordinates and return immediately.
+        Use the handle to wait for the action or for the screen to change.
+        """
+        self.check_cancelled()
+        recorder.record("click", x=x, y=y, queued=True)
+        return get_executor().click(self.window, x, y)
+    
+    def press_async(self, key: str) -> InputHandle:
+        """Queue a key press and return immediately."""
+        self.check_cancelled()
+        recorder.record("press", key=key, queued=True)
+        return get_executor().press(key, self.window)
+    
     def click_region(self, region: Region) -> None:
         """Click the center of a region."""
+        self.check_cancelled()
+        recorder.record("click", region=region.as_tuple())
         click_region_center(self.window, region.as_tuple())
     
     def write_row(self, **data) -> None:
-        """Write a row to the CSV output."""
+        """Write a row to the CSV output and the history store."""
+        self.write_rows([data])
+    
+    def write_rows(self, rows: List[Dict]) -> None:
+        """Write several rows to the CSV output and the history store."""
+        now = datetime.now()
         if self.storage:
-            self.storage.write_row(**data)
+            self.storage.write_rows([{"timestamp": now.isoformat(), **row} for row in rows])
+        if self.history:
+            for row in rows:
+                entity = row.get(self.entity_column) if self.entity_column else None
+                self.history.add(self.run_id, self.record_name, entity, now.timestamp(), row)
     
     def sleep(self, seconds: float, randomize: bool = True) -> None:
-        """Sleep with optional randomization."""
+        """Sleep with optional randomization. Returns early if the workflow is cancelled."""
         if randomize:
             seconds = seconds + random.uniform(0, seconds * 0.2)
-        time.sleep(seconds)
+        with span("workflow.sleep", "sleep"):
+            self.cancel_requested.wait(seconds)
+        self.check_cancelled()
     
     def save_debug_screenshot(self) -> None:
         """Save a screenshot for debugging."""
         try:
             img = self.capture()
-            path = f"output/debug-{self.name}-{int(time.time())}.png"
+            path = f"output/debug-{self.record_name}-{int(time.time())}.png"
             img.save(path)
             print(f"[DEBUG] Screenshot saved: {path}")
         except Exception:
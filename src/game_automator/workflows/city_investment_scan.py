@@ -1,24 +1,30 @@
+import asyncio
 import os
 import time
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 
 from PIL import Image
 
-from game_automator.workflows.base import BaseWorkflow
-from game_automator.engine.models import Screen, Landmark, Region
-from game_automator.core.input import press_key
-from game_automator.core.vision import extract_all_buildings
-from game_automator.core.discord import post_table_to_discord
+from game_automator.workflows.async_base import AsyncBaseWorkflow
+from game_automator.core.capture import region_fingerprint
+from game_automator.core.spool import FrameSpool, encode_png
+from game_automator.core.discord import pack_table
+from game_automator.core.outbox import queue_report
+from game_automator.core.vision import VisionBatchClient
 
 
-class CityInvestmentScanWorkflow(BaseWorkflow):
+class CityInvestmentScanWorkflow(AsyncBaseWorkflow):
     """Scans all city buildings and records their investment progress."""
     
     name = "city-investment-scan"
     description = "Extracts investment progress from all city buildings"
-    csv_columns = ["building_name", "level", "current_investment", "max_investment"]
+    csv_columns = ["building_name", "level", "current_investment", "max_investment", "source"]
+    entity_column = "building_name"
     window_title = "Shop Titans"
     
+    # Screens, the panel region and fallback click points
+    screen_file = "screens/city_investment_scan.yaml"
+    
     # All building names from the game
     BUILDING_NAMES = [
         "Academy", "Apothecary", "Emerald Inn", "Ether Well", "Garden",
@@ -29,105 +35,384 @@ class CityInvestmentScanWorkflow(BaseWorkflow):
         "Wizard Tower", "Wood Workshop",
     ]
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **options):
+        super().__init__(**options)
         self.collected_data: List[Dict] = []
+        self.extractions: Dict[int, asyncio.Task] = {}  # Screenshot index -> (fingerprint, result) task
+        self.frame_keys: List[str] = []  # Checkpoint frame key per screenshot
+        self.next_frame = 0  # Number of the next checkpoint frame; never reused within a run
     
-    def click_percent(self, x_percent: float, y_percent: float):
-        """Click at a position defined as percentage of window size."""
-        x = int(self.window["width"] * x_percent)
-        y = int(self.window["height"] * y_percent)
-        self.click(x, y)
-    
-    def run(self):
+    async def run_async(self):
         self.collected_data = []
-        screenshots: List[Image.Image] = []
+        self.extractions = {}
+        self.frame_keys = []
+        self.next_frame = 0
+        state = self.resumed
+        step = state.get("step")
         
-        # Step 1: Navigate to city
-        print("[WORKFLOW] Attempting to navigate to City...")
+        if step == "recorded":
+            # Everything but the Discord post already happened
+            self.collected_data = state["collected"]
+            await self.maybe_post_to_discord()
+            return
         
-        if not self.click_until_screen_changes("City", "Shop", max_retries=4):
-            print("[ERROR] Failed to navigate to City after all retries")
+        if step == "recording":
+            # Results are known; write them unless the interrupted run already did
+            await self.record_rows(state["rows"], state["started"], resumed=True)
+            await self.maybe_post_to_discord()
             return
         
-        print("[WORKFLOW] Successfully navigated to City!")
-        self.sleep(1)
+        # Captured panels are kept PNG-encoded, spilling to disk past the memory limit
+        memory_limit = int(float(self.option("spool_memory_mb", 64)) * 1024 * 1024)
+        with FrameSpool(memory_limit) as screenshots:
+            await self.scan(screenshots, state)
+    
+    async def scan(self, screenshots: FrameSpool, state: Dict) -> None:
+        """Capture (or load from the checkpoint), extract and record every building."""
+        step = state.get("step")
+        names: List[Optional[str]] = []
+        
+        if step in ("captured", "submitted", "extracted"):
+            names = self.load_captured(state, screenshots)
+            print(f"[WORKFLOW] Loaded {len(screenshots)} screenshots from checkpoint")
+        else:
+            if step == "capturing":
+                names = self.load_captured(state, screenshots)
+            
+            # Steps 1-2: Open a building panel
+            if not await self.open_panel():
+                return
+            
+            # Steps 3-4: Capture every building. Each panel's extraction
+            # starts as soon as it is captured, overlapping the rest of the
+            # scan and the way back to the shop (unless extraction is deferred
+            # to a batch)
+            first_building_name = await self.capture_buildings(screenshots, names, state.get("first_building"))
+            await self.asave_checkpoint(
+                "captured",
+                first_building=first_building_name,
+                captured=self.captured_state(names),
+                next_frame=self.next_frame,
+            )
+            
+            # Step 5: Close panel and return to shop
+            await self.return_to_shop()
+            
+            if screenshots.spooled:
+                print(f"[WORKFLOW] {screenshots.spooled} of {len(screenshots)} panels spooled to disk")
+        
+        # Steps 6-7: Fingerprint and extract each panel; in incremental mode,
+        # buildings whose panel is unchanged since the last stored scan keep
+        # their prior values
+        if step == "extracted":
+            results = state["results"]
+            fingerprints = await self.fingerprint_all(screenshots)
+        elif self.option("vision_batch") or step == "submitted":
+            fingerprints, results = await self.extract_batch(screenshots, names, state.get("batch"))
+        else:
+            fingerprints, results = await self.extract(screenshots, names)
+            await self.asave_checkpoint("extracted", captured=self.captured_state(names), results=results)
+        
+        # Step 8: Record results (already deduplicated by loop detection).
+        # The rows are checkpointed first, so a resumed run can tell whether
+        # they were written and never records them twice
+        rows = []
+        seen_buildings = set()
+        for i, entry in enumerate(results):
+            if entry is None:
+                print(f"[WARNING] Could not extract data from screenshot {i+1}")
+                continue
+            
+            result = entry["data"]
+            
+            # Extra deduplication in case loop detection missed something
+            if result["name"] in seen_buildings:
+                print(f"[WORKFLOW] Skipping duplicate: {result['name']}")
+                continue
+            
+            seen_buildings.add(result["name"])
+            rows.append(self.building_row(result, entry["source"], fingerprints[i]))
+        
+        started = time.time()
+        await self.asave_checkpoint("recording", rows=rows, started=started)
+        await self.record_rows(rows, started)
+        
+        # Step 9: Ask to post to Discord
+        await self.maybe_post_to_discord()
+    
+    async def open_panel(self) -> bool:
+        """
+        Navigate to the city and open a building panel.
+        When resuming, the current screen is identified first so finished
+        steps are skipped.
+        """
+        screen = await self.acurrent_screen() if self.resumed else None
+        if screen == "panel":
+            print("[WORKFLOW] Building panel already open")
+            return True
+        
+        if screen != "city":
+            # Step 1: Navigate to city
+            print("[WORKFLOW] Attempting to navigate to City...")
+            
+            if not await self.click_until_screen_changes("City", "Shop", max_retries=4):
+                print("[ERROR] Failed to navigate to City after all retries")
+                self.dump_recording("could not navigate to City")
+                return False
+            
+            print("[WORKFLOW] Successfully navigated to City!")
+            await self.asleep(1)
         
         # Step 2: Click on any character to open the panel
         print("[WORKFLOW] Looking for a character to click...")
-        if not self.click_any_character_with_retry(max_retries=4):
+        if not await self.click_any_character_with_retry(max_retries=4):
             print("[ERROR] Could not click any character")
-            return
+            self.dump_recording("could not open a building panel")
+            return False
         
         print("[WORKFLOW] Panel is open, collecting screenshots...")
-        self.sleep(1)
-        
+        await self.asleep(1)
+        return True
+    
+    async def capture_buildings(
+        self,
+        screenshots: FrameSpool,
+        names: List[Optional[str]],
+        first_building_name: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Capture each building's panel, pressing right until the cycle loops
+        back. Only the panel region of each frame is kept. Appends to
+        screenshots/names (which may hold panels from a resumed run; those
+        buildings are skipped), checkpoints each panel and starts its
+        extraction.
+        Returns the name of the first building of the scan.
+        """
         # Step 3: Capture first screenshot and detect building name
-        first_screenshot = self.capture()
-        first_building_name = self.detect_building_name_fast(first_screenshot)
+        first_screenshot = await self.acapture()
+        start_name, first_panel = await asyncio.gather(
+            self.to_thread(self.detect_building_name_fast, first_screenshot),
+            self.to_thread(self.encode_panel, first_screenshot),
+        )
         
-        if not first_building_name:
+        if first_building_name is None:
+            first_building_name = start_name
+        
+        if not start_name:
             print("[WARNING] Could not detect first building name, will collect max 35 screenshots")
-            first_building_name = None
         else:
-            print(f"[WORKFLOW] First building: {first_building_name}")
+            print(f"[WORKFLOW] First building: {start_name}")
+        
+        # Stop when the cycle returns to where this scan (or this resume) started
+        stop_names = {name for name in (first_building_name, start_name) if name}
+        captured_names = {name for name in names if name}
+        
+        async def keep(panel: bytes, name: Optional[str]) -> None:
+            if name and name in captured_names:
+                print(f"[WORKFLOW] Already captured '{name}', skipping")
+                return
+            key = self.frame_key(self.next_frame)
+            self.next_frame += 1
+            self.checkpoint.save_frame(key, panel)
+            index = screenshots.append_encoded(panel)
+            self.frame_keys.append(key)
+            names.append(name)
+            if not self.option("vision_batch"):
+                self.start_extraction(screenshots, index, name)
+            await self.asave_checkpoint(
+                "capturing",
+                first_building=first_building_name,
+                captured=self.captured_state(names),
+                next_frame=self.next_frame,
+            )
+            print(f"[WORKFLOW] Captured screenshot {len(screenshots)}")
         
-        screenshots.append(first_screenshot.copy())
-        print(f"[WORKFLOW] Captured screenshot 1")
+        await keep(first_panel, start_name)
         
-        # Step 4: Press right arrow and capture screenshots until we loop back
+        # Step 4: Press right arrow and capture screenshots until we loop back.
+        # Each key press is queued before OCR and encoding of the frame it
+        # leaves behind, so both run while the panel animation plays.
         max_buildings = 35  # Safety limit
         
+        handle = self.press_async("right")
         for i in range(max_buildings - 1):
-            press_key("right")
-            self.sleep(1.0)  # Wait for animation
+            screenshot = await self.await_change(handle, timeout=2.0)
+            if screenshot is None:
+                print("[WARNING] Panel did not settle after pressing right, capturing anyway")
+                screenshot = await self.acapture()
             
-            screenshot = self.capture()
+            handle = self.press_async("right")
             
-            # Check if we've looped back to first building
-            if first_building_name:
-                current_building = self.detect_building_name_fast(screenshot)
-                if current_building == first_building_name:
-                    print(f"[WORKFLOW] Detected loop back to '{first_building_name}' at screenshot {i+2}")
-                    break
+            current_building, panel = await asyncio.gather(
+                self.to_thread(self.detect_building_name_fast, screenshot),
+                self.to_thread(self.encode_panel, screenshot),
+            )
             
-            screenshots.append(screenshot.copy())
-            print(f"[WORKFLOW] Captured screenshot {len(screenshots)}")
+            # Check if we've looped back to the first building
+            if current_building in stop_names:
+                print(f"[WORKFLOW] Detected loop back to '{current_building}' at screenshot {i+2}")
+                break
+            
+            await keep(panel, current_building)
         
-        # Step 5: Close panel and return to shop
+        await self.await_handle(handle)
+        return first_building_name
+    
+    async def return_to_shop(self) -> None:
         print("[WORKFLOW] Closing panel...")
-        self.close_building_panel()
-        self.sleep(1)
+        await self.close_building_panel()
+        await self.asleep(1)
         
         print("[WORKFLOW] Returning to shop...")
-        if not self.find_and_click("Shop"):
-            # Fallback: Shop button is at bottom left ~15% from left, ~95% from top
-            self.click_percent(0.15, 0.95)
-        self.sleep(1)
+        if not await self.afind_and_click("Shop"):
+            await self.aclick_fallback("Shop")
+        await self.asleep(1)
+    
+    def start_extraction(self, screenshots: FrameSpool, index: int, name: Optional[str]) -> None:
+        """Start fingerprinting and extracting a captured panel in the background."""
+        self.extractions[index] = asyncio.create_task(self.extract_panel(screenshots, index, name))
+    
+    async def extract_panel(
+        self,
+        screenshots: FrameSpool,
+        index: int,
+        name: Optional[str]
+    ) -> Tuple[str, Optional[Dict]]:
+        """
+        Fingerprint a panel and extract its building data with Claude.
+        In incremental mode an unchanged panel's prior values are carried
+        forward instead. Returns (fingerprint, {"data": ..., "source": ...} or None).
+        """
+        fingerprint = await self.to_thread(region_fingerprint, screenshots.image(index))
         
-        # Step 6: Process all screenshots with Claude (async/parallel)
-        print(f"[WORKFLOW] Processing {len(screenshots)} screenshots with Claude...")
-        results = extract_all_buildings(screenshots)
+        if self.option("incremental"):
+            prior = await self.to_thread(self.find_unchanged, name, fingerprint)
+            if prior is not None:
+                return fingerprint, {"data": prior, "source": "carried"}
         
-        # Step 7: Record results (already deduplicated by loop detection)
-        seen_buildings = set()
-        for i, result in enumerate(results):
-            if result is None:
-                print(f"[WARNING] Could not extract data from screenshot {i+1}")
-                continue
-            
-            # Extra deduplication in case loop detection missed something
-            if result["name"] in seen_buildings:
-                print(f"[WORKFLOW] Skipping duplicate: {result['name']}")
-                continue
-            
-            seen_buildings.add(result["name"])
-            self.record_building(result)
+        [data] = await self.aextract_buildings([screenshots.data(index)])
+        return fingerprint, ({"data": data, "source": "vision"} if data is not None else None)
+    
+    async def extract(
+        self,
+        screenshots: FrameSpool,
+        names: List[Optional[str]]
+    ) -> Tuple[List[str], List[Optional[Dict]]]:
+        """
+        Wait for every panel's extraction, starting those not started
+        during capture (e.g. panels loaded from a checkpoint).
+        Returns the fingerprints and one {"data": ..., "source": ...} entry
+        (or None) per screenshot.
+        """
+        for i in range(len(screenshots)):
+            if i not in self.extractions:
+                self.start_extraction(screenshots, i, names[i])
         
-        print(f"[WORKFLOW] Complete! Recorded {len(self.collected_data)} buildings.")
+        tasks = [self.extractions[i] for i in range(len(screenshots))]
+        pending = sum(not task.done() for task in tasks)
+        print(f"[WORKFLOW] Waiting for {pending} of {len(tasks)} panel extractions with Claude...")
+        
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        
+        fingerprints = [fingerprint for fingerprint, _ in outcomes]
+        results = [entry for _, entry in outcomes]
+        if self.option("incremental"):
+            carried = sum(entry is not None and entry["source"] == "carried" for entry in results)
+            print(f"[WORKFLOW] Incremental: {carried} unchanged, {len(results) - carried} extracted")
+        return fingerprints, results
+    
+    async def extract_batch(
+        self,
+        screenshots: FrameSpool,
+        names: List[Optional[str]],
+        batch: Optional[Dict] = None
+    ) -> Tuple[List[str], List[Optional[Dict]]]:
+        """
+        Deferred extraction: every panel that needs Claude goes out in one
+        message batch, which is polled until it has ended. The batch is
+        checkpointed as "submitted", so a resumed run polls the same batch
+        (pass its checkpoint entry as batch) instead of submitting again.
+        Requests are identified by frame key, not spool position, which
+        can shift when a resumed run finds a checkpoint frame missing.
+        Returns the same as extract().
+        """
+        fingerprints = await self.fingerprint_all(screenshots)
+        results: List[Optional[Dict]] = [None] * len(screenshots)
+        if self.option("incremental"):
+            priors = await asyncio.gather(*[
+                self.to_thread(self.find_unchanged, names[i], fingerprint) for i, fingerprint in enumerate(fingerprints)
+            ])
+            for i, prior in enumerate(priors):
+                if prior is not None:
+                    results[i] = {"data": prior, "source": "carried"}
         
-        # Step 8: Ask to post to Discord
-        self.maybe_post_to_discord()
+        client = VisionBatchClient(poll_interval=float(self.option("batch_poll_seconds", 15)))
+        if batch is None:
+            indices = [i for i, entry in enumerate(results) if entry is None]
+            if not indices:
+                print("[WORKFLOW] Incremental: nothing to extract")
+                return fingerprints, results
+            batch_id = await self.to_thread(
+                client.submit,
+                [screenshots.data(i) for i in indices],
+                [self.custom_id(self.frame_keys[i]) for i in indices],
+            )
+            batch = {"id": batch_id, "keys": [self.frame_keys[i] for i in indices]}
+            await self.asave_checkpoint("submitted", captured=self.captured_state(names), batch=batch)
+            print(f"[WORKFLOW] Submitted {len(indices)} of {len(results)} panels as vision batch {batch_id}")
+        else:
+            print(f"[WORKFLOW] Resuming vision batch {batch['id']}")
+        
+        timeout = float(self.option("batch_timeout_hours", 24)) * 3600
+        ended = await self.await_vision_batch(client, batch["id"], timeout)
+        extracted = await self.to_thread(client.results, ended)
+        submitted = set(batch["keys"])
+        for i, key in enumerate(self.frame_keys):
+            if key in submitted:
+                data = extracted.get(self.custom_id(key))
+                results[i] = {"data": data, "source": "vision"} if data is not None else None
+        print(f"[WORKFLOW] Vision batch {batch['id']} ended: {sum(data is not None for data in extracted.values())} of {len(batch['keys'])} extracted")
+        return fingerprints, results
+    
+    async def fingerprint_all(self, screenshots: FrameSpool) -> List[str]:
+        return await asyncio.gather(*[
+            self.to_thread(region_fingerprint, screenshots.image(i)) for i in range(len(screenshots))
+        ])
+    
+    @staticmethod
+    def frame_key(number: int) -> str:
+        return f"{number:03d}"
+    
+    @staticmethod
+    def custom_id(key: str) -> str:
+        """Custom id of a panel's request in a vision batch, by frame key."""
+        return f"panel-{key}"
+    
+    def captured_state(self, names: List[Optional[str]]) -> List[Dict]:
+        """Checkpoint entries for the captured frames."""
+        return [{"key": key, "name": name} for key, name in zip(self.frame_keys, names)]
+    
+    def load_captured(self, state: Dict, screenshots: FrameSpool) -> List[Optional[str]]:
+        """
+        Load checkpointed panels into the spool. Returns their detected
+        names. Missing frames are skipped; new frames are numbered after
+        every frame the checkpoint knows of, so none is overwritten.
+        """
+        names = []
+        entries = state.get("captured", [])
+        for entry in entries:
+            data = self.checkpoint.load_frame_data(entry["key"])
+            if data is None:
+                print(f"[WARNING] Checkpoint frame {entry['key']} is missing")
+                continue
+            screenshots.append_encoded(data)
+            self.frame_keys.append(entry["key"])
+            names.append(entry["name"])
+        self.next_frame = state.get("next_frame", len(entries))
+        return names
     
     def detect_building_name_fast(self, image: Image.Image) -> Optional[str]:
         """
@@ -148,23 +433,74 @@ class CityInvestmentScanWorkflow(BaseWorkflow):
         
         return None
     
-    def record_building(self, building_data: Dict):
-        """Record building data to CSV and memory."""
-        self.write_row(
-            building_name=building_data["name"],
-            level=building_data["level"],
-            current_investment=building_data["current"],
-            max_investment=building_data["max"],
-        )
-        self.collected_data.append({
+    def panel_crop(self, image: Image.Image) -> Image.Image:
+        """Crop a screenshot to the building panel."""
+        return self.crop(image, "panel", "panel")
+    
+    def encode_panel(self, image: Image.Image) -> bytes:
+        """PNG bytes of a screenshot's building panel."""
+        return encode_png(self.panel_crop(image))
+    
+    def find_unchanged(self, name: Optional[str], fingerprint: str) -> Optional[Dict]:
+        """
+        Prior building data if the panel matches the last stored fingerprint
+        for that building, else None.
+        """
+        if not self.history or not name:
+            return None
+        
+        prior = self.history.latest(self.record_name, name)
+        if prior and prior.get("fingerprint") == fingerprint:
+            return {
+                "name": prior["building_name"],
+                "level": prior["level"],
+                "current": prior["current_investment"],
+                "max": prior["max_investment"],
+            }
+        return None
+    
+    def building_row(self, building_data: Dict, source: str = "vision", fingerprint: Optional[str] = None) -> Dict:
+        """
+        Output row for building data.
+        source is "vision" for fresh extractions or "carried" for values
+        carried forward from the last scan because the panel was unchanged.
+        """
+        return {
             "building_name": building_data["name"],
             "level": building_data["level"],
             "current_investment": building_data["current"],
             "max_investment": building_data["max"],
-        })
-        print(f"[WORKFLOW] Recorded: {building_data['name']} (Lv.{building_data['level']}) - {building_data['current']}/{building_data['max']}")
+            "source": source,
+            "fingerprint": fingerprint,
+        }
+    
+    async def record_rows(self, rows: List[Dict], started: float, resumed: bool = False) -> None:
+        """
+        Write the rows to CSV/history (skipped when resuming and the
+        history already has rows written since started) and keep them
+        for the Discord report.
+        """
+        if resumed and await self.to_thread(self.recorded_since, started):
+            print("[WORKFLOW] Results were already recorded before the interruption")
+        else:
+            await self.awrite_rows(rows)
+        
+        self.collected_data = [{key: value for key, value in row.items() if key != "fingerprint"} for row in rows]
+        for row in self.collected_data:
+            marker = " (unchanged, carried forward)" if row["source"] == "carried" else ""
+            print(f"[WORKFLOW] Recorded: {row['building_name']} (Lv.{row['level']}) - {row['current_investment']}/{row['max_investment']}{marker}")
+        
+        await self.asave_checkpoint("recorded", collected=self.collected_data)
+        print(f"[WORKFLOW] Complete! Recorded {len(self.collected_data)} buildings.")
+    
+    def recorded_since(self, started: float) -> bool:
+        """Whether the history has rows of this workflow written at or after started."""
+        if not self.history:
+            return False
+        self.history.flush()
+        return bool(self.history.records(self.record_name, since=started))
     
-    def maybe_post_to_discord(self):
+    async def maybe_post_to_discord(self):
         """Ask user and optionally post results to Discord."""
         webhook_url = os.environ.get("DISCORD_WEBHOOK_URL")
         
@@ -176,74 +512,75 @@ class CityInvestmentScanWorkflow(BaseWorkflow):
             print("[INFO] No data collected, skipping Discord post")
             return
         
-        # Ask for confirmation
-        print("\n" + "=" * 50)
-        print(f"Ready to post {len(self.collected_data)} buildings to Discord.")
-        response = input("Post to Discord? [y/N]: ").strip().lower()
+        # Ask for confirmation unless the discord option decides
+        post = self.option("discord")
+        if post is None:
+            print("\n" + "=" * 50)
+            print(f"Ready to post {len(self.collected_data)} buildings to Discord.")
+            response = (await self.aask("Post to Discord? [y/N]: ")).strip().lower()
+            post = response == 'y' or response == 'yes'
         
-        if response != 'y' and response != 'yes':
+        if not post:
             print("[INFO] Skipped posting to Discord")
             return
         
-        print("[WORKFLOW] Posting results to Discord...")
         
         sorted_data = sorted(
             self.collected_data, 
             key=lambda x: int(x["current_investment"])
         )
         
-        success = post_table_to_discord(
-            webhook_url=webhook_url,
-            title="🏰 City Investment Report",
+        title = "🏰 City Investment Report"
+        if self.instance:
+            title += f" ({self.instance})"
+        if any(row["source"] == "carried" for row in sorted_data):
+            # Mark values carried forward from the previous scan
+            sorted_data = [
+                {**row, "building_name": row["building_name"] + (" *" if row["source"] == "carried" else "")}
+                for row in sorted_data
+            ]
+            title += " (* unchanged since last scan)"
+        
+        messages = pack_table(
+            title=title,
             data=sorted_data,
             columns=["building_name", "level", "current_investment", "max_investment"],
             column_headers=["Building", "Lv", "Current", "Max"]
         )
         
-        if success:
-            print("[WORKFLOW] Posted to Discord successfully!")
-        else:
-            print("[ERROR] Failed to post to Discord")
+        # Delivered in the background (with retries) so the workflow doesn't wait on Discord
+        queue_report(self.record_name, webhook_url, messages)
+        print("[WORKFLOW] Report queued for Discord")
     
-    def click_until_screen_changes(self, click_text: str, expect_text: str, max_retries: int = 4) -> bool:
+    async def click_until_screen_changes(self, click_text: str, expect_text: str, max_retries: int = 4) -> bool:
         for attempt in range(1, max_retries + 1):
             print(f"[WORKFLOW] Attempt {attempt}/{max_retries}: clicking '{click_text}'...")
             
-            if not self.find_and_click(click_text):
-                # Fallback positions for known buttons (percentage-based)
-                fallback_positions = {
-                    "City": (0.12, 0.95),    # Bottom nav, left side
-                    "Shop": (0.15, 0.95),    # Bottom nav, left side
-                }
-                if click_text in fallback_positions:
-                    x_pct, y_pct = fallback_positions[click_text]
-                    print(f"[WORKFLOW] Using fallback position for '{click_text}'")
-                    self.click_percent(x_pct, y_pct)
-                else:
-                    print(f"[WORKFLOW] Could not find '{click_text}' on screen")
-                    self.sleep(1)
-                    continue
+            if not await self.afind_and_click(click_text) and not await self.aclick_fallback(click_text):
+                print(f"[WORKFLOW] Could not find '{click_text}' on screen")
+                await self.asleep(1)
+                continue
             
-            self.sleep(1.5)
+            await self.asleep(1.5)
             
-            screen_text = self.get_text()
+            screen_text = await self.aget_text()
             if expect_text.lower() in screen_text.lower():
                 return True
             
             print(f"[WORKFLOW] Screen did not change ('{expect_text}' not found), retrying...")
-            self.sleep(0.5)
+            await self.asleep(0.5)
         
         return False
     
-    def is_panel_open(self) -> bool:
-        screen_text = self.get_text().lower()
+    async def is_panel_open(self) -> bool:
+        screen_text = (await self.aget_text()).lower()
         return any(term in screen_text for term in ["investment", "nvestment", "invest", "investors"])
     
-    def click_any_character_with_retry(self, max_retries: int = 4) -> bool:
+    async def click_any_character_with_retry(self, max_retries: int = 4) -> bool:
         for attempt in range(1, max_retries + 1):
             print(f"[WORKFLOW] Attempt {attempt}/{max_retries}: looking for character...")
             
-            results = self.get_text_with_positions()
+            results = await self.aget_text_with_positions()
             
             char_found = False
             for result in results:
@@ -255,18 +592,18 @@ class CityInvestmentScanWorkflow(BaseWorkflow):
                     
                     print(f"[WORKFLOW] Found '{result['text']}' - clicking at ({center_x}, {center_y})")
                     
-                    self.click(center_x, center_y)
+                    await self.aclick(center_x, center_y)
                     char_found = True
                     break
             
             if not char_found:
                 print("[WORKFLOW] No character found on screen")
-                self.sleep(1)
+                await self.asleep(1)
                 continue
             
-            self.sleep(2)
+            await self.asleep(2)
             
-            if self.is_panel_open():
+            if await self.is_panel_open():
                 print("[WORKFLOW] Panel opened successfully!")
                 return True
             else:
@@ -274,12 +611,11 @@ class CityInvestmentScanWorkflow(BaseWorkflow):
         
         return False
     
-    def close_building_panel(self):
+    async def close_building_panel(self):
         """Close the building panel by finding and clicking the X button."""
         # Try to find X button via OCR first
-        if self.find_and_click("X"):
+        if await self.afind_and_click("X"):
             return
         
-        # Fallback: X button is at ~88% width, ~58% height of window
         print("[DEBUG] X button not found via OCR, using fallback position")
-        self.click_percent(0.88, 0.58)
\ No newline at end of file
+        await self.aclick_point("panel", "close")
\ No newline at end of file
@@ -0,0 +1,117 @@
+import importlib
+import sys
+from dataclasses import dataclass
+from typing import Dict, Optional, Type
+
+ENTRY_POINT_GROUP = "game_automator.workflows"
+
+
+@dataclass(frozen=True)
+class WorkflowSpec:
+    """
+    Lightweight declaration of a workflow: enough to list it without
+    importing its module (and the OCR/vision stack that comes with it).
+    target is "package.module:ClassName".
+    """
+    name: str
+    description: str
+    target: str
+    source: str = "built-in"
+
+    def load(self) -> Type:
+        """
+        Import the workflow's module and return its class. Raises
+        ValueError if the class's name or description differs from the
+        spec's, so a hand-written spec can't drift from its workflow.
+        """
+        module_name, _, class_name = self.target.partition(":")
+        workflow_class = getattr(importlib.import_module(module_name), class_name)
+        if workflow_class.name != self.name:
+            raise ValueError(
+                f"Workflow spec '{self.name}' points at {self.target}, which is named '{workflow_class.name}'"
+            )
+        if workflow_class.description != self.description:
+            raise ValueError(
+                f"Workflow spec '{self.name}' has description '{self.description}', "
+                f"but {self.target} has '{workflow_class.description}'"
+            )
+        return workflow_class
+
+    @classmethod
+    def from_class(cls, workflow_class: Type, source: str = "built-in") -> "WorkflowSpec":
+        return cls(
+            workflow_class.name,
+            workflow_class.description,
+            f"{workflow_class.__module__}:{workflow_class.__qualname__}",
+            source,
+        )
+
+
+# Workflows shipped with the package. Add an entry here for each new module;
+# name and description must match the class's (checked by WorkflowSpec.load).
+BUILTIN_WORKFLOWS = [
+    WorkflowSpec(
+        "city-investment-scan",
+        "Extracts investment progress from all city buildings",
+        "game_automator.workflows.city_investment_scan:CityInvestmentScanWorkflow",
+    ),
+]
+
+_registry: Optional[Dict[str, WorkflowSpec]] = None
+
+
+def _entry_points():
+    from importlib.metadata import entry_points
+
+    if sys.version_info >= (3, 10):
+        return entry_points(group=ENTRY_POINT_GROUP)
+    return entry_points().get(ENTRY_POINT_GROUP, [])
+
+
+def _plugin_specs() -> Dict[str, WorkflowSpec]:
+    """
+    Workflows registered by other packages under the entry point group.
+    An entry point should refer to a WorkflowSpec (kept in a light module);
+    a workflow class also works, at the cost of importing it when listing.
+    """
+    specs = {}
+    for entry_point in _entry_points():
+        source = getattr(getattr(entry_point, "dist", None), "name", None) or entry_point.value
+        try:
+            declared = entry_point.load()
+        except Exception as e:
+            print(f"[WARNING] Could not load workflow plugin '{entry_point.name}': {e}")
+            continue
+        if isinstance(declared, WorkflowSpec):
+            spec = WorkflowSpec(declared.name, declared.description, declared.target, source)
+        else:
+            spec = WorkflowSpec.from_class(declared, source)
+        specs[spec.name] = spec
+    return specs
+
+
+def available_workflows(refresh: bool = False) -> Dict[str, WorkflowSpec]:
+    """
+    All known workflows by name, without importing any of them.
+    Built-in workflows take precedence over plugins with the same name.
+    """
+    global _registry
+    if _registry is None or refresh:
+        registry = _plugin_specs()
+        registry.update({spec.name: spec for spec in BUILTIN_WORKFLOWS})
+        _registry = registry
+    return _registry
+
+
+def get_workflow(name: str) -> Optional[Type]:
+    """Import and return a workflow class by name, or None if unknown."""
+    spec = available_workflows().get(name)
+    return spec.load() if spec else None
+
+
+def discover_workflows() -> Dict[str, Type]:
+    """
+    Import every known workflow. Returns dict mapping workflow name to class.
+    Prefer available_workflows()/get_workflow(), which import only what is used.
+    """
+    return {name: spec.load() for name, spec in available_workflows().items()}
\ No newline at end of file